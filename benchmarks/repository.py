@@ -0,0 +1,124 @@
+"""
+Micro-benchmark of per-query Python overhead in the repository layer:
+statements built on every call (before) vs the prebuilt, parameterized statements (after).
+Both sides use the same loader options (``raiseload(stats)`` for ``list_page``, the model's
+selectin ``stats`` elsewhere), so the difference is statement reuse alone.
+
+Run from the repository root:
+
+    python -m benchmarks.repository
+
+Queries run against an in-memory SQLite database through a thin async adapter, so the numbers
+are dominated by statement construction, cache-key generation and ORM loading, not by I/O.
+``increment_views`` no longer exists: views are flushed in batches by ``apply_view_deltas``
+(one statement per flush, not three per view), so it is not measured here.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select, tuple_
+from sqlalchemy.orm import Session, raiseload
+
+from src.database.base import Base
+from src.dog_photos.models import DogPhoto, DogPhotoStats
+from src.dog_photos.repository import DogPhotoRepository
+
+ROUNDS = 3000
+ROWS = 500
+STARTED = datetime(2026, 1, 1)
+
+
+class AsyncAdapter:
+    """Just enough of AsyncSession for the repository's read methods, on a sync SQLite session."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.info = {}
+
+    async def execute(self, stmt, params=None):
+        return self.session.execute(stmt, params)
+
+
+def setup() -> Session:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[DogPhoto.__table__, DogPhotoStats.__table__])
+    session = Session(engine)
+    session.add_all(
+        DogPhoto(
+            image_url=f"https://images.dog.ceo/breeds/pug/{i}.jpg",
+            breed="pug" if i % 2 else "husky",
+            created_at=STARTED + timedelta(minutes=i),
+        )
+        for i in range(ROWS)
+    )
+    session.commit()
+    return session
+
+
+# The repository code before this change, kept here as the baseline; ``list_page`` gets the
+# same ``raiseload(stats)`` as the prebuilt statement, so the selectin query is not counted as a saving.
+async def before_get_by_id(db: AsyncAdapter, obj_id: int):
+    result = await db.execute(select(DogPhoto).where(DogPhoto.id == obj_id))
+    return result.scalar_one_or_none()
+
+
+async def before_list_photos(db: AsyncAdapter, limit: int = 50):
+    result = await db.execute(select(DogPhoto).order_by(DogPhoto.created_at.desc()).limit(limit))
+    return result.scalars().unique().all()
+
+
+async def before_list_page(db: AsyncAdapter, limit: int, after=None, breed=None):
+    stmt = (
+        select(DogPhoto)
+        .options(raiseload(DogPhoto.stats))
+        .order_by(DogPhoto.created_at.desc(), DogPhoto.id.desc())
+        .limit(limit + 1)
+    )
+    if breed is not None:
+        stmt = stmt.where(DogPhoto.breed == breed)
+    if after is not None:
+        stmt = stmt.where(tuple_(DogPhoto.created_at, DogPhoto.id) < tuple_(*after))
+    result = await db.execute(stmt)
+    return result.scalars().unique().all()
+
+
+async def per_call_us(session: Session, call) -> float:
+    await call()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await call()
+        session.expunge_all()
+    return (time.perf_counter() - started) / ROUNDS * 1e6
+
+
+async def run() -> None:
+    session = setup()
+    db = AsyncAdapter(session)
+    repo = DogPhotoRepository(db)
+    after = (STARTED + timedelta(minutes=ROWS // 2), ROWS // 2)
+
+    cases = {
+        "get_by_id": (lambda: before_get_by_id(db, 42), lambda: repo.get_by_id(42)),
+        "list_photos": (lambda: before_list_photos(db, 20), lambda: repo.list_photos(20)),
+        "list_page": (lambda: before_list_page(db, 20), lambda: repo.list_page(20)),
+        "list_page_cursor": (
+            lambda: before_list_page(db, 20, after, "pug"),
+            lambda: repo.list_page(20, after=after, breed="pug"),
+        ),
+    }
+
+    print(f"{'query':<18} {'before µs':>10} {'after µs':>10} {'saved':>7}")
+    for name, (before, after_call) in cases.items():
+        before_us = await per_call_us(session, before)
+        after_us = await per_call_us(session, after_call)
+        print(f"{name:<18} {before_us:>10.1f} {after_us:>10.1f} {1 - after_us / before_us:>7.0%}")
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark of cache serializers/compression on Dog API payloads.
+
+Run from the repository root:
+
+    python -m benchmarks.serializers
+
+Payloads are fetched from dog.ceo (breeds map, per-breed image list, random image);
+if the API is unreachable a synthetic payload of similar shape is used instead.
+"""
+
+import json
+import timeit
+
+import httpx
+
+from src.core.serializers import COMPRESSORS, SERIALIZERS, CacheCodec
+from src.external_api.config import dog_config
+
+ROUNDS = 2000
+
+
+def load_payloads() -> dict[str, dict]:
+    endpoints = {
+        "breeds_list": "breeds/list/all",
+        "breed_images": "breed/hound/images",
+        "random_image": "breeds/image/random",
+    }
+    payloads = {}
+    try:
+        with httpx.Client(timeout=10.0) as client:
+            for name, endpoint in endpoints.items():
+                response = client.get(f"{dog_config.base_url}/{endpoint}")
+                response.raise_for_status()
+                payloads[name] = response.json()
+    except httpx.HTTPError as e:
+        print(f"dog.ceo unavailable ({e}), using synthetic payloads")
+        payloads = {
+            "breeds_list": {
+                "message": {f"breed{i}": [f"sub{j}" for j in range(i % 6)] for i in range(110)},
+                "status": "success",
+            },
+            "breed_images": {
+                "message": [f"https://images.dog.ceo/breeds/hound-afghan/n02088094_{i}.jpg" for i in range(900)],
+                "status": "success",
+            },
+            "random_image": {"message": "https://images.dog.ceo/breeds/pug/n02110958_1.jpg", "status": "success"},
+        }
+    return payloads
+
+
+def bench(codec: CacheCodec, payload: dict) -> tuple[float, float, int]:
+    encoded = codec.encode(payload)
+    encode_us = timeit.timeit(lambda: codec.encode(payload), number=ROUNDS) / ROUNDS * 1e6
+    decode_us = timeit.timeit(lambda: codec.decode(encoded), number=ROUNDS) / ROUNDS * 1e6
+    return encode_us, decode_us, len(encoded)
+
+
+def main() -> None:
+    payloads = load_payloads()
+    print(f"{'payload':<14} {'serializer':<10} {'compression':<11} {'encode µs':>10} {'decode µs':>10} {'bytes':>8}")
+
+    for name, payload in payloads.items():
+        baseline = len(json.dumps(payload))
+        print(f"{name:<14} {'(stdlib json text, before)':<33} {'':>10} {'':>10} {baseline:>8}")
+        for serializer in SERIALIZERS:
+            for compression in COMPRESSORS:
+                codec = CacheCodec(serializer=serializer, compression=compression, compression_threshold=1024)
+                encode_us, decode_us, size = bench(codec, payload)
+                print(f"{name:<14} {serializer:<10} {compression:<11} {encode_us:>10.1f} {decode_us:>10.1f} {size:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from logging.config import fileConfig
 from alembic import context
 from sqlalchemy import create_engine, engine_from_config, pool
 
+from src.dashboard.models import BreedRollup
 from src.database.base import Base
 from src.dog_photos.models import DogPhoto
 from src.settings import settings
@@ -0,0 +1,46 @@
+"""add dog photos keyset indexes
+
+Revision ID: 8b3f1d2c4e5a
+Revises: 50fff3613b84
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3f1d2c4e5a"
+down_revision: Union[str, Sequence[str], None] = "50fff3613b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY: writes to dog_photos are not blocked while the indexes are built on a large table.
+    # It cannot run inside a transaction; a failed build leaves an INVALID index to drop before retrying.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_dog_photos_created_at_id",
+            "dog_photos",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # ix_dog_photos_breed was dropped in 4de943be95d1; recreated to also cover the ordering.
+        op.create_index(
+            "ix_dog_photos_breed",
+            "dog_photos",
+            ["breed", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_dog_photos_breed", table_name="dog_photos", postgresql_concurrently=True)
+        op.drop_index("ix_dog_photos_created_at_id", table_name="dog_photos", postgresql_concurrently=True)
@@ -0,0 +1,51 @@
+"""add breed rollups
+
+Revision ID: c2a7e4f19d36
+Revises: 8b3f1d2c4e5a
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2a7e4f19d36"
+down_revision: Union[str, Sequence[str], None] = "8b3f1d2c4e5a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "breed_rollups",
+        sa.Column("breed", sa.String(), nullable=False),
+        sa.Column("sub_breed", sa.String(), nullable=False),
+        sa.Column("photo_count", sa.Integer(), nullable=False),
+        sa.Column("total_views", sa.BigInteger(), nullable=False),
+        sa.Column("last_viewed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("breed", "sub_breed"),
+    )
+    op.create_index("ix_breed_rollups_total_views", "breed_rollups", [sa.text("total_views DESC")], unique=False)
+    op.create_index("ix_breed_rollups_photo_count", "breed_rollups", [sa.text("photo_count DESC")], unique=False)
+    # Backfill from existing rows; afterwards the table is maintained incrementally.
+    op.execute(
+        """
+        INSERT INTO breed_rollups (breed, sub_breed, photo_count, total_views, last_viewed_at)
+        SELECT p.breed, COALESCE(p.sub_breed, ''), COUNT(*), COALESCE(SUM(s.views), 0), MAX(s.last_viewed_at)
+        FROM dog_photos p
+        LEFT JOIN dog_photo_stats s ON s.photo_id = p.id
+        WHERE p.breed IS NOT NULL
+        GROUP BY p.breed, COALESCE(p.sub_breed, '')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_breed_rollups_photo_count", table_name="breed_rollups")
+    op.drop_index("ix_breed_rollups_total_views", table_name="breed_rollups")
+    op.drop_table("breed_rollups")
@@ -81,6 +81,12 @@ import logging
 
 import sentry_sdk
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from src.core.cache import get_cache_stats
+from src.core.metrics import registry
+from src.core.redis_client import get_redis_pool_stats
+from src.core.singleflight import singleflight
 
 router = APIRouter(prefix="/common", tags=["common"])
 
@@ -106,6 +112,18 @@ def get_time():
         raise HTTPException(500, "Failed to get server time")
 
 
+@router.get("/cache-stats")
+def cache_stats():
+    logger.info("[COMMON][CACHE-STATS] Get cache hit/miss counters")
+    return {**get_cache_stats(), "singleflight": singleflight.get_stats(), "redis_pool": get_redis_pool_stats()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text format: per-prefix cache hits/misses/errors, latency and size histograms, pool gauges."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @router.get("/sentry-debug")
 async def trigger_error():
     logger.info("[COMMON][SENTRY-DEBUG] Trigger manual Sentry exception")
@@ -1,68 +1,97 @@
-import asyncio
-import json
 import time
 from typing import Any, Optional
 
-_memory_cache = {}
+from src.core.memory_cache import MemoryCache
+from src.core.metrics import cache_latency, cache_requests, cache_value_size, key_prefix, registry
+from src.settings import settings
+
+memory_cache = MemoryCache(
+    max_entries=settings.memory_cache_max_entries,
+    max_bytes=settings.memory_cache_max_bytes,
+    policy=settings.memory_cache_policy,
+    log=settings.memory_cache_log,
+)
+
+registry.gauge("memory_cache_entries", "Entries in the in-memory cache", lambda: len(memory_cache))
+registry.gauge("memory_cache_bytes", "Bytes held by the in-memory cache", lambda: memory_cache.size_bytes)
+registry.gauge("memory_cache_evictions", "Entries evicted from the in-memory cache", lambda: memory_cache.evictions)
+
+
+def _observe(operation: str, key: str, started: float) -> None:
+    cache_latency.observe(time.perf_counter() - started, "memory", operation, key_prefix(key))
+
+
+def _record(key: str, hit: bool, size: int) -> None:
+    prefix = key_prefix(key)
+    cache_requests.inc("memory", "memory", prefix, "hit" if hit else "miss")
+    if hit:
+        cache_value_size.observe(size, "memory", prefix)
 
 
 async def cache_set(key: str, value: Any, ttl: int | None = None) -> None:
     """Set value in memory cache with optional TTL."""
-    try:
-        expiration = time.time() + ttl if ttl else None
-        _memory_cache[key] = {"value": value, "expires": expiration}
-        print(f"[CACHE][SET] Saved key: {key}, value: {value}, TTL: {ttl}")
-    except Exception as e:
-        print(f"[CACHE][SET] Error: {e}")
-        raise e
+    started = time.perf_counter()
+    cache_value_size.observe(memory_cache.set(key, value, ttl), "memory", key_prefix(key))
+    _observe("set", key, started)
 
 
 async def cache_get(key: str) -> Optional[Any]:
     """Get value from memory cache."""
-    try:
-        if key not in _memory_cache:
-            print(f"[CACHE][GET] Key not found: {key}")
-            return None
-
-        item = _memory_cache[key]
-
-        if item["expires"] and time.time() > item["expires"]:
-            del _memory_cache[key]
-            print(f"[CACHE][GET] Key expired: {key}")
-            return None
-
-        print(f"[CACHE][GET] Retrieved key: {key}, value: {item['value']}")
-        return item["value"]
-    except Exception as e:
-        print(f"[CACHE][GET] Error: {e}")
-        return None
+    started = time.perf_counter()
+    value, size = memory_cache.get_with_size(key)
+    _record(key, value is not None, size)
+    _observe("get", key, started)
+    return value
 
 
 async def cache_delete(key: str) -> bool:
     """Delete key from memory cache."""
-    try:
-        if key in _memory_cache:
-            del _memory_cache[key]
-            print(f"[CACHE][DELETE] Deleted key: {key}")
-            return True
-        return False
-    except Exception as e:
-        print(f"[CACHE][DELETE] Error: {e}")
-        return False
+    started = time.perf_counter()
+    deleted = memory_cache.delete(key)
+    _observe("delete", key, started)
+    return deleted
 
 
 async def cache_exists(key: str) -> bool:
     """Check if key exists in memory cache."""
-    try:
-        if key not in _memory_cache:
-            return False
-
-        item = _memory_cache[key]
-        if item["expires"] and time.time() > item["expires"]:
-            del _memory_cache[key]
-            return False
-
-        return True
-    except Exception as e:
-        print(f"[CACHE][EXISTS] Error: {e}")
-        return False
+    return key in memory_cache
+
+
+async def cache_get_many(keys: list[str]) -> dict[str, Any]:
+    """Get several values from memory cache; missing keys are omitted."""
+    if not keys:
+        return {}
+    started = time.perf_counter()
+    found = {}
+    for key in keys:
+        value, size = memory_cache.get_with_size(key)
+        _record(key, value is not None, size)
+        if value is not None:
+            found[key] = value
+    _observe("get_many", keys[0], started)
+    return found
+
+
+async def cache_set_many(items: dict[str, Any], ttl: int | None = None) -> None:
+    """Set several values in memory cache with optional TTL."""
+    if not items:
+        return
+    started = time.perf_counter()
+    for key, value in items.items():
+        cache_value_size.observe(memory_cache.set(key, value, ttl), "memory", key_prefix(key))
+    _observe("set_many", next(iter(items)), started)
+
+
+async def cache_delete_many(keys: list[str]) -> int:
+    """Delete several keys from memory cache; return the number of deleted keys."""
+    if not keys:
+        return 0
+    started = time.perf_counter()
+    deleted = memory_cache.delete_many(keys)
+    _observe("delete_many", keys[0], started)
+    return deleted
+
+
+async def close_memory_cache() -> None:
+    """Stop the expiry sweeper."""
+    await memory_cache.close()
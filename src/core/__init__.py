@@ -1,3 +1,19 @@
-from .cache import cache_get, cache_set
+from .cache import (
+    cache_delete,
+    cache_delete_many,
+    cache_get,
+    cache_get_many,
+    cache_set,
+    cache_set_many,
+    get_cache_stats,
+)
 
-__all__ = ["cache_get", "cache_set"]
+__all__ = [
+    "cache_get",
+    "cache_set",
+    "cache_delete",
+    "cache_get_many",
+    "cache_set_many",
+    "cache_delete_many",
+    "get_cache_stats",
+]
@@ -1,33 +1,135 @@
+import asyncio
 import json
+import logging
+import time
+import uuid
 from typing import Any, Optional
 
-from src.core.redis_client import get_redis
+from src.core.local_cache import local_cache
+from src.core.metrics import cache_latency, cache_requests, cache_value_size, key_prefix, registry
+from src.core.redis_client import get_redis, start_client_tracking
+from src.core.serializers import codec
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker in invalidation messages so it can skip its own.
+INSTANCE_ID = uuid.uuid4().hex
+
+_invalidation_task: asyncio.Task | None = None
+
+registry.gauge(
+    "cache_l1_entries", "Entries in the in-process L1 cache", lambda: len(local_cache) if local_cache.enabled else 0
+)
+registry.gauge("cache_l1_bytes", "Bytes held by the in-process L1 cache", lambda: local_cache.size_bytes)
+
+# Stored in place of a ``None`` result so "not found" can be cached too (negative caching).
+NEGATIVE_ENTRY = {"__negative__": True}
+
+# Per-collection version counters, see ``cache_version``.
+VERSION_KEY = "cache:version:{}"
+
+
+def is_negative(entry: Any) -> bool:
+    """Return True if a cached entry marks a cached ``None`` result."""
+    return entry == NEGATIVE_ENTRY
+
+
+def _record(tier: str, key: str, result: str) -> None:
+    cache_requests.inc("redis", tier, key_prefix(key), result)
+
+
+def _observe(operation: str, key: str, started: float) -> None:
+    cache_latency.observe(time.perf_counter() - started, "redis", operation, key_prefix(key))
+
+
+_TOTAL_NAMES = {"hit": "hits", "miss": "misses", "error": "errors"}
+
+
+def _tier_totals(tier: str) -> dict:
+    totals = dict.fromkeys(_TOTAL_NAMES.values(), 0)
+    for (backend, label_tier, _, result), value in cache_requests.values.items():
+        if backend == "redis" and label_tier == tier:
+            totals[_TOTAL_NAMES[result]] += int(value)
+    return totals
+
+
+def get_cache_stats() -> dict:
+    """Return hit/miss/error counters per cache tier (per-prefix series are in ``/common/metrics``)."""
+    return {
+        "l1": {**_tier_totals("l1"), "enabled": local_cache.enabled, "entries": len(local_cache)},
+        "l2": _tier_totals("l2"),
+    }
+
+
+def _invalidation_message(keys: list[str]) -> str:
+    return json.dumps({"origin": INSTANCE_ID, "keys": keys})
 
 
 async def cache_set(key: str, value: Any, ttl: int | None = None) -> None:
     """Set value in Redis cache with optional TTL."""
     redis = await get_redis()
+    started = time.perf_counter()
     try:
-        serialized_value = json.dumps(value)
-        if ttl:
-            await redis.setex(key, ttl, serialized_value)
-        else:
-            await redis.set(key, serialized_value)
+        serialized_value = codec.encode(value)
+        cache_value_size.observe(len(serialized_value), "redis", key_prefix(key))
+        if not local_cache.enabled:
+            if ttl:
+                await redis.setex(key, ttl, serialized_value)
+            else:
+                await redis.set(key, serialized_value)
+            return
+
+        async with redis.pipeline(transaction=False) as pipe:
+            if ttl:
+                pipe.setex(key, ttl, serialized_value)
+            else:
+                pipe.set(key, serialized_value)
+            pipe.publish(settings.cache_invalidation_channel, _invalidation_message([key]))
+            await pipe.execute()
+        local_cache.set(key, serialized_value, ttl)
     except Exception as e:
         raise e
+    finally:
+        _observe("set", key, started)
 
 
 async def cache_get(key: str) -> Optional[Any]:
-    """Get value from Redis cache."""
+    """Get value from the L1 cache (if enabled) or Redis."""
+    if local_cache.enabled:
+        raw = local_cache.get(key)
+        if raw is not None:
+            _record("l1", key, "hit")
+            return codec.decode(raw)
+        _record("l1", key, "miss")
+
     redis = await get_redis()
+    started = time.perf_counter()
     try:
-        data = await redis.get(key)
+        if local_cache.enabled:
+            version = local_cache.version
+            async with redis.pipeline(transaction=False) as pipe:
+                data, pttl = await pipe.get(key).pttl(key).execute()
+        else:
+            data = await redis.get(key)
+
         if data is None:
+            _record("l2", key, "miss")
             return None
-        result = json.loads(data)
+
+        _record("l2", key, "hit")
+        cache_value_size.observe(len(data), "redis", key_prefix(key))
+        result = codec.decode(data)
+        if local_cache.enabled:
+            local_cache.set(key, data, pttl / 1000 if pttl > 0 else None, version=version)
         return result
     except Exception as e:
+        # Still served as a miss, but counted separately so outages do not look like cold keys.
+        _record("l2", key, "error")
+        logger.warning(f"[CACHE][GET] error for {key}: {e}")
         return None
+    finally:
+        _observe("get", key, started)
 
 
 async def cache_exists(key: str) -> bool:
@@ -43,10 +145,216 @@ async def cache_exists(key: str) -> bool:
 
 async def cache_delete(key: str) -> bool:
     """Delete key from Redis cache."""
+    local_cache.delete(key)
     redis = await get_redis()
+    started = time.perf_counter()
     try:
-        result = await redis.delete(key)
+        if not local_cache.enabled:
+            result = await redis.delete(key)
+        else:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(key)
+                pipe.publish(settings.cache_invalidation_channel, _invalidation_message([key]))
+                result, _ = await pipe.execute()
         success = result > 0
         return success
     except Exception as e:
+        logger.warning(f"[CACHE][DELETE] error for {key}: {e}")
         return False
+    finally:
+        _observe("delete", key, started)
+
+
+async def cache_version(*collections: str) -> Optional[str]:
+    """
+    Current version of ``collections`` for use in cache keys, e.g. ``"3.17"``.
+    Returns None when Redis is unavailable, so callers can skip caching.
+    """
+    try:
+        redis = await get_redis()
+        versions = await redis.mget([VERSION_KEY.format(collection) for collection in collections])
+    except Exception as e:
+        logger.warning(f"[CACHE][VERSION] error for {collections}: {e}")
+        return None
+    return ".".join(str(int(version or 0)) for version in versions)
+
+
+async def bump_cache_version(collection: str) -> Optional[int]:
+    """
+    Invalidate every entry keyed by the collection's version with one INCR; old entries expire by TTL.
+    Errors are logged, not raised: the write that triggered the bump has already been committed.
+    """
+    try:
+        redis = await get_redis()
+        return await redis.incr(VERSION_KEY.format(collection))
+    except Exception as e:
+        logger.warning(f"[CACHE][VERSION] bump failed for {collection}: {e}")
+        return None
+
+
+async def cache_get_many(keys: list[str]) -> dict[str, Any]:
+    """Get several values in one round trip (MGET); missing keys are omitted."""
+    found: dict[str, Any] = {}
+    pending = list(dict.fromkeys(keys))
+
+    if local_cache.enabled:
+        remaining = []
+        for key in pending:
+            raw = local_cache.get(key)
+            if raw is None:
+                _record("l1", key, "miss")
+                remaining.append(key)
+            else:
+                _record("l1", key, "hit")
+                found[key] = codec.decode(raw)
+        pending = remaining
+
+    if not pending:
+        return found
+
+    redis = await get_redis()
+    started = time.perf_counter()
+    try:
+        if local_cache.enabled:
+            version = local_cache.version
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.mget(pending)
+                for key in pending:
+                    pipe.pttl(key)
+                values, *pttls = await pipe.execute()
+        else:
+            values = await redis.mget(pending)
+            pttls = [None] * len(pending)
+
+        for key, data, pttl in zip(pending, values, pttls):
+            if data is None:
+                _record("l2", key, "miss")
+                continue
+            _record("l2", key, "hit")
+            cache_value_size.observe(len(data), "redis", key_prefix(key))
+            found[key] = codec.decode(data)
+            if local_cache.enabled:
+                local_cache.set(key, data, pttl / 1000 if pttl > 0 else None, version=version)
+        return found
+    except Exception as e:
+        for key in pending:
+            if key not in found:
+                _record("l2", key, "error")
+        logger.warning(f"[CACHE][GET-MANY] error for {len(pending)} keys: {e}")
+        return found
+    finally:
+        _observe("get_many", pending[0], started)
+
+
+async def cache_set_many(items: dict[str, Any], ttl: int | None = None) -> None:
+    """Set several values with one pipeline flush (one SETEX per key)."""
+    if not items:
+        return
+
+    redis = await get_redis()
+    started = time.perf_counter()
+    try:
+        serialized = {key: codec.encode(value) for key, value in items.items()}
+        for key, serialized_value in serialized.items():
+            cache_value_size.observe(len(serialized_value), "redis", key_prefix(key))
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, serialized_value in serialized.items():
+                if ttl:
+                    pipe.setex(key, ttl, serialized_value)
+                else:
+                    pipe.set(key, serialized_value)
+            if local_cache.enabled:
+                pipe.publish(settings.cache_invalidation_channel, _invalidation_message(list(serialized)))
+            await pipe.execute()
+
+        if local_cache.enabled:
+            for key, serialized_value in serialized.items():
+                local_cache.set(key, serialized_value, ttl)
+    except Exception as e:
+        raise e
+    finally:
+        _observe("set_many", next(iter(items)), started)
+
+
+async def cache_delete_many(keys: list[str]) -> int:
+    """Delete several keys in one round trip; return the number of deleted keys."""
+    if not keys:
+        return 0
+
+    for key in keys:
+        local_cache.delete(key)
+    redis = await get_redis()
+    started = time.perf_counter()
+    try:
+        if not local_cache.enabled:
+            return await redis.delete(*keys)
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            pipe.publish(settings.cache_invalidation_channel, _invalidation_message(list(keys)))
+            deleted, _ = await pipe.execute()
+        return deleted
+    except Exception as e:
+        logger.warning(f"[CACHE][DELETE-MANY] error for {len(keys)} keys: {e}")
+        return 0
+    finally:
+        _observe("delete_many", keys[0], started)
+
+
+async def _listen_invalidations() -> None:
+    """Evict keys from L1 when another worker changes them."""
+    while True:
+        try:
+            redis = await get_redis()
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(settings.cache_invalidation_channel)
+            # Messages may have been missed while (re)connecting.
+            local_cache.clear()
+            try:
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") != INSTANCE_ID:
+                        local_cache.invalidate(payload.get("keys", []))
+            finally:
+                await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[CACHE][INVALIDATE] listener error: {e}")
+            local_cache.clear()
+            await asyncio.sleep(1)
+
+
+def _on_tracking_invalidate(keys: list[str] | None) -> None:
+    if keys is None:
+        local_cache.clear()
+    else:
+        local_cache.invalidate(keys)
+
+
+async def start_cache_invalidation() -> None:
+    """
+    Start the pub/sub invalidation listener if the L1 tier is enabled.
+    With ``redis_client_tracking`` the L1 tier is enabled and Redis itself pushes invalidations.
+    """
+    global _invalidation_task
+    if settings.redis_client_tracking:
+        local_cache.enabled = True
+        await start_client_tracking(_on_tracking_invalidate)
+    if local_cache.enabled and _invalidation_task is None:
+        _invalidation_task = asyncio.create_task(_listen_invalidations())
+
+
+async def stop_cache_invalidation() -> None:
+    """Stop the pub/sub invalidation listener and the L1 expiry sweeper."""
+    global _invalidation_task
+    if _invalidation_task is not None:
+        _invalidation_task.cancel()
+        try:
+            await _invalidation_task
+        except asyncio.CancelledError:
+            pass
+        _invalidation_task = None
+    await local_cache.close()
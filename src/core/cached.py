@@ -0,0 +1,104 @@
+import functools
+import inspect
+from typing import Any, Callable, Optional
+
+from pydantic import TypeAdapter
+
+from src.core.cache import NEGATIVE_ENTRY, cache_delete, cache_get, cache_set, is_negative
+from src.core.singleflight import singleflight
+from src.core.swr import load_entry, serve_entry
+
+KeyBuilder = str | Callable[..., str]
+
+
+def cached(
+    key: KeyBuilder,
+    ttl: int | Callable[[], int],
+    *,
+    model: Any = None,
+    negative_ttl: Optional[int] = None,
+    swr: bool = False,
+    stale_ttl: int = 0,
+    beta: float = 1.0,
+    exclude: tuple[str, ...] = ("self", "cls", "db"),
+):
+    """
+    Cache the result of an async function in Redis.
+
+    ``key`` is a template formatted with the call arguments (``"cache:external:dog_breed:{breed}"``)
+    or a callable receiving them as keyword arguments; names in ``exclude`` are not passed.
+    ``ttl`` is seconds or a callable evaluated on every call. ``model`` (a Pydantic model or
+    type such as ``list[DogPhotoRead]``) is used to serialize results, ORM objects included, and to
+    rebuild them on hits. ``None`` results are cached for ``negative_ttl`` seconds if it is set.
+    With ``swr=True`` entries are served stale-while-revalidate for ``stale_ttl`` extra seconds.
+
+    Concurrent misses are coalesced with single-flight. The wrapper exposes ``key_for(...)`` and
+    ``invalidate(...)``, which take the same arguments as the function (without ``self``); excluded
+    ones such as ``db`` can be left out.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        is_method = next(iter(signature.parameters), None) in ("self", "cls")
+        adapter = TypeAdapter(model) if model is not None else None
+
+        def build_key(bound: inspect.BoundArguments) -> str:
+            bound.apply_defaults()
+            arguments = {name: value for name, value in bound.arguments.items() if name not in exclude}
+            return key(**arguments) if callable(key) else key.format(**arguments)
+
+        def dump(result: Any) -> Any:
+            if result is None:
+                return NEGATIVE_ENTRY
+            if adapter is None:
+                return result
+            return adapter.dump_python(adapter.validate_python(result, from_attributes=True), mode="json")
+
+        def restore(value: Any) -> Any:
+            if is_negative(value):
+                return None
+            return adapter.validate_python(value) if adapter is not None else value
+
+        def current_ttl() -> int:
+            return ttl() if callable(ttl) else ttl
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            cache_key = build_key(signature.bind(*args, **kwargs))
+
+            async def produce() -> Any:
+                return dump(await fn(*args, **kwargs))
+
+            entry = await cache_get(cache_key)
+            if entry is not None:
+                if swr:
+                    entry = serve_entry(cache_key, entry, produce, current_ttl(), stale_ttl, beta, negative_ttl)
+                return restore(entry)
+
+            if swr:
+                return restore(await load_entry(cache_key, produce, current_ttl(), stale_ttl, negative_ttl))
+
+            async def load() -> Any:
+                value = await produce()
+                if not is_negative(value):
+                    await cache_set(cache_key, value, current_ttl())
+                elif negative_ttl:
+                    await cache_set(cache_key, value, negative_ttl)
+                return value
+
+            return restore(await singleflight.do(cache_key, load))
+
+        def key_for(*args, **kwargs) -> str:
+            if is_method:
+                args = (None, *args)
+            # Partial: excluded arguments such as ``db`` are not needed to build the key.
+            return build_key(signature.bind_partial(*args, **kwargs))
+
+        async def invalidate(*args, **kwargs) -> bool:
+            return await cache_delete(key_for(*args, **kwargs))
+
+        wrapper.key_for = key_for
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
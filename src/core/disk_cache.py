@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, NamedTuple, Optional
+
+from src.core.metrics import cache_requests, registry
+
+logger = logging.getLogger(__name__)
+
+PIN_SUFFIX = ".pin"
+# Temporary and pin files untouched for this long are leftovers of a crashed process;
+# younger ones may still be in use by another worker.
+STALE_FILE_SECONDS = 3600.0
+
+
+class CachedFile(NamedTuple):
+    path: Path
+    etag: str  # strong ETag: a hash of the file contents, quoted
+    size: int
+
+
+class ObjectTooLargeError(ValueError):
+    """The object is bigger than ``max_object_bytes`` and was not stored."""
+
+
+class DiskLRUCache:
+    """
+    Byte cache on local disk, bounded by total size with LRU eviction.
+
+    An entry is one file ``<root>/<aa>/<key hash>.<content hash>``: the content hash is the
+    ETag, so nothing besides the file has to be stored. Files are written to a temporary
+    name and renamed, so readers never see partial files. Recency is tracked in memory and
+    rebuilt from modification times on the first use; every process accounts only for the
+    files it knows about, so ``max_bytes`` is per worker. ``pin`` keeps an entry readable
+    while it is being served, even if it is evicted meanwhile.
+    """
+
+    def __init__(self, name: str, root: str | Path, max_bytes: int, max_object_bytes: int):
+        self.name = name
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes
+        self.size_bytes = 0
+        self._entries: OrderedDict[str, CachedFile] = OrderedDict()
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        registry.gauge(
+            f"disk_cache_{name}",
+            f"Disk cache '{name}' entries and bytes",
+            lambda: {("entries",): len(self._entries), ("bytes",): self.size_bytes},
+            ("stat",),
+        )
+
+    @staticmethod
+    def _key_hash(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _scan(self) -> list[tuple[float, str, CachedFile]]:
+        found = []
+        if not self.root.exists():
+            return found
+        now = time.time()
+        for path in self.root.glob("*/*.*"):
+            key_hash, _, content_hash = path.name.partition(".")
+            stat = path.stat()
+            if content_hash.endswith((".tmp", PIN_SUFFIX)):
+                # st_ctime also changes on writes and new links, so in-use files look fresh.
+                if now - stat.st_ctime >= STALE_FILE_SECONDS:
+                    path.unlink(missing_ok=True)
+                continue
+            if not content_hash:
+                continue
+            found.append((stat.st_mtime, key_hash, CachedFile(path, f'"{content_hash}"', stat.st_size)))
+        return sorted(found)
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            for _, key_hash, entry in await asyncio.to_thread(self._scan):
+                if key_hash in self._entries:
+                    # Written twice (e.g. by two workers); keep the newer file.
+                    stale = self._entries[key_hash]
+                    self._forget(key_hash)
+                    await asyncio.to_thread(stale.path.unlink, missing_ok=True)
+                self._entries[key_hash] = entry
+                self.size_bytes += entry.size
+            self._loaded = True
+            logger.info(f"[CACHE][DISK] {self.name}: {len(self._entries)} files, {self.size_bytes} bytes")
+            await self._evict()
+
+    async def get(self, key: str) -> Optional[CachedFile]:
+        """Cached file for ``key`` (marked as most recently used), or None."""
+        await self._ensure_loaded()
+        key_hash = self._key_hash(key)
+        entry = self._entries.get(key_hash)
+        if entry is not None and not entry.path.exists():
+            # Removed by another worker's eviction.
+            self._forget(key_hash)
+            entry = None
+        cache_requests.inc("disk", "disk", self.name, "hit" if entry is not None else "miss")
+        if entry is not None:
+            self._entries.move_to_end(key_hash)
+        return entry
+
+    async def put(self, key: str, chunks: AsyncIterator[bytes]) -> CachedFile:
+        """
+        Store the bytes from ``chunks`` under ``key``; evicts least recently used files to stay
+        under ``max_bytes``. Raises ObjectTooLargeError past ``max_object_bytes``.
+        """
+        await self._ensure_loaded()
+        key_hash = self._key_hash(key)
+        directory = self.root / key_hash[:2]
+        await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+
+        tmp = directory / f"{key_hash}.{uuid.uuid4().hex}.tmp"
+        digest = hashlib.blake2b(digest_size=16)
+        size = 0
+        file = await asyncio.to_thread(open, tmp, "wb")
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > self.max_object_bytes:
+                    raise ObjectTooLargeError(f"Object is larger than {self.max_object_bytes} bytes")
+                digest.update(chunk)
+                await asyncio.to_thread(file.write, chunk)
+            await asyncio.to_thread(file.close)
+            path = directory / f"{key_hash}.{digest.hexdigest()}"
+            await asyncio.to_thread(os.replace, tmp, path)
+        except BaseException:
+            file.close()
+            await asyncio.to_thread(tmp.unlink, missing_ok=True)
+            raise
+
+        previous = self._entries.get(key_hash)
+        if previous is not None:
+            self._forget(key_hash)
+            if previous.path != path:
+                await asyncio.to_thread(previous.path.unlink, missing_ok=True)
+        entry = self._entries[key_hash] = CachedFile(path, f'"{digest.hexdigest()}"', size)
+        self.size_bytes += size
+        await self._evict()
+        return entry
+
+    async def pin(self, entry: CachedFile) -> CachedFile:
+        """
+        ``entry`` under an extra hard link, which stays readable after the entry is evicted (by any
+        worker) until ``unpin``. Raises FileNotFoundError if the entry is already gone.
+        """
+        link = entry.path.with_name(f"{entry.path.name}.{uuid.uuid4().hex}{PIN_SUFFIX}")
+        await asyncio.to_thread(os.link, entry.path, link)
+        return entry._replace(path=link)
+
+    async def unpin(self, pinned: CachedFile) -> None:
+        await asyncio.to_thread(pinned.path.unlink, missing_ok=True)
+
+    def _forget(self, key_hash: str) -> None:
+        entry = self._entries.pop(key_hash)
+        self.size_bytes -= entry.size
+
+    async def _evict(self) -> None:
+        # The newest entry is never evicted, even if it alone exceeds the budget.
+        while self.size_bytes > self.max_bytes and len(self._entries) > 1:
+            key_hash = next(iter(self._entries))
+            entry = self._entries[key_hash]
+            self._forget(key_hash)
+            await asyncio.to_thread(entry.path.unlink, missing_ok=True)
+            logger.debug(f"[CACHE][DISK] {self.name}: evicted {entry.path.name} ({entry.size} bytes)")
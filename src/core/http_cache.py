@@ -0,0 +1,31 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+JSON_MEDIA_TYPE = "application/json"
+# Clients may store responses but must revalidate them (If-None-Match) before each use.
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag: a hash of the exact response bytes."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` check; uses weak comparison as required for GET (RFC 9110, 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def conditional_response(request: Request, body: bytes, media_type: str = JSON_MEDIA_TYPE) -> Response:
+    """Return ``body`` with an ETag, or an empty 304 if the client already has this representation."""
+    etag = make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type=media_type, headers=headers)
@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+
+import httpx
+
+from src.core.metrics import registry
+from src.settings import settings
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+except ImportError:  # pragma: no cover - optional dependency
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Circuit breakers of all clients created by ``create_http_client``, by client name.
+_breakers: dict[str, "CircuitBreaker"] = {}
+
+http_requests = registry.counter(
+    "http_client_requests_total",
+    "Outbound HTTP requests by outcome (success, error, retry, rejected)",
+    ("client", "outcome"),
+)
+http_latency = registry.histogram("http_client_request_seconds", "Outbound HTTP request latency", ("client",))
+registry.gauge(
+    "http_client_circuit_state",
+    "Circuit breaker state per outbound client (0 closed, 1 half-open, 2 open)",
+    lambda: {(name,): _STATE_VALUES[breaker.state] for name, breaker in _breakers.items()},
+    ("client",),
+)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """The upstream is considered unhealthy; the request was not sent."""
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures and rejects calls for ``reset_timeout``
+    seconds; then lets one trial call through (half-open) and closes again if it succeeds.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            # A failed trial call re-opens the circuit for another ``reset_timeout``.
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """The call ended without an outcome (e.g. it was cancelled): free the half-open trial slot."""
+        self._trial_in_flight = False
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a transport with a circuit breaker and jittered retries.
+
+    Only idempotent methods are retried, on connection errors, timeouts and 429/502/503/504.
+    The backoff before attempt ``n`` is uniform in ``[0, min(cap, base * 2**n)]`` ("full jitter"),
+    so clients recovering together do not retry in lockstep. One logical request, retries
+    included, counts as one success or failure for the breaker; 5xx responses are failures.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        name: str,
+        breaker: CircuitBreaker,
+        retries: int = 2,
+        backoff_base: float = 0.1,
+        backoff_cap: float = 1.0,
+    ):
+        self.transport = transport
+        self.name = name
+        self.breaker = breaker
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.allow():
+            http_requests.inc(self.name, "rejected")
+            raise CircuitOpenError(f"Circuit open for {self.name} ({request.url.host})", request=request)
+
+        retries = self.retries if request.method in IDEMPOTENT_METHODS else 0
+        started = time.perf_counter()
+        try:
+            for attempt in range(retries + 1):
+                last = attempt == retries
+                try:
+                    response = await self.transport.handle_async_request(request)
+                except (httpx.TimeoutException, httpx.NetworkError) as e:
+                    if last:
+                        raise
+                    logger.info(f"[HTTP][RETRY] {self.name} {request.method} {request.url}: {e!r}")
+                else:
+                    if response.status_code not in RETRY_STATUSES or last:
+                        break
+                    await response.aclose()
+                    logger.info(f"[HTTP][RETRY] {self.name} {request.method} {request.url}: {response.status_code}")
+                http_requests.inc(self.name, "retry")
+                await asyncio.sleep(self._backoff(attempt))
+        except Exception:
+            self.breaker.record_failure()
+            http_requests.inc(self.name, "error")
+            raise
+        except BaseException:
+            # Cancelled: says nothing about the upstream, but a trial call must not hold the circuit half-open.
+            self.breaker.release()
+            raise
+        finally:
+            http_latency.observe(time.perf_counter() - started, self.name)
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+            http_requests.inc(self.name, "error")
+        else:
+            self.breaker.record_success()
+            http_requests.inc(self.name, "success")
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def create_http_client(
+    name: str,
+    base_url: str = "",
+    *,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """
+    Outbound ``httpx.AsyncClient`` with the pool limits, timeouts, retries and circuit breaker
+    from settings. Create one per upstream and reuse it: each keeps its own keep-alive pool.
+    ``transport`` replaces the network transport (e.g. ``httpx.MockTransport`` in tests).
+    """
+    http2 = settings.http_client_http2
+    if http2 and h2 is None:
+        logger.warning("[HTTP][CLIENT] http_client_http2 is on but the h2 package is missing; using HTTP/1.1")
+        http2 = False
+
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_client_max_connections,
+                max_keepalive_connections=settings.http_client_max_keepalive,
+                keepalive_expiry=settings.http_client_keepalive_expiry,
+            ),
+        )
+
+    breaker = _breakers[name] = CircuitBreaker(
+        settings.http_client_breaker_failure_threshold, settings.http_client_breaker_reset_timeout
+    )
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=httpx.Timeout(
+            connect=settings.http_client_connect_timeout,
+            read=settings.http_client_read_timeout,
+            write=settings.http_client_write_timeout,
+            pool=settings.http_client_pool_timeout,
+        ),
+        transport=ResilientTransport(
+            transport,
+            name,
+            breaker,
+            retries=settings.http_client_retries,
+            backoff_base=settings.http_client_retry_backoff_base,
+            backoff_cap=settings.http_client_retry_backoff_cap,
+        ),
+    )
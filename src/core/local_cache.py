@@ -0,0 +1,41 @@
+from typing import Any
+
+from src.core.memory_cache import MemoryCache
+from src.settings import settings
+
+
+class LocalCache(MemoryCache):
+    """In-process L1 tier in front of Redis: holds encoded values with a short TTL."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: int, enabled: bool = True, policy: str = "lru"):
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes, policy=policy)
+        self.ttl = ttl
+        self.enabled = enabled
+        # Bumped on every remote invalidation, so a value read from Redis before
+        # an invalidation arrived is not stored after it.
+        self.version = 0
+
+    def set(self, key: str, value: Any, ttl: float | None = None, version: int | None = None) -> None:
+        """Store an encoded value; TTL is capped by the L1 TTL and never exceeds the Redis TTL."""
+        if version is not None and version != self.version:
+            return
+        super().set(key, value, min(self.ttl, ttl) if ttl else self.ttl)
+
+    def invalidate(self, keys: list[str]) -> None:
+        """Drop keys changed by another worker."""
+        self.version += 1
+        for key in keys:
+            self.delete(key)
+
+    def clear(self) -> None:
+        self.version += 1
+        super().clear()
+
+
+local_cache = LocalCache(
+    max_entries=settings.cache_l1_max_entries,
+    max_bytes=settings.cache_l1_max_bytes,
+    ttl=settings.cache_l1_ttl,
+    enabled=settings.cache_l1_enabled,
+    policy=settings.cache_l1_policy,
+)
@@ -0,0 +1,234 @@
+import asyncio
+import heapq
+import logging
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def default_sizeof(value: Any) -> int:
+    """Byte size of a cached value: exact for bytes/str, shallow estimate for other objects."""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class CacheEntry:
+    __slots__ = ("value", "expires", "size", "freq")
+
+    def __init__(self, value: Any, expires: Optional[float], size: int):
+        self.value = value
+        self.expires = expires
+        self.size = size
+        self.freq = 1
+
+
+class MemoryCache:
+    """
+    Bounded in-process cache with TTL.
+
+    Limits both the number of entries and their total size, evicting by LRU or
+    LFU (frequency buckets). Expired entries are dropped on read and by a
+    background sweeper driven by a min-heap of expiry times, so keys that are
+    never read again do not stay in memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        policy: str = "lru",
+        sweep_interval: float = 1.0,
+        log: bool = False,
+        sizeof: Callable[[Any], int] = default_sizeof,
+    ):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {policy}")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.sweep_interval = sweep_interval
+        self.log = log
+        self.sizeof = sizeof
+        self.size_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._data: dict[str, CacheEntry] = OrderedDict() if policy == "lru" else {}
+        # LFU: access frequency -> keys at that frequency, oldest first.
+        self._freq: dict[int, OrderedDict[str, None]] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return self._live_entry(key) is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value or None if missing/expired."""
+        return self.get_with_size(key)[0]
+
+    def get_with_size(self, key: str) -> tuple[Optional[Any], int]:
+        """Like ``get``, plus the value's size as counted in ``size_bytes`` (0 if missing)."""
+        entry = self._live_entry(key)
+        if entry is None:
+            if self.log:
+                logger.debug(f"[CACHE][GET] Key not found: {key}")
+            return None, 0
+
+        self._touch(key, entry)
+        if self.log:
+            logger.debug(f"[CACHE][GET] Retrieved key: {key}")
+        return entry.value, entry.size
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> int:
+        """
+        Store a value with optional TTL (seconds), evicting other entries if over the limits.
+        Returns the value's size estimate (also when it was too large to store).
+        """
+        size = self.sizeof(value)
+        self.delete(key)
+        if size > self.max_bytes or (ttl is not None and ttl <= 0):
+            return size
+
+        expires = time.monotonic() + ttl if ttl else None
+        entry = CacheEntry(value, expires, size)
+        self._data[key] = entry
+        self.size_bytes += size
+        if self.policy == "lfu":
+            self._freq.setdefault(1, OrderedDict())[key] = None
+        if expires is not None:
+            heapq.heappush(self._expiry_heap, (expires, key))
+            self._ensure_sweeper()
+
+        if self.log:
+            logger.debug(f"[CACHE][SET] Saved key: {key}, TTL: {ttl}")
+
+        while len(self._data) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._remove(self._victim(exclude=key))
+            self.evictions += 1
+        return size
+
+    def delete(self, key: str) -> bool:
+        """Remove a key; return True if it was present."""
+        if key not in self._data:
+            return False
+        self._remove(key)
+        if self.log:
+            logger.debug(f"[CACHE][DELETE] Deleted key: {key}")
+        return True
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, items: dict[str, Any], ttl: float | None = None) -> None:
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        return sum(1 for key in keys if self.delete(key))
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._freq.clear()
+        self._expiry_heap.clear()
+        self.size_bytes = 0
+
+    def sweep(self, now: float | None = None) -> int:
+        """Drop every expired entry; return how many were removed."""
+        now = time.monotonic() if now is None else now
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires, key = heapq.heappop(heap)
+            entry = self._data.get(key)
+            # Skip heap records left behind by overwritten or deleted keys.
+            if entry is not None and entry.expires == expires:
+                self._remove(key)
+                removed += 1
+
+        if len(heap) > 2 * len(self._data) + 1024:
+            self._expiry_heap = [(e.expires, k) for k, e in self._data.items() if e.expires is not None]
+            heapq.heapify(self._expiry_heap)
+
+        self.expirations += removed
+        return removed
+
+    async def close(self) -> None:
+        """Stop the background sweeper."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+            self._sweeper = None
+
+    def _live_entry(self, key: str) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry.expires is not None and time.monotonic() >= entry.expires:
+            self._remove(key)
+            self.expirations += 1
+            return None
+        return entry
+
+    def _touch(self, key: str, entry: CacheEntry) -> None:
+        if self.policy == "lru":
+            self._data.move_to_end(key)
+            return
+
+        bucket = self._freq[entry.freq]
+        del bucket[key]
+        if not bucket:
+            del self._freq[entry.freq]
+        entry.freq += 1
+        self._freq.setdefault(entry.freq, OrderedDict())[key] = None
+
+    def _victim(self, exclude: str) -> str:
+        """Pick the entry to evict, never the one just written."""
+        if self.policy == "lru":
+            return next(key for key in self._data if key != exclude)
+        for freq in sorted(self._freq):
+            for key in self._freq[freq]:
+                if key != exclude:
+                    return key
+        raise KeyError(exclude)
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key)
+        self.size_bytes -= entry.size
+        if self.policy == "lfu":
+            bucket = self._freq[entry.freq]
+            del bucket[key]
+            if not bucket:
+                del self._freq[entry.freq]
+
+    def _ensure_sweeper(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._sweeper is not None and not self._sweeper.done() and self._sweeper.get_loop() is loop:
+            return
+        self._sweeper = loop.create_task(self._sweep_forever())
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"[CACHE][SWEEP] error: {e}")
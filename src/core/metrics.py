@@ -0,0 +1,139 @@
+import bisect
+from typing import Callable, Iterable
+
+from src.settings import settings
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def key_prefix(key: str) -> str:
+    """
+    Group cache keys by their first segments,
+    e.g. ``cache:external:dog_breed:pug`` -> ``cache:external:dog_breed``.
+    """
+    return ":".join(key.split(":", settings.metrics_key_prefix_depth)[: settings.metrics_key_prefix_depth])
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} {self.type}"
+
+
+class Counter(Metric):
+    """Monotonic counter; labels are passed positionally in ``labelnames`` order."""
+
+    type = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        for labels, value in self.values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value:g}"
+
+
+class Histogram(Metric):
+    """Fixed-bucket histogram; observing a value is one bisect and three additions."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(buckets)
+        self.values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            # Per-bucket counts (+Inf last), sum, count.
+            series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        for labels, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total:g}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+class Gauge(Metric):
+    """Gauge read from a callback at scrape time: returns a number or ``{label values: number}``."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, description: str, callback: Callable, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self.callback = callback
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        value = self.callback()
+        series = value if isinstance(value, dict) else {(): value}
+        for labels, number in series.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {number:g}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, description, labelnames))
+
+    def histogram(self, name: str, description: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, description, labelnames, buckets))
+
+    def gauge(self, name: str, description: str, callback: Callable, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, description, callback, labelnames))
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+cache_requests = registry.counter(
+    "cache_requests_total", "Cache lookups by result (hit, miss, error)", ("backend", "tier", "prefix", "result")
+)
+cache_latency = registry.histogram(
+    "cache_operation_seconds", "Cache operation latency", ("backend", "operation", "prefix")
+)
+cache_value_size = registry.histogram(
+    "cache_value_bytes", "Size of values read from / written to the cache", ("backend", "prefix"), SIZE_BUCKETS
+)
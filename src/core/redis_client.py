@@ -1,22 +1,99 @@
-from redis.asyncio import ConnectionPool, Redis
-from redis.exceptions import RedisError
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
 
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialWithJitterBackoff
+from redis.exceptions import ConnectionError, RedisError, TimeoutError
+
+from src.core.metrics import registry
 from src.settings import settings
 
+logger = logging.getLogger(__name__)
+
+TRACKING_CHANNEL = "__redis__:invalidate"
+
 _redis_pool: ConnectionPool | None = None
 _redis_client: Redis | None = None
+_tracking_pool: ConnectionPool | None = None
+_tracking_task: asyncio.Task | None = None
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Blocking pool that exposes in-use/idle gauges and how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def get_connection(self, *args, **kwargs):
+        started = time.monotonic()
+        try:
+            return await super().get_connection(*args, **kwargs)
+        finally:
+            waited = time.monotonic() - started
+            self.wait_count += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def get_stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "wait_count": self.wait_count,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+
+def _connection_options() -> dict:
+    return {
+        # Bytes connection: cached values are binary (see src.core.serializers).
+        "decode_responses": False,
+        "socket_timeout": settings.redis_socket_timeout,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout,
+        "health_check_interval": settings.redis_health_check_interval,
+        "retry": Retry(
+            ExponentialWithJitterBackoff(cap=settings.redis_retry_backoff_cap, base=settings.redis_retry_backoff_base),
+            settings.redis_retry_attempts,
+        ),
+        "retry_on_error": [ConnectionError, TimeoutError],
+    }
 
 
 def get_redis_pool() -> ConnectionPool:
     """Get or create Redis connection pool."""
     global _redis_pool
     if _redis_pool is None:
-        _redis_pool = ConnectionPool.from_url(
-            settings.redis_url, encoding="utf-8", decode_responses=True, max_connections=10
+        _redis_pool = InstrumentedConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            **_connection_options(),
         )
     return _redis_pool
 
 
+def get_redis_pool_stats() -> dict:
+    """Return pool gauges (in use, idle, wait time); empty until the pool is created."""
+    if isinstance(_redis_pool, InstrumentedConnectionPool):
+        return _redis_pool.get_stats()
+    return {}
+
+
+registry.gauge(
+    "redis_pool",
+    "Redis connection pool gauges (in use, idle, waits)",
+    lambda: {(name,): value for name, value in get_redis_pool_stats().items()},
+    ("stat",),
+)
+
+
 async def get_redis() -> Redis:
     """Get Redis client using connection pool."""
     global _redis_client
@@ -30,9 +107,99 @@ async def get_redis() -> Redis:
     return _redis_client
 
 
+def _tracking_args(redirect_id: int) -> list:
+    args = ["CLIENT", "TRACKING", "ON", "REDIRECT", redirect_id]
+    if settings.redis_tracking_mode == "bcast":
+        args.append("BCAST")
+        for prefix in settings.redis_tracking_prefixes:
+            args.extend(["PREFIX", prefix])
+    # Writes made through a connection do not invalidate what this worker just cached.
+    args.append("NOLOOP")
+    return args
+
+
+async def _enable_tracking(pool: ConnectionPool, redirect_id: int) -> None:
+    """Make every (re)connected pool connection send its invalidations to ``redirect_id``."""
+
+    async def on_connect(connection) -> None:
+        await connection.on_connect()
+        await connection.send_command(*_tracking_args(redirect_id))
+        response = await connection.read_response()
+        if response not in (b"OK", "OK"):
+            raise ConnectionError(f"CLIENT TRACKING failed: {response}")
+
+    pool.connection_kwargs["redis_connect_func"] = on_connect
+    # Existing connections were opened without tracking.
+    await pool.disconnect()
+
+
+async def _listen_tracking(on_invalidate: Callable[[Optional[list[str]]], None]) -> None:
+    """Receive server-assisted invalidations (RESP2 redirect mode) and pass keys to ``on_invalidate``."""
+    global _tracking_pool
+    while True:
+        try:
+            _tracking_pool = ConnectionPool.from_url(settings.redis_url, max_connections=1, **_connection_options())
+            connection = await _tracking_pool.get_connection()
+            await connection.send_command("CLIENT", "ID")
+            redirect_id = await connection.read_response()
+            await _tracking_pool.release(connection)
+
+            pubsub = Redis(connection_pool=_tracking_pool).pubsub()
+            await pubsub.subscribe(TRACKING_CHANNEL)
+            await _enable_tracking(get_redis_pool(), redirect_id)
+            # Invalidations may have been missed while (re)connecting.
+            on_invalidate(None)
+            logger.info(f"[REDIS][TRACKING] enabled ({settings.redis_tracking_mode}), redirect={redirect_id}")
+
+            try:
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    keys = message["data"]
+                    on_invalidate([k.decode() if isinstance(k, bytes) else k for k in keys] if keys else None)
+            finally:
+                await pubsub.aclose()
+                await _tracking_pool.disconnect()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[REDIS][TRACKING] listener error: {e}")
+            on_invalidate(None)
+            await asyncio.sleep(1)
+
+
+async def start_client_tracking(on_invalidate: Callable[[Optional[list[str]]], None]) -> None:
+    """
+    Turn on Redis server-assisted client-side caching.
+
+    ``on_invalidate`` receives the keys Redis reports as changed, or ``None`` when
+    everything must be dropped (flush, reconnect).
+    """
+    global _tracking_task
+    if _tracking_task is None:
+        _tracking_task = asyncio.create_task(_listen_tracking(on_invalidate))
+
+
+async def stop_client_tracking() -> None:
+    global _tracking_task, _tracking_pool
+    if _tracking_task is not None:
+        _tracking_task.cancel()
+        try:
+            await _tracking_task
+        except asyncio.CancelledError:
+            pass
+        _tracking_task = None
+    if _tracking_pool is not None:
+        await _tracking_pool.disconnect()
+        _tracking_pool = None
+    if _redis_pool is not None:
+        _redis_pool.connection_kwargs.pop("redis_connect_func", None)
+
+
 async def close_redis():
     """Close Redis connection."""
     global _redis_client, _redis_pool
+    await stop_client_tracking()
     if _redis_client:
         await _redis_client.close()
         _redis_client = None
@@ -0,0 +1,204 @@
+import json
+import logging
+import zlib
+from typing import Any
+
+from src.settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0xCA
+HEADER_VERSION = 1
+HEADER_SIZE = 4
+
+
+class Serializer:
+    """Turns a Python value into bytes and back."""
+
+    id: int
+    name: str
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonSerializer(Serializer):
+    id = 0
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    id = 1
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    id = 2
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+class Compressor:
+    """Byte-level compression applied to payloads above a size threshold."""
+
+    id: int
+    name: str
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class NoCompressor(Compressor):
+    id = 0
+    name = "none"
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCompressor(Compressor):
+    id = 1
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class ZstdCompressor(Compressor):
+    id = 2
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+def _available_serializers() -> dict[str, Serializer]:
+    serializers: dict[str, Serializer] = {"json": JsonSerializer()}
+    if orjson is not None:
+        serializers["orjson"] = OrjsonSerializer()
+    if msgpack is not None:
+        serializers["msgpack"] = MsgpackSerializer()
+    return serializers
+
+
+def _available_compressors() -> dict[str, Compressor]:
+    compressors: dict[str, Compressor] = {"none": NoCompressor(), "zlib": ZlibCompressor()}
+    if zstandard is not None:
+        compressors["zstd"] = ZstdCompressor()
+    return compressors
+
+
+SERIALIZERS = _available_serializers()
+COMPRESSORS = _available_compressors()
+
+
+class CacheCodec:
+    """
+    Encodes cached values to bytes with a 4-byte header:
+    MAGIC | version | serializer id | compression id.
+
+    Decoding reads the header, so entries written with any serializer/compression
+    stay readable and formats can be switched without a cache flush. Data without
+    the header is treated as a legacy plain-JSON entry.
+    """
+
+    def __init__(self, serializer: str = "json", compression: str = "none", compression_threshold: int = 1024):
+        if serializer not in SERIALIZERS:
+            logger.warning(f"[CACHE][CODEC] serializer '{serializer}' is not installed, falling back to json")
+            serializer = "json"
+        if compression not in COMPRESSORS:
+            logger.warning(f"[CACHE][CODEC] compression '{compression}' is not installed, disabling compression")
+            compression = "none"
+
+        self.serializer = SERIALIZERS[serializer]
+        self.compressor = COMPRESSORS[compression]
+        self.compression_threshold = compression_threshold
+        self._serializers_by_id = {s.id: s for s in SERIALIZERS.values()}
+        self._compressors_by_id = {c.id: c for c in COMPRESSORS.values()}
+
+    def encode(self, value: Any) -> bytes:
+        payload = self.serializer.dumps(value)
+        compressor = self.compressor
+        if compressor.id and len(payload) >= self.compression_threshold:
+            payload = compressor.compress(payload)
+        else:
+            compressor = COMPRESSORS["none"]
+        return bytes((MAGIC, HEADER_VERSION, self.serializer.id, compressor.id)) + payload
+
+    def decode(self, data: bytes | str) -> Any:
+        if isinstance(data, str):
+            data = data.encode()
+        if len(data) < HEADER_SIZE or data[0] != MAGIC:
+            return json.loads(data)
+
+        version, serializer_id, compressor_id = data[1], data[2], data[3]
+        if version != HEADER_VERSION:
+            raise ValueError(f"Unsupported cache entry version: {version}")
+
+        serializer = self._serializers_by_id.get(serializer_id)
+        compressor = self._compressors_by_id.get(compressor_id)
+        if serializer is None or compressor is None:
+            raise ValueError(f"Cache entry needs unavailable codec ({serializer_id}, {compressor_id})")
+
+        return serializer.loads(compressor.decompress(data[HEADER_SIZE:]))
+
+
+codec = CacheCodec(
+    serializer=settings.cache_serializer,
+    compression=settings.cache_compression,
+    compression_threshold=settings.cache_compression_threshold,
+)
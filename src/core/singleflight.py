@@ -0,0 +1,132 @@
+import asyncio
+import functools
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+from src.core.metrics import registry
+from src.core.redis_client import get_redis
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+Checker = Callable[[], Awaitable[Optional[Any]]]
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one in-flight call.
+
+    Inside a worker, callers that arrive while a call for the key is running
+    await its result instead of starting their own. With ``redis_lock`` enabled,
+    the leader also takes a short Redis lock so leaders in other workers/pods
+    wait for the value to show up in the cache (via ``check``) instead of
+    calling the upstream themselves.
+    """
+
+    def __init__(self, redis_lock: bool = False, lock_ttl_ms: int = 5000, poll_interval_ms: int = 50):
+        self.redis_lock = redis_lock
+        self.lock_ttl_ms = lock_ttl_ms
+        self.poll_interval_ms = poll_interval_ms
+        self._calls: dict[str, asyncio.Task] = {}
+        self._stats = {"calls": 0, "leaders": 0, "coalesced": 0, "coalesced_remote": 0}
+
+    def get_stats(self) -> dict:
+        """Return counters: total calls, calls that ran the loader, calls that shared a result."""
+        return {**self._stats, "in_flight": len(self._calls)}
+
+    def in_flight(self, key: str) -> bool:
+        """Return True if a call for ``key`` is currently running in this worker."""
+        return key in self._calls
+
+    async def do(self, key: str, fn: Loader, check: Optional[Checker] = None) -> Any:
+        """Run ``fn`` once per key at a time and share its result with concurrent callers."""
+        self._stats["calls"] += 1
+
+        task = self._calls.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            # The load runs in a task of its own, so a cancelled caller (e.g. a client that went
+            # away) only stops waiting; it does not cancel the load for the callers sharing it.
+            task = self._calls[key] = asyncio.ensure_future(self._run(key, fn, check))
+            task.add_done_callback(functools.partial(self._done, key))
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark as retrieved: nobody may be waiting on it.
+            task.exception()
+
+    async def _run(self, key: str, fn: Loader, check: Optional[Checker]) -> Any:
+        if self.redis_lock:
+            return await self._run_locked(key, fn, check)
+        self._stats["leaders"] += 1
+        return await fn()
+
+    async def _run_locked(self, key: str, fn: Loader, check: Optional[Checker]) -> Any:
+        lock_key = f"singleflight:lock:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            redis = await get_redis()
+            acquired = await redis.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+        except Exception as e:
+            logger.warning(f"[SINGLEFLIGHT][LOCK] lock unavailable for {key}: {e}")
+            self._stats["leaders"] += 1
+            return await fn()
+
+        if not acquired and check is not None:
+            # Another worker is loading this key: wait for its result to land in the cache.
+            deadline = time.monotonic() + self.lock_ttl_ms / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval_ms / 1000)
+                cached = await check()
+                if cached is not None:
+                    self._stats["coalesced_remote"] += 1
+                    return cached
+                if not await redis.exists(lock_key):
+                    break
+
+        self._stats["leaders"] += 1
+        try:
+            return await fn()
+        finally:
+            if acquired:
+                await self._release(redis, lock_key, token)
+
+    @staticmethod
+    async def _release(redis, lock_key: str, token: str) -> None:
+        """Delete the lock only if we still own it."""
+        try:
+            async with redis.pipeline() as pipe:
+                await pipe.watch(lock_key)
+                value = await pipe.get(lock_key)
+                if isinstance(value, bytes):
+                    value = value.decode()
+                if value == token:
+                    pipe.multi()
+                    pipe.delete(lock_key)
+                    await pipe.execute()
+                else:
+                    await pipe.unwatch()
+        except Exception as e:
+            logger.warning(f"[SINGLEFLIGHT][LOCK] failed to release {lock_key}: {e}")
+
+
+singleflight = SingleFlight(
+    redis_lock=settings.singleflight_redis_lock,
+    lock_ttl_ms=settings.singleflight_lock_ttl_ms,
+    poll_interval_ms=settings.singleflight_poll_interval_ms,
+)
+
+registry.gauge(
+    "singleflight_calls",
+    "Single-flight calls by outcome",
+    lambda: {(name,): value for name, value in singleflight.get_stats().items()},
+    ("outcome",),
+)
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from src.core.cache import cache_get, cache_get_many, cache_set, is_negative
+from src.core.singleflight import singleflight
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+# Strong references to background refreshes so they are not garbage collected mid-flight.
+_background: set[asyncio.Task] = set()
+
+
+def _is_envelope(entry: Any) -> bool:
+    return isinstance(entry, dict) and "v" in entry and "soft" in entry
+
+
+def _should_refresh(entry: dict, beta: float, now: float) -> bool:
+    """
+    XFetch: refresh before the soft expiry with a probability that grows as it
+    approaches, scaled by how long the last recompute took (``delta``).
+    """
+    delta = entry.get("delta", 0.0)
+    if delta <= 0 or beta <= 0:
+        return now >= entry["soft"]
+    return now - delta * beta * math.log(1.0 - random.random()) >= entry["soft"]
+
+
+async def load_entry(key: str, loader: Loader, ttl: int, stale_ttl: int, negative_ttl: Optional[int] = None) -> Any:
+    """
+    Call ``loader`` once per key (single-flight) and store its value in an envelope.
+    A negative result (``NEGATIVE_ENTRY``) is stored as is for ``negative_ttl``, or not at all.
+    """
+
+    async def load() -> Any:
+        started = time.monotonic()
+        value = await loader()
+        delta = time.monotonic() - started
+        if is_negative(value):
+            if negative_ttl:
+                await cache_set(key, value, negative_ttl)
+            return value
+        envelope = {"v": value, "soft": time.time() + ttl, "delta": round(delta, 4)}
+        await cache_set(key, envelope, ttl + stale_ttl)
+        return value
+
+    async def check() -> Any:
+        # Redis-lock mode: another worker is reloading; wait for a fresh envelope.
+        entry = await cache_get(key)
+        return entry["v"] if _is_envelope(entry) and entry["soft"] > time.time() else None
+
+    return await singleflight.do(key, load, check=check)
+
+
+def _refresh_in_background(key: str, loader: Loader, ttl: int, stale_ttl: int, negative_ttl: Optional[int]) -> None:
+    if singleflight.in_flight(key):
+        return
+
+    async def refresh() -> None:
+        try:
+            await load_entry(key, loader, ttl, stale_ttl, negative_ttl)
+        except Exception as e:
+            logger.warning(f"[CACHE][SWR] background refresh failed for {key}: {e}")
+
+    task = asyncio.create_task(refresh())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+def serve_entry(
+    key: str,
+    entry: Any,
+    loader: Loader,
+    ttl: int,
+    stale_ttl: int,
+    beta: float = 1.0,
+    negative_ttl: Optional[int] = None,
+) -> Any:
+    """Return the value of a cached entry, scheduling a refresh if it is stale or due for an early one."""
+    if is_negative(entry):
+        return entry
+
+    if not _is_envelope(entry):
+        # Entry written before SWR was enabled: serve it and replace it with an envelope.
+        _refresh_in_background(key, loader, ttl, stale_ttl, negative_ttl)
+        return entry
+
+    if _should_refresh(entry, beta, time.time()):
+        _refresh_in_background(key, loader, ttl, stale_ttl, negative_ttl)
+    return entry["v"]
+
+
+async def swr_get(key: str, loader: Loader, *, ttl: int, stale_ttl: int, beta: float = 1.0) -> Any:
+    """
+    Get ``key`` with stale-while-revalidate semantics.
+
+    Fresh values (before ``ttl``) are returned as is, with a probabilistic early
+    refresh; stale values (up to ``ttl + stale_ttl``) are returned immediately while a
+    background task reloads them. Only a hard miss waits for ``loader``.
+    """
+    entry = await cache_get(key)
+    if entry is not None:
+        return serve_entry(key, entry, loader, ttl, stale_ttl, beta)
+    return await load_entry(key, loader, ttl, stale_ttl)
+
+
+async def swr_get_many(
+    loaders: dict[str, Loader],
+    *,
+    ttl: int,
+    stale_ttl: int,
+    beta: float = 1.0,
+    negative_ttl: Optional[int] = None,
+) -> dict[str, Any]:
+    """Bulk ``swr_get``: one MGET, concurrent loads for hard misses; failed loads are omitted."""
+    entries = await cache_get_many(list(loaders))
+    result = {
+        key: serve_entry(key, entry, loaders[key], ttl, stale_ttl, beta, negative_ttl) for key, entry in entries.items()
+    }
+
+    missing = [key for key in loaders if key not in entries]
+    loaded = await asyncio.gather(
+        *(load_entry(key, loaders[key], ttl, stale_ttl, negative_ttl) for key in missing),
+        return_exceptions=True,
+    )
+    for key, value in zip(missing, loaded):
+        if not isinstance(value, BaseException):
+            result[key] = value
+    return result
@@ -1 +1,13 @@
 # dashboard/config.py
+from dataclasses import dataclass
+
+
+@dataclass
+class DashboardConfig:
+    """Конфіг дашборду популярності порід."""
+
+    default_top_limit: int = 10
+    max_top_limit: int = 100
+
+
+dashboard_config = DashboardConfig()
@@ -1 +1,29 @@
 # dashboard/models.py
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from sqlalchemy.sql import func
+
+from src.database.base import Base
+
+# sub_breed входить у первинний ключ, тому "без підпороди" зберігається як "".
+NO_SUB_BREED = ""
+
+
+class BreedRollup(Base):
+    """
+    Попередньо агреговані перегляди і кількість фото по (breed, sub_breed).
+    Оновлюється інкрементально: при вставці фото і при флаші лічильника переглядів.
+    """
+
+    __tablename__ = "breed_rollups"
+
+    breed = Column(String, primary_key=True)
+    sub_breed = Column(String, primary_key=True, default=NO_SUB_BREED)
+    photo_count = Column(Integer, nullable=False, default=0)
+    total_views = Column(BigInteger, nullable=False, default=0)
+    last_viewed_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_breed_rollups_total_views", total_views.desc()),
+        Index("ix_breed_rollups_photo_count", photo_count.desc()),
+    )
@@ -0,0 +1,70 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.dashboard.models import NO_SUB_BREED, BreedRollup
+from src.database.base_repository import BaseRepository
+
+BreedKey = tuple[str, Optional[str]]
+
+
+class BreedRollupRepository(BaseRepository[BreedRollup]):
+    """Репозиторій для BreedRollup: інкрементальні оновлення і читання топів."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(BreedRollup, session)
+
+    async def add_photos(self, counts: dict[BreedKey, int]) -> None:
+        """Додає ``counts`` = {(breed, sub_breed): кількість нових фото} одним INSERT ... ON CONFLICT."""
+        rows = [
+            {"breed": breed, "sub_breed": sub_breed or NO_SUB_BREED, "photo_count": count, "total_views": 0}
+            for (breed, sub_breed), count in counts.items()
+            if breed
+        ]
+        if not rows:
+            return
+        stmt = pg_insert(BreedRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BreedRollup.breed, BreedRollup.sub_breed],
+            set_={"photo_count": BreedRollup.photo_count + stmt.excluded.photo_count, "updated_at": func.now()},
+        )
+        try:
+            await self.session.execute(stmt)
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+
+    async def add_views(self, views: Select) -> None:
+        """
+        Додає перегляди, агреговані запитом ``views`` (колонки breed, sub_breed, total_views,
+        last_viewed_at), одним INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+        """
+        stmt = pg_insert(BreedRollup).from_select(["breed", "sub_breed", "total_views", "last_viewed_at"], views)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BreedRollup.breed, BreedRollup.sub_breed],
+            set_={
+                "total_views": BreedRollup.total_views + stmt.excluded.total_views,
+                "last_viewed_at": func.greatest(BreedRollup.last_viewed_at, stmt.excluded.last_viewed_at),
+                "updated_at": func.now(),
+            },
+        )
+        try:
+            await self.session.execute(stmt)
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+
+    async def top(self, limit: int, order_by: str = "views") -> Sequence[BreedRollup]:
+        column = BreedRollup.total_views if order_by == "views" else BreedRollup.photo_count
+        stmt = select(BreedRollup).order_by(column.desc(), BreedRollup.breed, BreedRollup.sub_breed).limit(limit)
+        res = await self.session.execute(stmt)
+        return res.scalars().all()
+
+    async def by_breed(self, breed: str) -> Sequence[BreedRollup]:
+        stmt = select(BreedRollup).where(BreedRollup.breed == breed).order_by(BreedRollup.sub_breed)
+        res = await self.session.execute(stmt)
+        return res.scalars().all()
@@ -1 +1,48 @@
 # dashboard/router.py
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.dashboard.config import dashboard_config as cfg
+from src.dashboard.repository import BreedRollupRepository
+from src.dashboard.schema import BreedRollupRead, BreedStats
+from src.database.base import get_read_session
+
+# Без префікса: /dog-photos/top має бути зареєстрований раніше за /dog-photos/{photo_id}.
+router = APIRouter(tags=["Dashboard"])
+
+
+@router.get(
+    "/dog-photos/top",
+    response_model=List[BreedRollupRead],
+    summary="Найпопулярніші породи/підпороди (з попередньо агрегованої таблиці)",
+)
+async def top_breeds(
+    limit: int = Query(cfg.default_top_limit, ge=1, le=cfg.max_top_limit),
+    order_by: Literal["views", "photos"] = Query("views", description="Сортування: перегляди або кількість фото"),
+    db: AsyncSession = Depends(get_read_session),
+):
+    return await BreedRollupRepository(db).top(limit, order_by)
+
+
+@router.get(
+    "/dashboard/breeds/{breed}",
+    response_model=BreedStats,
+    summary="Статистика по породі з розбивкою по підпородах",
+)
+async def breed_stats(
+    breed: str = Path(..., description="Порода (н-д, 'hound')"),
+    db: AsyncSession = Depends(get_read_session),
+):
+    rows = await BreedRollupRepository(db).by_breed(breed.strip().lower())
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"No stats for breed '{breed}'")
+    sub_breeds = [BreedRollupRead.model_validate(row) for row in rows]
+    return BreedStats(
+        breed=rows[0].breed,
+        photo_count=sum(row.photo_count for row in sub_breeds),
+        total_views=sum(row.total_views for row in sub_breeds),
+        last_viewed_at=max((row.last_viewed_at for row in sub_breeds if row.last_viewed_at), default=None),
+        sub_breeds=sub_breeds,
+    )
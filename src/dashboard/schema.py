@@ -1 +1,34 @@
 # dashboard/schema.py
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from src.dashboard.models import NO_SUB_BREED
+
+
+class BreedRollupRead(BaseModel):
+    """Перегляди і кількість фото для породи/підпороди."""
+
+    breed: str
+    sub_breed: Optional[str] = None
+    photo_count: int
+    total_views: int
+    last_viewed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("sub_breed")
+    @classmethod
+    def _empty_sub_breed(cls, value: Optional[str]) -> Optional[str]:
+        return None if value == NO_SUB_BREED else value
+
+
+class BreedStats(BaseModel):
+    """Підсумок по породі разом з розбивкою по підпородах."""
+
+    breed: str
+    photo_count: int
+    total_views: int
+    last_viewed_at: Optional[datetime] = None
+    sub_breeds: List[BreedRollupRead]
@@ -1,11 +1,23 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from fastapi import Request
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
+from src.core.metrics import registry
+from src.database.instrumentation import instrument_engine
 from src.settings import settings
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     pass
@@ -13,25 +25,217 @@ class Base(DeclarativeBase):
 
 DATABASE_URL: str = settings.db_async
 
-engine = create_async_engine(
-    url=DATABASE_URL,
-    poolclass=NullPool,
-    echo=True,
-)
+db_pool_checkout = registry.histogram("db_pool_checkout_seconds", "Time to check a connection out of the DB pool")
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout latency (waiting for a free slot or opening a new connection)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout.observe(time.perf_counter() - started)
+
+    def get_stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+        }
+
+
+def _engine_options(profile: str) -> dict:
+    """
+    Engine arguments per profile:
+    dev  - small pool, SQL echo only if ``db_echo`` is set;
+    test - no pooling, so connections never outlive a test's event loop;
+    prod - pool sized from settings, pre-ping and recycle, no echo.
+    """
+    if profile == "test":
+        return {"poolclass": NullPool, "echo": settings.db_echo}
+    if profile == "dev":
+        return {
+            "poolclass": InstrumentedAsyncPool,
+            "pool_size": 2,
+            "max_overflow": 3,
+            "pool_pre_ping": True,
+            "echo": settings.db_echo,
+        }
+    if profile == "prod":
+        return {
+            "poolclass": InstrumentedAsyncPool,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping,
+            "echo": False,
+        }
+    raise ValueError(f"Unknown database profile: {profile}")
+
+
+def _connect_args(url: str) -> dict:
+    """asyncpg statement caches; prepared statements now live as long as their pooled connection."""
+    if not url.startswith("postgresql+asyncpg"):
+        return {}
+    return {
+        # asyncpg's own cache of prepared statements
+        "statement_cache_size": settings.db_statement_cache_size,
+        "max_cached_statement_lifetime": settings.db_max_cached_statement_lifetime,
+        # SQLAlchemy's asyncpg adapter cache of prepared statement handles
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    }
 
-db_session_factory = async_sessionmaker(
-    bind=engine,
-    autoflush=False,
-    autocommit=False,
-    expire_on_commit=False,
+
+def _create_engine(url: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url=url,
+        query_cache_size=settings.db_query_cache_size,
+        connect_args=_connect_args(url),
+        **_engine_options(settings.db_profile),
+    )
+    if settings.db_query_instrumentation:
+        instrument_engine(new_engine.sync_engine)
+    return new_engine
+
+
+engine = _create_engine(DATABASE_URL)
+replica_engines: list[AsyncEngine] = [_create_engine(url) for url in settings.db_read_replicas]
+
+
+def get_db_pool_stats() -> dict:
+    """Return pool gauges; empty for profiles without a pool."""
+    pool = engine.sync_engine.pool
+    return pool.get_stats() if isinstance(pool, InstrumentedAsyncPool) else {}
+
+
+def _all_pool_stats() -> dict:
+    series = {}
+    for name, current in [("primary", engine), *((f"replica{i}", e) for i, e in enumerate(replica_engines))]:
+        pool = current.sync_engine.pool
+        if isinstance(pool, InstrumentedAsyncPool):
+            series.update({(name, stat): value for stat, value in pool.get_stats().items()})
+    return series
+
+
+registry.gauge(
+    "db_pool", "DB connection pool gauges (size, checked in/out, overflow)", _all_pool_stats, ("engine", "stat")
 )
 
 
-async def get_db_session():
+def _session_factory(bind: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind=bind,
+        autoflush=False,
+        autocommit=False,
+        expire_on_commit=False,
+    )
+
+
+db_session_factory = _session_factory(engine)
+read_session_factories = [_session_factory(replica) for replica in replica_engines]
+_replica_cycle = itertools.count()
+
+# Set after a request used the primary for writes; until it expires, reads also go to the primary.
+READ_PRIMARY_COOKIE = "db_read_primary_until"
+
+
+def read_session_factory(use_primary: bool = False) -> async_sessionmaker:
+    """Session factory for read-only work: next replica (round-robin), or the primary if there are none."""
+    if use_primary or not read_session_factories:
+        return db_session_factory
+    return read_session_factories[next(_replica_cycle) % len(read_session_factories)]
+
+
+@asynccontextmanager
+async def primary_session(session):
+    """
+    ``session`` if it is on the primary anyway (no replicas), else a new primary session: for
+    loads whose result is cached under a version just bumped by a write a replica may not have yet.
+    """
+    if not read_session_factories:
+        yield session
+        return
+    async with db_session_factory() as primary:
+        yield primary
+
+
+async def get_db_session(request: Request):
+    """Primary session; marks the client so that its next reads see these writes (read-your-writes)."""
+    if read_session_factories:
+        # The cookie itself is added by ReadYourWritesMiddleware, so it also reaches responses
+        # that the endpoint builds on its own (e.g. ``Response(status_code=204)``).
+        request.state.read_primary_until = time.time() + settings.db_read_your_writes_seconds
     async with db_session_factory() as session:
         yield session
 
 
+async def get_read_session(request: Request):
+    """Session on a read replica, or on the primary while the client's read-your-writes window is open."""
+    try:
+        use_primary = float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        use_primary = False
+    async with read_session_factory(use_primary)() as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware: sets ``READ_PRIMARY_COOKIE`` on responses to requests that used ``get_db_session``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # ``request.state`` is backed by this dict, so the dependency's flag is visible here.
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message):
+            until = state.get("read_primary_until")
+            if message["type"] == "http.response.start" and until is not None:
+                cookie = (
+                    f"{READ_PRIMARY_COOKIE}={until:.0f}; HttpOnly; "
+                    f"Max-Age={math.ceil(settings.db_read_your_writes_seconds)}; Path=/; SameSite=lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+async def _warm_up(current: AsyncEngine, connections: int) -> None:
+    if not isinstance(current.sync_engine.pool, InstrumentedAsyncPool) or connections <= 0:
+        return
+    started = time.monotonic()
+    try:
+        async with AsyncExitStack() as stack:
+            # Held at the same time so the pool has to open distinct connections; all go back on exit.
+            await asyncio.gather(*(stack.enter_async_context(current.connect()) for _ in range(connections)))
+        logger.info(
+            f"[DB][POOL] warmed up {connections} connections to {current.url.host} "
+            f"in {time.monotonic() - started:.3f}s"
+        )
+    except Exception as e:
+        logger.warning(f"[DB][POOL] warm-up of {current.url.host} failed: {e}")
+
+
+async def warm_up_db_pool(connections: int = settings.db_warmup_connections) -> None:
+    """Open ``connections`` connections per engine up front so the first requests do not pay for the handshake."""
+    await asyncio.gather(*(_warm_up(current, connections) for current in (engine, *replica_engines)))
+
+
+async def dispose_engine() -> None:
+    """Close every pooled connection, replicas included (application shutdown)."""
+    await asyncio.gather(*(current.dispose() for current in (engine, *replica_engines)))
+
+
 async def _init_citext(conn):
     """Initialize PostgreSQL CITEXT extension if supported."""
     try:
@@ -1,26 +1,80 @@
 import logging
-from typing import Generic, List, Optional, Type, TypeVar
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Generic, Iterable, Iterator, List, Optional, Sequence, Type, TypeVar
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import Executable, bindparam, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# asyncpg/PostgreSQL limit on bind parameters in one statement.
+MAX_BIND_PARAMS = 32767
+_TRANSACTION_KEY = "repository_transaction"
+
+# Fixed-shape statements built once per (model, name). Values go in as bound parameters, so a
+# call skips building the construct and reuses its memoized cache key and compiled SQL.
+_statements: dict[tuple[type, str], Executable] = {}
+
 
 class BaseRepository(Generic[ModelType]):
     """Generic CRUD repository for SQLAlchemy ORM models."""
 
+    chunk_size: int = 1000
+
     def __init__(self, model: Type[ModelType], session: AsyncSession):
         self.model = model
         self.session = session
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["BaseRepository[ModelType]"]:
+        """
+        Run several operations (of any repository on this session) with one commit:
+        inside the block bulk methods only flush; commit on exit, rollback on error.
+        """
+        if self.session.info.get(_TRANSACTION_KEY):
+            yield self
+            return
+        self.session.info[_TRANSACTION_KEY] = True
+        try:
+            yield self
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        finally:
+            self.session.info.pop(_TRANSACTION_KEY, None)
+
+    async def _commit(self) -> None:
+        if not self.session.info.get(_TRANSACTION_KEY):
+            await self.session.commit()
+
+    async def _rollback(self) -> None:
+        if not self.session.info.get(_TRANSACTION_KEY):
+            await self.session.rollback()
+
+    def _statement(self, name: str, build: Callable[[Type[ModelType]], Executable]) -> Executable:
+        key = (self.model, name)
+        stmt = _statements.get(key)
+        if stmt is None:
+            stmt = _statements[key] = build(self.model)
+        return stmt
+
+    def _chunks(self, rows: Sequence[Any], chunk_size: Optional[int] = None) -> Iterator[Sequence[Any]]:
+        """Split ``rows`` into chunks that also stay under the bind-parameter limit."""
+        size = chunk_size or self.chunk_size
+        if rows and isinstance(rows[0], dict):
+            size = min(size, MAX_BIND_PARAMS // max(len(rows[0]), 1))
+        for start in range(0, len(rows), size):
+            yield rows[start : start + size]
+
     async def get_all(self) -> List[ModelType]:
         """Return all records of the model."""
 
         try:
-            stmt = select(self.model)
+            stmt = self._statement("get_all", lambda model: select(model))
             result = await self.session.execute(stmt)
             items = result.scalars().all()
 
@@ -33,8 +87,8 @@ class BaseRepository(Generic[ModelType]):
         """Return a record by primary key."""
 
         try:
-            stmt = select(self.model).where(self.model.id == obj_id)
-            result = await self.session.execute(stmt)
+            stmt = self._statement("get_by_id", lambda model: select(model).where(model.id == bindparam("obj_id")))
+            result = await self.session.execute(stmt, {"obj_id": obj_id})
             item = result.scalar_one_or_none()
 
             return item
@@ -76,10 +130,103 @@ class BaseRepository(Generic[ModelType]):
         """Delete a record by ID."""
 
         try:
-            stmt = delete(self.model).where(self.model.id == obj_id)
-            await self.session.execute(stmt)
+            stmt = self._statement("delete", lambda model: delete(model).where(model.id == bindparam("obj_id")))
+            await self.session.execute(stmt, {"obj_id": obj_id})
             await self.session.commit()
 
         except Exception as e:
             await self.session.rollback()
             raise
+
+    async def create_many(
+        self,
+        rows: Sequence[dict],
+        *,
+        hydrate: bool = False,
+        chunk_size: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Insert many records with one multi-row INSERT ... RETURNING per chunk.
+        Returns primary keys in input order, or ORM objects with ``hydrate=True``.
+        """
+        returning = self.model if hydrate else self.model.id
+        stmt = insert(self.model).returning(returning, sort_by_parameter_order=True)
+        created: List[Any] = []
+        try:
+            for chunk in self._chunks(rows, chunk_size):
+                created.extend((await self.session.scalars(stmt, list(chunk))).all())
+            await self._commit()
+            return created
+        except Exception:
+            await self._rollback()
+            raise
+
+    async def update_many(self, rows: Sequence[dict], *, chunk_size: Optional[int] = None) -> int:
+        """
+        Update many records by primary key; every dict must contain ``id``. Returns ``len(rows)``, not
+        a matched-row count: asyncpg does not report row counts for executemany, so ids that do not
+        exist are silently skipped there (drivers that do report them raise StaleDataError instead).
+        """
+        try:
+            for chunk in self._chunks(rows, chunk_size):
+                await self.session.execute(update(self.model), list(chunk))
+            await self._commit()
+            return len(rows)
+        except Exception:
+            await self._rollback()
+            raise
+
+    async def delete_many(self, obj_ids: Iterable[int], *, chunk_size: Optional[int] = None) -> int:
+        """Delete records by IDs (``WHERE id IN (...)`` per chunk). Returns the number of deleted rows."""
+        deleted = 0
+        try:
+            for chunk in self._chunks(list(obj_ids), chunk_size):
+                result = await self.session.execute(
+                    delete(self.model).where(self.model.id.in_(chunk)).execution_options(synchronize_session=False)
+                )
+                deleted += result.rowcount
+            await self._commit()
+            return deleted
+        except Exception:
+            await self._rollback()
+            raise
+
+    async def upsert_many(
+        self,
+        rows: Sequence[dict],
+        *,
+        index_elements: Sequence[str] = ("id",),
+        update_columns: Optional[Sequence[str]] = None,
+        hydrate: bool = False,
+        chunk_size: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        PostgreSQL ``INSERT ... ON CONFLICT (index_elements) DO UPDATE`` for many records.
+        ``update_columns`` defaults to every given column outside the conflict target; an empty
+        list means ``DO NOTHING``. Returns primary keys (or ORM objects) of inserted/updated rows.
+        """
+        if not rows:
+            return []
+        if update_columns is None:
+            update_columns = [name for name in rows[0] if name not in index_elements]
+
+        result_rows: List[Any] = []
+        try:
+            for chunk in self._chunks(rows, chunk_size):
+                stmt = pg_insert(self.model).values(list(chunk))
+                if update_columns:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=list(index_elements),
+                        set_={name: stmt.excluded[name] for name in update_columns},
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+                stmt = stmt.returning(self.model if hydrate else self.model.id)
+                if hydrate:
+                    stmt = stmt.execution_options(populate_existing=True)
+                result_rows.extend((await self.session.scalars(stmt)).all())
+            await self._commit()
+            return result_rows
+        except Exception:
+            await self._rollback()
+            raise
@@ -0,0 +1,123 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.core.metrics import registry
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+db_request_queries = registry.histogram(
+    "db_request_queries", "SQL statements per request", ("route",), buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55)
+)
+db_request_seconds = registry.histogram("db_request_seconds", "Total SQL time per request", ("route",))
+db_n_plus_one = registry.counter("db_n_plus_one_total", "Requests with a repeated statement shape", ("route",))
+
+
+class QueryStats:
+    """SQL statements run inside one request (or one ``track_queries`` block)."""
+
+    __slots__ = ("count", "seconds", "rows", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.shapes: Counter[str] = Counter()
+
+    def repeated(self, threshold: int = settings.db_n_plus_one_threshold) -> dict[str, int]:
+        """Statement shapes executed at least ``threshold`` times - the usual N+1 signature."""
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries, {self.seconds * 1000:.1f} ms, {self.rows} rows"]
+        lines.extend(f"  {n}x {shape}" for shape, n in self.shapes.most_common())
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        # Kept on the execution context, not the pooled connection: a failing statement never reaches "after".
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is None or started is None:
+        return
+    stats.seconds += time.perf_counter() - started
+    stats.count += 1
+    # Statements are already parameterized, so the text is the shape.
+    stats.shapes[statement] += 1
+    if cursor.rowcount and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements, time and rows for the active ``QueryStats``; no-op outside of one."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect SQL statements executed in the current context (and tasks started from it)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware: per-request SQL count/time/rows in ``X-DB-*`` response headers
+    and metrics; repeated statement shapes (N+1) are logged and counted.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(stats.count).encode()))
+                    headers.append((b"x-db-query-time-ms", f"{stats.seconds * 1000:.2f}".encode()))
+                    headers.append((b"x-db-rows", str(stats.rows).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                self._report(scope, stats)
+
+    @staticmethod
+    def _report(scope, stats: QueryStats) -> None:
+        if not stats.count:
+            return
+        route = getattr(scope.get("route"), "path", "unmatched")
+        db_request_queries.observe(stats.count, route)
+        db_request_seconds.observe(stats.seconds, route)
+        repeated = stats.repeated()
+        if repeated:
+            db_n_plus_one.inc(route)
+            logger.warning(f"[DB][N+1] {scope['method']} {route}: {stats.summary()}")
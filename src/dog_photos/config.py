@@ -11,5 +11,13 @@ class DogPhotoConfig:
     min_url_length: int = 10
     max_url_length: int = 500
 
+    max_list_limit: int = 100
+
+    max_bulk_count: int = 50_000
+    bulk_concurrency: int = 8  # одночасних запитів до Dog API
+    bulk_insert_batch: int = 1000  # рядків на одну транзакцію (фото + статистика)
+
+    export_batch_size: int = 1000  # рядків, що читаються з серверного курсора за раз
+
 
 dog_photo_config = DogPhotoConfig()
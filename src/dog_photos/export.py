@@ -0,0 +1,65 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence
+
+import orjson
+from sqlalchemy import Row
+
+from src.database.base import read_session_factory
+from src.dog_photos.config import dog_photo_config as cfg
+from src.dog_photos.repository import DogPhotoRepository
+
+EXPORT_COLUMNS = ("id", "image_url", "breed", "sub_breed", "created_at", "views", "last_viewed_at")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def encode_ndjson(rows: Sequence[Row]) -> bytes:
+    """Пачка рядків у NDJSON (по одному JSON-об'єкту на рядок)."""
+    return b"".join(orjson.dumps(dict(zip(EXPORT_COLUMNS, row))) + b"\n" for row in rows)
+
+
+def encode_csv(rows: Sequence[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        tuple(value.isoformat() if isinstance(value, datetime) else value for value in row) for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+def csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_COLUMNS)
+    return buffer.getvalue().encode()
+
+
+async def export_photos(
+    fmt: str,
+    *,
+    breed: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Потоковий експорт dog_photos + dog_photo_stats.
+    Генератор відкриває власну сесію (на репліці, якщо вона є): він працює вже після того,
+    як завершився обробник запиту.
+    """
+    encode = encode_csv if fmt == "csv" else encode_ndjson
+    if fmt == "csv":
+        yield csv_header()
+
+    async with read_session_factory()() as session:
+        repo = DogPhotoRepository(session)
+        async for rows in repo.stream_export(
+            breed=breed.strip().lower() if breed else None,
+            created_from=created_from,
+            created_to=created_to,
+            batch_size=cfg.export_batch_size,
+        ):
+            yield encode(rows)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -17,6 +17,12 @@ class DogPhoto(Base):
 
     stats = relationship("DogPhotoStats", back_populates="photo", uselist=False, lazy="selectin")
 
+    # Keyset-пагінація: ORDER BY created_at DESC, id DESC (з фільтром по породі і без).
+    __table_args__ = (
+        Index("ix_dog_photos_created_at_id", created_at.desc(), id.desc()),
+        Index("ix_dog_photos_breed", breed, created_at.desc(), id.desc()),
+    )
+
 
 class DogPhotoStats(Base):
     __tablename__ = "dog_photo_stats"
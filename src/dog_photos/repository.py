@@ -1,9 +1,26 @@
-from datetime import datetime, timezone
-from typing import Optional, Sequence
+from collections import Counter
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Row,
+    Select,
+    bindparam,
+    column,
+    delete,
+    func,
+    select,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
+from src.dashboard.models import NO_SUB_BREED
+from src.dashboard.repository import BreedRollupRepository
 from src.database.base_repository import BaseRepository
 from src.dog_photos.models import DogPhoto, DogPhotoStats
 
@@ -44,20 +61,166 @@ class DogPhotoRepository(BaseRepository[DogPhoto]):
             await self.session.rollback()
             raise
 
+    async def create_many_with_stats(self, rows: list[dict]) -> list[int]:
+        """Масова вставка DogPhoto + DogPhotoStats з одним комітом; повертає id у порядку ``rows``."""
+        counts = Counter((row["breed"], row.get("sub_breed")) for row in rows)
+        async with self.transaction():
+            photo_ids = await self.create_many(rows)
+            await DogPhotoStatsRepository(self.session).create_many(
+                [{"photo_id": pid, "views": 0} for pid in photo_ids]
+            )
+            await BreedRollupRepository(self.session).add_photos(counts)
+        return photo_ids
+
+    async def delete_with_stats(self, photo_id: int) -> bool:
+        """
+        Видаляє фото разом зі статистикою і зменшує photo_count у breed_rollups (перегляди
+        в зведенні лишаються). Повертає False, якщо фото не існує.
+        """
+        async with self.transaction():
+            await self.session.execute(
+                delete(DogPhotoStats)
+                .where(DogPhotoStats.photo_id == photo_id)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.session.execute(
+                delete(DogPhoto)
+                .where(DogPhoto.id == photo_id)
+                .returning(DogPhoto.breed, DogPhoto.sub_breed)
+                .execution_options(synchronize_session=False)
+            )
+            row = result.one_or_none()
+            if row is not None:
+                await BreedRollupRepository(self.session).add_photos({(row.breed, row.sub_breed): -1})
+        return row is not None
+
     async def list_photos(self, limit: int = 50) -> Sequence[DogPhoto]:
-        stmt = select(DogPhoto).order_by(DogPhoto.created_at.desc()).limit(limit)
-        res = await self.session.execute(stmt)
+        stmt = self._statement(
+            "list_photos",
+            lambda model: select(model).order_by(model.created_at.desc()).limit(bindparam("limit", type_=Integer)),
+        )
+        res = await self.session.execute(stmt, {"limit": limit})
         return res.scalars().unique().all()
 
-    async def increment_views(self, photo_id: int) -> Optional[DogPhotoStats]:
-        stmt = select(DogPhotoStats).where(DogPhotoStats.photo_id == photo_id)
-        res = await self.session.execute(stmt)
-        stats = res.scalars().first()
-        if not stats:
-            return None
-
-        stats.views += 1
-        stats.last_viewed_at = datetime.now(timezone.utc).replace(tzinfo=None)
-        await self.session.commit()
-        await self.session.refresh(stats)
-        return stats
+    @staticmethod
+    def _page_stmt(params: dict) -> Select:
+        """
+        Запит сторінки для набору фільтрів з ``params``. Сторінки віддаються як DogPhotoRead (без
+        статистики), тому selectin-завантаження stats вимкнене - мінус один запит до БД.
+        """
+        stmt = (
+            select(DogPhoto)
+            .options(raiseload(DogPhoto.stats))
+            .order_by(DogPhoto.created_at.desc(), DogPhoto.id.desc())
+            .limit(bindparam("page_size", type_=Integer))
+        )
+        if "breed" in params:
+            stmt = stmt.where(DogPhoto.breed == bindparam("breed", type_=DogPhoto.breed.type))
+        if "after_id" in params:
+            stmt = stmt.where(
+                tuple_(DogPhoto.created_at, DogPhoto.id)
+                < tuple_(
+                    bindparam("after_created_at", type_=DogPhoto.created_at.type),
+                    bindparam("after_id", type_=Integer),
+                )
+            )
+        return stmt
+
+    async def list_page(
+        self,
+        limit: int,
+        after: Optional[tuple[datetime, int]] = None,
+        breed: Optional[str] = None,
+    ) -> Sequence[DogPhoto]:
+        """
+        Keyset-сторінка, від новіших до старіших: рядки строго після ``after`` = (created_at, id).
+        Повертає до ``limit + 1`` рядків, щоб викликач знав, чи є наступна сторінка.
+        """
+        params = {"page_size": limit + 1}
+        if breed is not None:
+            params["breed"] = breed
+        if after is not None:
+            params["after_created_at"], params["after_id"] = after
+        stmt = self._statement(f"list_page:{breed is not None}:{after is not None}", lambda _: self._page_stmt(params))
+        res = await self.session.execute(stmt, params)
+        return res.scalars().unique().all()
+
+    async def stream_export(
+        self,
+        *,
+        breed: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Фото разом зі статистикою пачками рядків (без ORM-об'єктів) через серверний курсор,
+        тож пам'ять не залежить від розміру таблиці.
+        """
+        stmt = (
+            select(
+                DogPhoto.id,
+                DogPhoto.image_url,
+                DogPhoto.breed,
+                DogPhoto.sub_breed,
+                DogPhoto.created_at,
+                DogPhotoStats.views,
+                DogPhotoStats.last_viewed_at,
+            )
+            .outerjoin(DogPhotoStats, DogPhotoStats.photo_id == DogPhoto.id)
+            .order_by(DogPhoto.created_at, DogPhoto.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if breed is not None:
+            stmt = stmt.where(DogPhoto.breed == breed)
+        if created_from is not None:
+            stmt = stmt.where(DogPhoto.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(DogPhoto.created_at < created_to)
+
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def apply_view_deltas(self, deltas: dict[int, tuple[int, datetime]]) -> None:
+        """
+        Додає накопичені перегляди одним UPDATE ... FROM (VALUES ...):
+        ``deltas`` = {photo_id: (кількість переглядів, час останнього перегляду)}.
+        """
+        rows = values(
+            column("photo_id", Integer),
+            column("delta", Integer),
+            column("viewed_at", DateTime(timezone=True)),
+            name="v",
+        ).data([(photo_id, delta, viewed_at) for photo_id, (delta, viewed_at) in deltas.items()])
+        stmt = (
+            update(DogPhotoStats)
+            .where(DogPhotoStats.photo_id == rows.c.photo_id)
+            .values(
+                views=func.coalesce(DogPhotoStats.views, 0) + rows.c.delta,
+                # GREATEST ignores NULL, so the first view just sets it.
+                last_viewed_at=func.greatest(DogPhotoStats.last_viewed_at, rows.c.viewed_at),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        # Ті самі перегляди, згруповані по породі, - для breed_rollups (в тій же транзакції).
+        by_breed = (
+            select(
+                DogPhoto.breed,
+                func.coalesce(DogPhoto.sub_breed, NO_SUB_BREED),
+                func.sum(rows.c.delta),
+                func.max(rows.c.viewed_at),
+            )
+            .join(rows, rows.c.photo_id == DogPhoto.id)
+            .group_by(DogPhoto.breed, func.coalesce(DogPhoto.sub_breed, NO_SUB_BREED))
+        )
+        async with self.transaction():
+            await self.session.execute(stmt)
+            await BreedRollupRepository(self.session).add_views(by_breed)
+
+
+class DogPhotoStatsRepository(BaseRepository[DogPhotoStats]):
+    """Репозиторій для DogPhotoStats."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(DogPhotoStats, session)
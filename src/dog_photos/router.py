@@ -1,11 +1,17 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.base import get_db_session
-from src.dog_photos.schema import DogPhotoRead, DogPhotoWithStats
+from src.core.http_cache import conditional_response
+from src.database.base import get_db_session, get_read_session
+from src.dog_photos.config import dog_photo_config as cfg
+from src.dog_photos.export import MEDIA_TYPES, export_photos
+from src.dog_photos.schema import DogPhotoBulkRequest, DogPhotoBulkResult, DogPhotoPage, DogPhotoWithStats
 from src.dog_photos.service import dog_photo_service
+from src.external_api.service import UpstreamUnavailableError
 
 router = APIRouter(prefix="/dog-photos", tags=["Dog Photos"])
 
@@ -24,21 +30,59 @@ async def save_dog_photo(
         return photo
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/bulk",
+    response_model=DogPhotoBulkResult,
+    summary="Масово отримати зображення з Dog API та зберегти в БД",
+)
+async def bulk_save_dog_photos(
+    payload: DogPhotoBulkRequest,
+    db: AsyncSession = Depends(get_db_session),
+):
+    return await dog_photo_service.bulk_save_photos(db, payload.count, payload.breeds)
+
+
 @router.get(
     "",
-    response_model=List[DogPhotoRead],
-    summary="Отримати список збережених зображень",
+    response_model=DogPhotoPage,
+    summary="Отримати список збережених зображень (від новіших, з курсором)",
 )
 async def list_dog_photos(
-    limit: int = Query(50, ge=1, le=100),
-    db: AsyncSession = Depends(get_db_session),
+    request: Request,
+    limit: int = Query(50, ge=1, le=cfg.max_list_limit),
+    cursor: Optional[str] = Query(None, description="next_cursor з попередньої сторінки"),
+    breed: Optional[str] = Query(None, description="Фільтр по породі"),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    photos = await dog_photo_service.list_photos(db, limit)
-    return photos
+    try:
+        body = await dog_photo_service.list_photos_json(db, limit, cursor=cursor, breed=breed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return conditional_response(request, body)
+
+
+@router.get(
+    "/export",
+    summary="Потоковий експорт усіх зображень зі статистикою (NDJSON або CSV)",
+    response_class=StreamingResponse,
+)
+async def export_dog_photos(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Формат експорту"),
+    breed: Optional[str] = Query(None, description="Фільтр по породі"),
+    created_from: Optional[datetime] = Query(None, description="created_at >= (ISO 8601)"),
+    created_to: Optional[datetime] = Query(None, description="created_at < (ISO 8601)"),
+):
+    return StreamingResponse(
+        export_photos(format, breed=breed, created_from=created_from, created_to=created_to),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="dog_photos.{format}"'},
+    )
 
 
 @router.get(
@@ -47,10 +91,33 @@ async def list_dog_photos(
     summary="Отримати одне зображення з БД (і оновити статистику переглядів)",
 )
 async def get_dog_photo(
+    request: Request,
     photo_id: int = Path(..., ge=1),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    photo = await dog_photo_service.get_photo_with_stats(db, photo_id, increment=True)
+    photo = await dog_photo_service.get_stored_photo(db, photo_id)
     if not photo:
         raise HTTPException(status_code=404, detail="Dog photo not found")
-    return photo
+
+    # Ревалідація без змін (304) не рахується як новий перегляд.
+    current = await dog_photo_service.add_pending_views(photo, increment=False)
+    response = conditional_response(request, current.model_dump_json().encode())
+    if response.status_code == 304:
+        return response
+
+    photo = await dog_photo_service.add_pending_views(photo, increment=True)
+    return conditional_response(request, photo.model_dump_json().encode())
+
+
+@router.delete(
+    "/{photo_id}",
+    status_code=204,
+    summary="Видалити зображення разом зі статистикою",
+)
+async def delete_dog_photo(
+    photo_id: int = Path(..., ge=1),
+    db: AsyncSession = Depends(get_db_session),
+):
+    if not await dog_photo_service.delete_photo(db, photo_id):
+        raise HTTPException(status_code=404, detail="Dog photo not found")
+    return Response(status_code=204)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -41,6 +41,13 @@ class DogPhotoRead(DogPhotoBase, BaseOutModel):
     pass
 
 
+class DogPhotoPage(BaseModel):
+    """Сторінка списку; ``next_cursor`` передається в наступний запит, None - це остання сторінка."""
+
+    items: List[DogPhotoRead]
+    next_cursor: Optional[str] = None
+
+
 class DogPhotoStatsRead(BaseModel):
     """DTO для статистики по одному фото."""
 
@@ -53,3 +60,29 @@ class DogPhotoWithStats(DogPhotoRead):
     """Зображення + статистика."""
 
     stats: Optional[DogPhotoStatsRead] = None
+
+
+class DogPhotoBulkRequest(BaseModel):
+    """Запит на масове збереження зображень."""
+
+    count: int = Field(..., ge=1, le=cfg.max_bulk_count, description="Скільки зображень зберегти")
+    breeds: Optional[List[str]] = Field(
+        None, description="Породи; кількість ділиться між ними порівну. Без порід - випадкові"
+    )
+
+
+class DogPhotoBulkItem(BaseModel):
+    """Результат по одному зображенню."""
+
+    status: str  # created | failed
+    breed: Optional[str] = None
+    image_url: Optional[str] = None
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class DogPhotoBulkResult(BaseModel):
+    requested: int
+    created: int
+    failed: int
+    items: List[DogPhotoBulkItem]
@@ -1,13 +1,53 @@
+import asyncio
+import logging
 from datetime import datetime
 from typing import Optional, Sequence
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from src.core.cache import bump_cache_version, cache_version
+from src.core.cached import cached
+from src.dashboard.repository import BreedRollupRepository
+from src.database.base import primary_session
+from src.dog_photos.config import dog_photo_config as cfg
 from src.dog_photos.models import DogPhoto, DogPhotoStats
 from src.dog_photos.repository import DogPhotoRepository
+from src.dog_photos.schema import (
+    DogPhotoBulkItem,
+    DogPhotoBulkResult,
+    DogPhotoPage,
+    DogPhotoRead,
+    DogPhotoStatsRead,
+    DogPhotoWithStats,
+)
+from src.dog_photos.utils import decode_cursor, encode_cursor, parse_breed_from_url
+from src.dog_photos.views import view_counter
+from src.external_api.config import dog_config
 from src.external_api.service import service as dog_api_service
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _plan_requests(count: int, breeds: Optional[list[str]]) -> list[tuple[Optional[str], int]]:
+    """Розбиває ``count`` на запити (порода, n) по не більше ніж max_images_per_request зображень."""
+    targets = [breed.strip().lower() for breed in breeds or [] if breed.strip()] or [None]
+    base, extra = divmod(count, len(targets))
+    plan = []
+    for index, breed in enumerate(targets):
+        remaining = base + (1 if index < extra else 0)
+        while remaining > 0:
+            n = min(remaining, dog_config.max_images_per_request)
+            plan.append((breed, n))
+            remaining -= n
+    return plan
+
+
+def _make_page(photos: Sequence[DogPhoto], limit: int) -> DogPhotoPage:
+    """Сторінка з ``limit + 1`` рядків: зайвий рядок лише означає, що є наступна сторінка."""
+    items = photos[:limit]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(photos) > limit else None
+    return DogPhotoPage(items=items, next_cursor=next_cursor)
 
 
 class DogPhotoService:
@@ -18,53 +58,218 @@ class DogPhotoService:
     ) -> DogPhoto:
         repo = DogPhotoRepository(db)
 
-        if breed:
-            img = await dog_api_service.get_image_by_breed(breed)
-            if img is None:
-                raise ValueError(f"Breed '{breed}' not found.")
-            image_url = str(img.message)
-            normalized_breed = breed.strip().lower()
-            sub_breed = None
-        else:
-            img = await dog_api_service.get_random_image()
-            image_url = str(img.message)
-            normalized_breed = None
-            sub_breed = None
+        # Нове зображення з пулу префетчу (до Dog API - лише коли пул порожній).
+        img = await dog_api_service.get_random_image(breed)
+        if img is None:
+            raise ValueError(f"Breed '{breed}' not found.")
+        image_url = str(img.message)
 
+        # Канонічна порода з URL dog.ceo: "afghan" і "hound afghan" -> ("hound", "afghan"),
+        # інакше breed_rollups і фільтр ?breed= розщеплюються на варіанти написання.
+        normalized_breed, sub_breed = parse_breed_from_url(image_url)
+        if normalized_breed is None and breed:
+            normalized_breed, _, sub_breed = dog_api_service.breeds.resolve(breed).partition("/")
+            sub_breed = sub_breed or None
+
+        # Фото, статистика і rollup - в одній транзакції: збій не залишить фото без статистики.
         photo = DogPhoto(image_url=image_url, breed=normalized_breed, sub_breed=sub_breed, created_at=datetime.now())
-        db.add(photo)
-        await db.commit()
-        await db.refresh(photo)
+        photo.stats = DogPhotoStats(views=0)
+        async with repo.transaction():
+            db.add(photo)
+            await db.flush()
+            await BreedRollupRepository(db).add_photos({(normalized_breed, sub_breed): 1})
+
+        await self._invalidate()
+        return photo
 
-        stats = DogPhotoStats(photo_id=photo.id)
-        db.add(stats)
-        await db.commit()
+    async def bulk_save_photos(
+        self,
+        db: AsyncSession,
+        count: int,
+        breeds: Optional[list[str]] = None,
+    ) -> DogPhotoBulkResult:
+        """
+        Масове збереження: паралельні запити до Dog API (не більше ``cfg.bulk_concurrency`` одночасно,
+        до 50 зображень за запит), далі вставка пачками по ``cfg.bulk_insert_batch`` рядків.
+        Помилки не зупиняють імпорт, а повертаються по кожному елементу.
+        """
+        semaphore = asyncio.Semaphore(cfg.bulk_concurrency)
 
-        stmt = select(DogPhoto).where(DogPhoto.id == photo.id).options(selectinload(DogPhoto.stats))
-        result = await db.execute(stmt)
-        photo_with_stats = result.scalar_one()
+        async def fetch(breed: Optional[str], n: int) -> list[str]:
+            async with semaphore:
+                response = await dog_api_service.get_random_images(n, breed)
+                return [str(url) for url in response.message]
+
+        plan = _plan_requests(count, breeds)
+        fetched = await asyncio.gather(*(fetch(breed, n) for breed, n in plan), return_exceptions=True)
+
+        items: list[DogPhotoBulkItem] = []
+        rows: list[dict] = []
+        for (breed, n), result in zip(plan, fetched):
+            if isinstance(result, BaseException):
+                items.extend(DogPhotoBulkItem(status="failed", breed=breed, error=str(result)) for _ in range(n))
+                continue
+            for image_url in result:
+                parsed_breed, sub_breed = parse_breed_from_url(image_url)
+                rows.append({"image_url": image_url, "breed": parsed_breed or breed, "sub_breed": sub_breed})
+            # Upstream може повернути менше зображень, ніж просили.
+            missing = n - len(result)
+            items.extend(
+                DogPhotoBulkItem(status="failed", breed=breed, error="Not enough images") for _ in range(missing)
+            )
+
+        repo = DogPhotoRepository(db)
+        for start in range(0, len(rows), cfg.bulk_insert_batch):
+            batch = rows[start : start + cfg.bulk_insert_batch]
+            try:
+                photo_ids = await repo.create_many_with_stats(batch)
+            except Exception as e:
+                logger.warning(f"[DOG_PHOTOS][BULK] insert of {len(batch)} rows failed: {e}")
+                items.extend(
+                    DogPhotoBulkItem(status="failed", breed=row["breed"], image_url=row["image_url"], error=str(e))
+                    for row in batch
+                )
+                continue
+            items.extend(
+                DogPhotoBulkItem(status="created", breed=row["breed"], image_url=row["image_url"], id=photo_id)
+                for row, photo_id in zip(batch, photo_ids)
+            )
+
+        created = sum(1 for item in items if item.status == "created")
+        if created:
+            await self._invalidate()
+        return DogPhotoBulkResult(requested=count, created=created, failed=len(items) - created, items=items)
+
+    async def list_photos(
+        self,
+        db: AsyncSession,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        breed: Optional[str] = None,
+    ) -> DogPhotoPage:
+        """
+        Keyset-пагінація по (created_at, id). Перша сторінка без фільтра береться з кешу,
+        решта - з БД через індекси ix_dog_photos_created_at_id / ix_dog_photos_breed.
+        """
+        if cursor is None and breed is None:
+            photos = await self._list_recent(db)
+        else:
+            photos = await self._list_page(db, limit, cursor, breed.strip().lower() if breed else None)
+        return _make_page(photos, limit)
 
-        return photo_with_stats
+    @staticmethod
+    async def _list_page(
+        db: AsyncSession, limit: int, cursor: Optional[str], breed: Optional[str]
+    ) -> Sequence[DogPhoto]:
+        after = decode_cursor(cursor) if cursor else None
+        return await DogPhotoRepository(db).list_page(limit, after=after, breed=breed)
 
-    async def list_photos(self, db: AsyncSession, limit: int = 50) -> Sequence[DogPhoto]:
+    @cached(key="cache:dog_photos:recent", ttl=settings.dog_photos_cache_TTL, model=list[DogPhotoRead])
+    async def _list_recent(self, db: AsyncSession) -> Sequence[DogPhoto]:
+        """Newest photos up to the largest page size (+1 to tell if there is a next page)."""
         repo = DogPhotoRepository(db)
-        return await repo.list_photos(limit)
+        return await repo.list_page(cfg.max_list_limit)
+
+    async def delete_photo(self, db: AsyncSession, photo_id: int) -> bool:
+        """Видаляє фото зі статистикою; False, якщо фото не знайдено."""
+        deleted = await DogPhotoRepository(db).delete_with_stats(photo_id)
+        if deleted:
+            await self._invalidate()
+        return deleted
+
+    async def _invalidate(self) -> None:
+        """Після запису в dog_photos: нова версія колекції робить застарілими всі кешовані відповіді."""
+        await self._list_recent.invalidate()
+        await bump_cache_version(DogPhoto.__tablename__)
+
+    async def list_photos_json(
+        self,
+        db: AsyncSession,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        breed: Optional[str] = None,
+    ) -> bytes:
+        """
+        Серіалізована сторінка ``list_photos``. Байти кешуються під поточною версією dog_photos,
+        тож повторні запити до наступного запису не торкаються БД і не серіалізують моделі.
+        """
+        breed = breed.strip().lower() if breed else None
+        version = await cache_version(DogPhoto.__tablename__)
+        if version is None:
+            page = await self.list_photos(db, limit, cursor=cursor, breed=breed)
+            return page.model_dump_json().encode()
+        return (await self._page_json(db, limit, cursor, breed, version)).encode()
+
+    @cached(key="cache:dog_photos:page:{version}:{limit}:{breed}:{cursor}", ttl=settings.dog_photos_response_cache_TTL)
+    async def _page_json(
+        self,
+        db: AsyncSession,
+        limit: int,
+        cursor: Optional[str],
+        breed: Optional[str],
+        version: str,
+    ) -> str:
+        # Промах заповнюємо з основної БД: репліка може ще не мати запису, який змінив версію.
+        # Не через _list_recent: його ключ без версії, тож він може тримати рядки, прочитані до запису.
+        async with primary_session(db) as primary:
+            photos = await self._list_page(primary, limit, cursor, breed)
+        return _make_page(photos, limit).model_dump_json()
+
+    async def get_stored_photo(self, db: AsyncSession, photo_id: int) -> Optional[DogPhotoWithStats]:
+        """
+        Фото зі статистикою з БД, без ще не записаних переглядів. Кешується під версіями
+        dog_photos і dog_photo_stats (друга змінюється при кожному записі переглядів).
+        """
+        version = await cache_version(DogPhoto.__tablename__, DogPhotoStats.__tablename__)
+        if version is None:
+            return await self._load_photo(db, photo_id)
+        return await self._cached_photo(db, photo_id, version)
+
+    @cached(
+        key="cache:dog_photos:photo:{photo_id}:{version}",
+        ttl=settings.dog_photos_response_cache_TTL,
+        model=DogPhotoWithStats,
+        negative_ttl=settings.cache_negative_TTL,
+    )
+    async def _cached_photo(self, db: AsyncSession, photo_id: int, version: str) -> Optional[DogPhotoWithStats]:
+        async with primary_session(db) as primary:
+            return await self._load_photo(primary, photo_id)
+
+    async def _load_photo(self, db: AsyncSession, photo_id: int) -> Optional[DogPhotoWithStats]:
+        photo = await DogPhotoRepository(db).get_by_id(photo_id)
+        return DogPhotoWithStats.model_validate(photo, from_attributes=True) if photo else None
+
+    async def add_pending_views(self, photo: DogPhotoWithStats, increment: bool = True) -> DogPhotoWithStats:
+        """
+        Додає до статистики ще не записані в БД перегляди. З ``increment=True`` спершу
+        зараховує перегляд write-behind лічильником (без запису в БД).
+        """
+        if increment:
+            delta, last_viewed_at = await view_counter.record_view(photo.id)
+        else:
+            delta, last_viewed_at = await view_counter.pending(photo.id)
+
+        if photo.stats is None or not delta:
+            return photo
+        stored = photo.stats.last_viewed_at
+        stats = DogPhotoStatsRead(
+            photo_id=photo.id,
+            views=(photo.stats.views or 0) + delta,
+            last_viewed_at=max(stored, last_viewed_at) if stored and last_viewed_at else stored or last_viewed_at,
+        )
+        return photo.model_copy(update={"stats": stats})
 
     async def get_photo_with_stats(
         self,
         db: AsyncSession,
         photo_id: int,
         increment: bool = True,
-    ) -> Optional[DogPhoto]:
-        repo = DogPhotoRepository(db)
-        photo = await repo.get_by_id(photo_id)
+    ) -> Optional[DogPhotoWithStats]:
+        """Фото зі статистикою, разом з ще не записаними переглядами."""
+        photo = await self.get_stored_photo(db, photo_id)
         if not photo:
             return None
-
-        if increment:
-            await repo.increment_views(photo_id)
-
-        return photo
+        return await self.add_pending_views(photo, increment=increment)
 
 
 dog_photo_service = DogPhotoService()
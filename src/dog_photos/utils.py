@@ -0,0 +1,29 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+
+def encode_cursor(created_at: datetime, photo_id: int) -> str:
+    """Непрозорий курсор для keyset-пагінації по (created_at, id)."""
+    raw = json.dumps([created_at.isoformat(), photo_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Розбирає курсор з ``encode_cursor``; ValueError, якщо він пошкоджений."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, photo_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(photo_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def parse_breed_from_url(image_url: str) -> tuple[Optional[str], Optional[str]]:
+    """Порода і підпорода з URL dog.ceo: ``.../breeds/hound-afghan/x.jpg`` -> ("hound", "afghan")."""
+    parts = image_url.split("/breeds/", 1)
+    if len(parts) != 2:
+        return None, None
+    breed, _, sub_breed = parts[1].split("/", 1)[0].partition("-")
+    return breed or None, sub_breed or None
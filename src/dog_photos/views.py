@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from src.core.cache import bump_cache_version
+from src.core.redis_client import get_redis
+from src.database.base import db_session_factory
+from src.dog_photos.models import DogPhotoStats
+from src.dog_photos.repository import DogPhotoRepository
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Pending views: field "{photo_id}" -> count, "{photo_id}:at" -> last view (unix time).
+PENDING_KEY = "dog_photos:views:pending"
+# Deltas taken by the flusher; kept until they are committed so reads still see them.
+FLUSHING_KEY = "dog_photos:views:flushing"
+LOCK_KEY = "dog_photos:views:flush_lock"
+
+Deltas = dict[int, tuple[int, datetime]]
+
+
+def _from_timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+def _parse_hash(data: dict) -> Deltas:
+    counts, seen = {}, {}
+    for field, value in data.items():
+        field = field.decode() if isinstance(field, bytes) else field
+        if field.endswith(":at"):
+            seen[int(field[:-3])] = float(value)
+        else:
+            counts[int(field)] = int(value)
+    return {photo_id: (count, _from_timestamp(seen.get(photo_id, time.time()))) for photo_id, count in counts.items()}
+
+
+class ViewCounter:
+    """
+    Write-behind лічильник переглядів.
+
+    Перегляди накопичуються атомарно в Redis (HINCRBY) або в буфері воркера і
+    раз на ``flush_interval`` секунд записуються в dog_photo_stats одним
+    UPDATE ... FROM (VALUES ...). У Redis-режимі флаш бере лок і атомарно
+    перейменовує хеш, тож кожен перегляд записує рівно один воркер.
+
+    Доставка "принаймні один раз": якщо процес впаде між комітом у БД і видаленням
+    FLUSHING_KEY, наступний флаш запише ту саму пачку ще раз (перегляди можуть бути
+    завищені на одну пачку, але не втрачаються). Поки Redis недоступний, перегляди
+    накопичуються в буфері воркера і записуються його флашем.
+    """
+
+    def __init__(self, backend: str = "redis", flush_interval: float = 5.0, lock_ttl_ms: int = 30000):
+        if backend not in ("redis", "memory"):
+            raise ValueError(f"Unknown view counter backend: {backend}")
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.lock_ttl_ms = lock_ttl_ms
+        self._buffer: dict[int, list] = {}
+        self._flushing: dict[int, list] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    async def record_view(self, photo_id: int) -> tuple[int, datetime]:
+        """Зарахувати перегляд; повертає ще не записані в БД (delta, last_viewed_at) для фото."""
+        now = time.time()
+        if self.backend == "memory":
+            return self._record_local(photo_id, now)
+
+        try:
+            redis = await get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hincrby(PENDING_KEY, str(photo_id), 1)
+                pipe.hset(PENDING_KEY, f"{photo_id}:at", now)
+                pipe.hget(FLUSHING_KEY, str(photo_id))
+                count, _, flushing = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"[DOG_PHOTOS][VIEWS] Redis unavailable, view of {photo_id} buffered locally: {e}")
+            return self._record_local(photo_id, now)
+        return count + int(flushing or 0), _from_timestamp(now)
+
+    def _record_local(self, photo_id: int, now: float) -> tuple[int, datetime]:
+        entry = self._buffer.setdefault(photo_id, [0, now])
+        entry[0] += 1
+        entry[1] = now
+        return self._pending_local(photo_id)
+
+    async def pending(self, photo_id: int) -> tuple[int, Optional[datetime]]:
+        """Ще не записані в БД перегляди фото: (delta, last_viewed_at або None)."""
+        if self.backend == "memory":
+            return self._pending_local(photo_id)
+
+        fields = [str(photo_id), f"{photo_id}:at"]
+        try:
+            redis = await get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hmget(PENDING_KEY, fields)
+                pipe.hmget(FLUSHING_KEY, fields)
+                (count, seen), (flushing_count, flushing_seen) = await pipe.execute()
+        except Exception as e:
+            # Без Redis показуємо лише перегляди з буфера воркера.
+            logger.warning(f"[DOG_PHOTOS][VIEWS] Redis unavailable, pending views of {photo_id} skipped: {e}")
+            return self._pending_local(photo_id)
+        last = max((float(t) for t in (seen, flushing_seen) if t is not None), default=None)
+        return int(count or 0) + int(flushing_count or 0), _from_timestamp(last) if last is not None else None
+
+    def _pending_local(self, photo_id: int) -> tuple[int, Optional[datetime]]:
+        entries = [e for e in (self._buffer.get(photo_id), self._flushing.get(photo_id)) if e is not None]
+        if not entries:
+            return 0, None
+        return sum(e[0] for e in entries), _from_timestamp(max(e[1] for e in entries))
+
+    async def flush(self) -> int:
+        """Записати накопичені перегляди в БД; повертає кількість оновлених фото."""
+        async with self._flush_lock:
+            if self.backend == "memory":
+                return await self._flush_local()
+            # Спершу перегляди, буферизовані, поки Redis був недоступний.
+            flushed = await self._flush_local() if self._buffer else 0
+            return flushed + await self._flush_redis()
+
+    async def _flush_local(self) -> int:
+        self._flushing, self._buffer = self._buffer, {}
+        deltas = {pid: (count, _from_timestamp(seen)) for pid, (count, seen) in self._flushing.items()}
+        try:
+            await self._apply(deltas)
+        except Exception:
+            # Повертаємо в буфер, щоб не втратити перегляди.
+            for photo_id, (count, seen) in self._flushing.items():
+                entry = self._buffer.setdefault(photo_id, [0, seen])
+                entry[0] += count
+                entry[1] = max(entry[1], seen)
+            raise
+        finally:
+            self._flushing = {}
+        return len(deltas)
+
+    async def _flush_redis(self) -> int:
+        redis = await get_redis()
+        token = uuid.uuid4().hex
+        if not await redis.set(LOCK_KEY, token, nx=True, px=self.lock_ttl_ms):
+            return 0
+        try:
+            # FLUSHING_KEY left by a flusher that died before committing is applied first.
+            if not await redis.exists(FLUSHING_KEY):
+                if not await redis.exists(PENDING_KEY):
+                    return 0
+                await redis.rename(PENDING_KEY, FLUSHING_KEY)
+            deltas = _parse_hash(await redis.hgetall(FLUSHING_KEY))
+            await self._apply(deltas)
+            # Падіння між комітом і цим DEL означає повторний запис пачки (див. docstring класу).
+            await redis.delete(FLUSHING_KEY)
+            return len(deltas)
+        finally:
+            async with redis.pipeline() as pipe:
+                await pipe.watch(LOCK_KEY)
+                value = await pipe.get(LOCK_KEY)
+                if value in (token, token.encode()):
+                    pipe.multi()
+                    pipe.delete(LOCK_KEY)
+                    await pipe.execute()
+                else:
+                    await pipe.unwatch()
+
+    async def _apply(self, deltas: Deltas) -> None:
+        if not deltas:
+            return
+        async with db_session_factory() as session:
+            await DogPhotoRepository(session).apply_view_deltas(deltas)
+        # До видалення FLUSHING_KEY: кешовані фото з новою версією вже містять ці перегляди.
+        await bump_cache_version(DogPhotoStats.__tablename__)
+        logger.info(f"[DOG_PHOTOS][VIEWS] flushed views for {len(deltas)} photos")
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"[DOG_PHOTOS][VIEWS] flush failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        """Зупинити таймер і записати все, що залишилось."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"[DOG_PHOTOS][VIEWS] final flush failed: {e}")
+
+
+view_counter = ViewCounter(
+    backend=settings.dog_photos_views_backend,
+    flush_interval=settings.dog_photos_views_flush_interval,
+    lock_ttl_ms=settings.dog_photos_views_flush_lock_ttl_ms,
+)
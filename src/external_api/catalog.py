@@ -0,0 +1,115 @@
+import asyncio
+import difflib
+import logging
+import re
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_SEPARATORS = re.compile(r"[\s/_-]+")
+
+
+class UnknownBreedError(ValueError):
+    """The breed is not in the catalog; ``suggestions`` holds close matches ("did you mean")."""
+
+    def __init__(self, breed: str, suggestions: list[str]):
+        self.breed = breed
+        self.suggestions = suggestions
+        message = f"Breed '{breed}' not found."
+        if suggestions:
+            message += f" Did you mean: {', '.join(suggestions)}?"
+        super().__init__(message)
+
+
+class BreedCatalog:
+    """
+    In-memory index of dog.ceo breeds, used to validate and normalize breed names
+    without an upstream call.
+
+    ``resolve`` maps user input to the canonical path: ``"Bulldog French"``,
+    ``"french bulldog"`` and ``"bulldog-french"`` all become ``"bulldog/french"``; a
+    sub-breed alone (``"afghan"``) resolves if only one breed has it. Until the first load
+    succeeds input is only normalized, not validated.
+    """
+
+    def __init__(self, load: Callable[[], Awaitable[dict[str, list[str]]]], refresh_interval: float = 3600.0):
+        self.load = load
+        self.refresh_interval = refresh_interval
+        self._paths: set[str] = set()
+        self._sub_breeds: dict[str, list[str]] = {}
+        # "hound afghan" / "afghan hound" -> "hound/afghan", for suggestions.
+        self._names: dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._paths)
+
+    def update(self, breeds: dict[str, list[str]]) -> None:
+        """Replace the index with ``breeds`` = ``{breed: [sub-breeds]}`` (the /breeds/list/all shape)."""
+        paths, sub_breeds, names = set(), {}, {}
+        for breed, subs in breeds.items():
+            paths.add(breed)
+            names[breed] = breed
+            for sub in subs:
+                path = f"{breed}/{sub}"
+                paths.add(path)
+                sub_breeds.setdefault(sub, []).append(path)
+                names[f"{breed} {sub}"] = names[f"{sub} {breed}"] = path
+        self._paths, self._sub_breeds, self._names = paths, sub_breeds, names
+
+    def resolve(self, breed: str) -> str:
+        """Canonical dog.ceo path of ``breed``; raises UnknownBreedError with suggestions."""
+        words = [word for word in _SEPARATORS.split(breed.strip().lower()) if word]
+        if not self.loaded:
+            return "/".join(words)
+
+        if len(words) == 1:
+            word = words[0]
+            if word in self._paths:
+                return word
+            if len(self._sub_breeds.get(word, ())) == 1:
+                return self._sub_breeds[word][0]
+        elif len(words) == 2:
+            for path in ("/".join(words), "/".join(reversed(words))):
+                if path in self._paths:
+                    return path
+        raise UnknownBreedError(breed, self.suggest(" ".join(words)))
+
+    def suggest(self, query: str, limit: int = 3) -> list[str]:
+        """Closest known breeds, as space-separated names (``"hound afghan"``)."""
+        matches = difflib.get_close_matches(query, self._names, n=limit * 2, cutoff=0.6)
+        if query in self._sub_breeds:
+            matches = [*self._sub_breeds[query], *matches]
+        suggestions = []
+        for name in matches:
+            suggestion = self._names.get(name, name).replace("/", " ")
+            if suggestion not in suggestions:
+                suggestions.append(suggestion)
+        return suggestions[:limit]
+
+    async def refresh(self) -> None:
+        self.update(await self.load())
+        logger.info(f"[DOG_API][BREEDS] catalog loaded: {len(self._paths)} breeds and sub-breeds")
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                # The previous index (or plain normalization) stays in use.
+                logger.warning(f"[DOG_API][BREEDS] catalog refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval if self.loaded else min(self.refresh_interval, 30.0))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -8,5 +8,11 @@ class DogConfig:
     min_url_length: int = 10
     max_url_length: int = 500
 
+    # dog.ceo віддає не більше 50 зображень за один запит .../random/{n}
+    max_images_per_request: int = 50
+
+    max_batch_images: int = 100  # зображень за один запит /external/dog/random-images
+    batch_concurrency: int = 8  # одночасних запитів до Dog API з одного батчу
+
 
 dog_config = DogConfig()
@@ -0,0 +1,102 @@
+import logging
+import mimetypes
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.core.disk_cache import CachedFile, DiskLRUCache, ObjectTooLargeError
+from src.core.http_client import create_http_client
+from src.core.singleflight import SingleFlight
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ImageNotAllowedError(ValueError):
+    """The URL is not an http(s) URL on one of ``image_proxy_allowed_hosts``."""
+
+
+class ImageUpstreamError(RuntimeError):
+    """The upstream did not return the image; ``status_code`` is its HTTP status, if any."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ImageProxy:
+    """
+    Proxies images from the allowed hosts through a local disk cache.
+
+    A miss streams the upstream body (``httpx`` ``aiter_bytes``) straight into the cache file,
+    so memory use does not depend on image size; concurrent misses for the same URL share one
+    download. Hits and misses alike are then served from the file, with Range support.
+    """
+
+    def __init__(
+        self,
+        cache: DiskLRUCache,
+        allowed_hosts: list[str],
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.cache = cache
+        self.allowed_hosts = set(allowed_hosts)
+        self.client = create_http_client("dog_images", transport=transport)
+        # Per worker: the cache directory is local to the host, so no Redis lock.
+        self._downloads = SingleFlight()
+
+    def check_url(self, url: str) -> str:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or parts.hostname not in self.allowed_hosts:
+            raise ImageNotAllowedError(f"Only images from {', '.join(sorted(self.allowed_hosts))} can be proxied.")
+        return url
+
+    @staticmethod
+    def media_type(url: str) -> str:
+        return mimetypes.guess_type(urlsplit(url).path)[0] or "application/octet-stream"
+
+    async def get(self, url: str) -> CachedFile:
+        """Cached copy of the image at ``url``, downloading it on a miss."""
+        url = self.check_url(url)
+        cached = await self.cache.get(url)
+        if cached is not None:
+            return cached
+        return await self._downloads.do(url, lambda: self._download(url))
+
+    async def pin(self, url: str, cached: CachedFile) -> CachedFile:
+        """
+        ``cached`` (from ``get(url)``) pinned for serving (``cache.pin``), downloaded again if it was
+        evicted in the meantime. Release it with ``cache.unpin``.
+        """
+        try:
+            return await self.cache.pin(cached)
+        except FileNotFoundError:
+            return await self.cache.pin(await self.get(url))
+
+    async def _download(self, url: str) -> CachedFile:
+        try:
+            async with self.client.stream("GET", url) as response:
+                if response.status_code != 200:
+                    raise ImageUpstreamError(f"Upstream returned {response.status_code}", response.status_code)
+                if int(response.headers.get("content-length", 0)) > self.cache.max_object_bytes:
+                    raise ObjectTooLargeError(f"Object is larger than {self.cache.max_object_bytes} bytes")
+                cached = await self.cache.put(url, response.aiter_bytes())
+        except httpx.HTTPError as e:
+            raise ImageUpstreamError(f"Upstream request failed: {e!r}")
+        logger.info(f"[DOG_API][IMAGE_PROXY] cached {url} ({cached.size} bytes)")
+        return cached
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+image_proxy = ImageProxy(
+    DiskLRUCache(
+        "image_proxy",
+        settings.image_proxy_cache_dir,
+        max_bytes=settings.image_proxy_cache_max_bytes,
+        max_object_bytes=settings.image_proxy_max_object_bytes,
+    ),
+    allowed_hosts=settings.image_proxy_allowed_hosts,
+)
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
@@ -27,6 +27,17 @@ class DogImageResponse(BaseModel):
     model_config = model_config
 
 
+class DogImageListResponse(BaseModel):
+    """
+    Відповідь зі списком URL зображень.
+    Відповідає /breeds/image/random/{n} та /breed/{breed}/images/random/{n}
+    """
+
+    message: List[HttpUrl]
+    status: str
+    model_config = model_config
+
+
 class DogBreedListResponse(BaseModel):
     """
     Відповідь, що містить список порід.
@@ -36,3 +47,21 @@ class DogBreedListResponse(BaseModel):
     message: Dict[str, List[str]]
     status: str
     model_config = model_config
+
+
+class DogImageBatchItem(BaseModel):
+    """Результат по одному зображенню батчу."""
+
+    status: str  # ok | failed
+    breed: Optional[str] = None
+    image_url: Optional[str] = None
+    error: Optional[str] = None
+
+
+class DogImageBatchResponse(BaseModel):
+    """Відповідь /external/dog/random-images: спершу зображення по породах (в порядку запиту), потім випадкові."""
+
+    requested: int
+    returned: int
+    failed: int
+    items: List[DogImageBatchItem]
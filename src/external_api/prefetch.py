@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from src.core.redis_client import get_redis
+from src.external_api.config import dog_config as cfg
+
+logger = logging.getLogger(__name__)
+
+# Redis list per breed path ("any" for random breeds); LPOP takes an image, RPUSH refills.
+POOL_KEY = "external:dog_random:pool:{}"
+ANY_BREED = "any"
+
+Fetch = Callable[[int, Optional[str]], Awaitable[list[str]]]
+
+
+class RandomImagePool:
+    """
+    Prefetched random images per breed, so random requests do not wait on dog.ceo.
+
+    ``pop`` takes one URL in O(1) (LPOP or a deque) and, once fewer than ``low_water`` are
+    left, schedules a background refill up to ``size`` via the multi-image endpoint
+    (``fetch(n, breed)``). Breeds are refilled only after they are ``track``-ed, i.e. known
+    to exist; a background task also tops up every tracked breed each ``refill_interval``.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        backend: str = "redis",
+        size: int = 50,
+        low_water: int = 10,
+        refill_interval: float = 30.0,
+        max_breeds: int = 50,
+    ):
+        if backend not in ("redis", "memory", "none"):
+            raise ValueError(f"Unknown random image pool backend: {backend}")
+        self.fetch = fetch
+        self.backend = backend
+        self.size = size
+        self.low_water = low_water
+        self.refill_interval = refill_interval
+        self.max_breeds = max_breeds
+        self._local: dict[str, deque] = {}
+        self._tracked: dict[str, Optional[str]] = {}
+        self._refills: dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend != "none"
+
+    @staticmethod
+    def _name(breed: Optional[str]) -> str:
+        return breed or ANY_BREED
+
+    async def pop(self, breed: Optional[str] = None) -> Optional[str]:
+        """Take a prefetched image URL of ``breed`` (a dog.ceo breed path), or None if the pool is empty (or down)."""
+        urls = await self.pop_many(1, breed)
+        return urls[0] if urls else None
+
+    async def pop_many(self, count: int, breed: Optional[str] = None) -> list[str]:
+        """
+        Take up to ``count`` prefetched image URLs of ``breed`` in one round trip (LPOP with a count).
+        A Redis error is logged and counts as an empty pool, so callers fall back to dog.ceo.
+        """
+        if not self.enabled or count <= 0:
+            return []
+        name = self._name(breed)
+        if self.backend == "memory":
+            images = self._local.get(name) or deque()
+            urls = [images.popleft() for _ in range(min(count, len(images)))]
+            remaining = len(images)
+        else:
+            try:
+                redis = await get_redis()
+                async with redis.pipeline(transaction=False) as pipe:
+                    urls, remaining = (
+                        await pipe.lpop(POOL_KEY.format(name), count).llen(POOL_KEY.format(name)).execute()
+                    )
+            except Exception as e:
+                logger.warning(f"[DOG_API][PREFETCH] pop from {name} failed: {e}")
+                return []
+            urls = [url.decode() if isinstance(url, bytes) else url for url in urls or ()]
+
+        if remaining < self.low_water and name in self._tracked:
+            self._schedule_refill(breed)
+        return urls
+
+    def track(self, breed: Optional[str] = None) -> None:
+        """Keep a pool for ``breed`` (up to ``max_breeds`` of them) and fill it in the background."""
+        if not self.enabled:
+            return
+        name = self._name(breed)
+        if name not in self._tracked:
+            if len(self._tracked) >= self.max_breeds:
+                return
+            self._tracked[name] = breed
+        self._schedule_refill(breed)
+
+    def _schedule_refill(self, breed: Optional[str]) -> None:
+        name = self._name(breed)
+        if name in self._refills:
+            return
+
+        async def run() -> None:
+            try:
+                await self.refill(breed)
+            except Exception as e:
+                logger.warning(f"[DOG_API][PREFETCH] refill of {name} failed: {e}")
+
+        task = asyncio.create_task(run())
+        self._refills[name] = task
+        task.add_done_callback(lambda _: self._refills.pop(name, None))
+
+    async def _length(self, name: str) -> int:
+        if self.backend == "memory":
+            return len(self._local.get(name, ()))
+        redis = await get_redis()
+        return await redis.llen(POOL_KEY.format(name))
+
+    async def _push(self, name: str, urls: list[str]) -> None:
+        if self.backend == "memory":
+            images = self._local.setdefault(name, deque())
+            images.extend(urls[: self.size - len(images)])
+            return
+        redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            # Workers may refill the same breed at once; LTRIM keeps the list at ``size``.
+            await pipe.rpush(POOL_KEY.format(name), *urls).ltrim(POOL_KEY.format(name), 0, self.size - 1).execute()
+
+    async def refill(self, breed: Optional[str] = None) -> int:
+        """Top the pool of ``breed`` up to ``size``; returns the number of images added."""
+        name = self._name(breed)
+        added = 0
+        missing = self.size - await self._length(name)
+        while missing > 0:
+            urls = await self.fetch(min(missing, cfg.max_images_per_request), breed)
+            if not urls:
+                break
+            await self._push(name, urls)
+            added += len(urls)
+            missing -= len(urls)
+        return added
+
+    async def _refill_forever(self) -> None:
+        while True:
+            tracked = list(self._tracked.values())
+            results = await asyncio.gather(*(self.refill(breed) for breed in tracked), return_exceptions=True)
+            for breed, result in zip(tracked, results):
+                if isinstance(result, BaseException):
+                    logger.warning(f"[DOG_API][PREFETCH] refill of {self._name(breed)} failed: {result}")
+            await asyncio.sleep(self.refill_interval)
+
+    def start(self, breeds: tuple[Optional[str], ...] = (None,)) -> None:
+        """Start periodic refills of ``breeds`` (None = any breed)."""
+        if not self.enabled or self._task is not None:
+            return
+        for breed in breeds:
+            self._tracked.setdefault(self._name(breed), breed)
+        self._task = asyncio.create_task(self._refill_forever())
+
+    async def stop(self) -> None:
+        tasks = [task for task in (self._task, *self._refills.values()) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._refills.clear()
@@ -1,11 +1,19 @@
-from typing import Optional
+from typing import List, Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, HTTPException, Path, Query
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from fastapi.responses import FileResponse, HTMLResponse
 from pydantic import HttpUrl
+from starlette.background import BackgroundTask
 
-from src.external_api.models import DogBreedListResponse, DogImageResponse
-from src.external_api.service import service
+from src.core.disk_cache import CachedFile, ObjectTooLargeError
+from src.core.http_cache import etag_matches
+from src.external_api.catalog import UnknownBreedError
+from src.external_api.config import dog_config as cfg
+from src.external_api.image_proxy import ImageNotAllowedError, ImageUpstreamError, image_proxy
+from src.external_api.models import DogBreedListResponse, DogImageBatchResponse, DogImageResponse
+from src.external_api.service import UpstreamUnavailableError, service
+from src.settings import settings
 
 router = APIRouter(prefix="/external", tags=["External API (Dogs)"])
 
@@ -14,10 +22,27 @@ router = APIRouter(prefix="/external", tags=["External API (Dogs)"])
 async def get_random_dog_image():
     try:
         return await service.get_random_image()
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+    "/dog/random-images",
+    response_model=DogImageBatchResponse,
+    summary="Пакет випадкових зображень: по одному на кожну породу + count будь-яких",
+)
+async def get_random_dog_images(
+    count: int = Query(0, ge=0, le=cfg.max_batch_images, description="Скільки зображень будь-яких порід"),
+    breed: Optional[List[str]] = Query(None, description="Породи (можна повторювати), по зображенню на кожну"),
+):
+    breeds = breed or []
+    if not 0 < count + len(breeds) <= cfg.max_batch_images:
+        raise HTTPException(status_code=422, detail=f"Request between 1 and {cfg.max_batch_images} images.")
+    return await service.get_random_image_batch(count, breeds)
+
+
 @router.get(
     "/dog/image-by-breed/{breed_name}", response_model=DogImageResponse, summary="Випадкове зображення за породою"
 )
@@ -29,6 +54,10 @@ async def get_dog_image_by_breed(
         if item is None:
             raise HTTPException(status_code=404, detail=f"Breed '{breed_name}' not found.")
         return item
+    except UnknownBreedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -39,10 +68,47 @@ async def get_dog_image_by_breed(
 async def get_all_breeds():
     try:
         return await service.get_all_breeds()
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _image_headers(cached: CachedFile) -> dict[str, str]:
+    # Вміст за URL на images.dog.ceo не змінюється, тож браузер може кешувати надовго.
+    return {"ETag": cached.etag, "Cache-Control": f"public, max-age={settings.image_proxy_max_age}"}
+
+
+@router.get(
+    "/dog/image",
+    response_class=FileResponse,
+    summary="Зображення через проксі з дисковим кешем (Range, ETag)",
+)
+async def proxy_dog_image(
+    request: Request,
+    url: str = Query(..., description="URL зображення (images.dog.ceo)"),
+):
+    try:
+        cached = await image_proxy.get(url)
+        if etag_matches(request.headers.get("if-none-match"), cached.etag):
+            return Response(status_code=304, headers=_image_headers(cached))
+        # Файл кешу можуть витіснити, поки відповідь ще надсилається: віддаємо його через жорстке посилання.
+        pinned = await image_proxy.pin(url, cached)
+    except ImageNotAllowedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImageUpstreamError as e:
+        raise HTTPException(status_code=404 if e.status_code == 404 else 502, detail=str(e))
+    except ObjectTooLargeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    return FileResponse(
+        pinned.path,
+        media_type=image_proxy.media_type(url),
+        headers=_image_headers(pinned),
+        background=BackgroundTask(image_proxy.cache.unpin, pinned),
+    )
+
+
 @router.get("/dog/html", response_class=HTMLResponse, summary="Випадкове зображення (HTML-сторінка)")
 async def get_random_dog_html(
     breed: Optional[str] = Query(None, description="Опціонально: фільтр за породою (н-д, 'beagle')")
@@ -58,13 +124,15 @@ async def get_random_dog_html(
             title = "Random Dog"
 
         image_url: HttpUrl = item.message
+        # Зображення віддаємо через власний проксі з дисковим кешем.
+        proxied_url = f"{router.prefix}/dog/image?url={quote(str(image_url), safe='')}"
 
         return f"""
         <html>
             <head><title>{title}</title></head>
             <body style="font-family:Arial; text-align:center; padding-top: 20px; background-color: #f4f4f4;">
                 <h2>{title}</h2>
-                <img src="{image_url}" alt="{title}>
+                <img src="{proxied_url}" alt="{title}>
             </body>
         </html>
         """
@@ -74,4 +142,8 @@ async def get_random_dog_html(
         if isinstance(e, HTTPException):
             detail = e.detail
             status = e.status_code
+        elif isinstance(e, UnknownBreedError):
+            status = 404
+        elif isinstance(e, UpstreamUnavailableError):
+            status = 503
         return f"<html><body style='font-family:Arial;'><h2>Error {status}</h2><p>{detail}</p></body></html>"
@@ -1,18 +1,51 @@
+import asyncio
+import logging
 from typing import Optional
 
 import httpx
 import sentry_sdk
 
-from src.core.cache import cache_get, cache_set
+from src.core.cache import NEGATIVE_ENTRY, cache_get_many, cache_set_many, is_negative
+from src.core.cached import cached
+from src.core.http_client import CircuitOpenError, create_http_client
+from src.core.singleflight import singleflight
+from src.core.swr import swr_get_many
+from src.external_api.catalog import BreedCatalog, UnknownBreedError
 from src.external_api.config import dog_config as cfg
-from src.external_api.models import DogBreedListResponse, DogImageResponse
+from src.external_api.models import (
+    DogBreedListResponse,
+    DogImageBatchItem,
+    DogImageBatchResponse,
+    DogImageListResponse,
+    DogImageResponse,
+)
+from src.external_api.prefetch import RandomImagePool
 from src.settings import settings
 
+logger = logging.getLogger(__name__)
+
+
+class UpstreamUnavailableError(RuntimeError):
+    """dog.ceo did not answer: circuit open, timeout, network error or a 5xx response."""
+
+
+class BreedNotFoundError(RuntimeError):
+    """dog.ceo answered 404: the breed does not exist. The only failure cached as "not found"."""
+
 
 class DogApiService:
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.base_url = cfg.base_url
-        self.client = httpx.AsyncClient(timeout=10.0)
+        self.client = create_http_client("dog_api", transport=transport)
+        self.breeds = BreedCatalog(self._load_breeds, refresh_interval=settings.dog_breed_catalog_refresh_interval)
+        self.random_pool = RandomImagePool(
+            self._fetch_random_urls,
+            backend=settings.dog_random_pool_backend,
+            size=settings.dog_random_pool_size,
+            low_water=settings.dog_random_pool_low_water,
+            refill_interval=settings.dog_random_pool_refill_interval,
+            max_breeds=settings.dog_random_pool_max_breeds,
+        )
 
     async def _make_request(self, endpoint: str) -> dict:
         full_url = f"{self.base_url}/{endpoint}"
@@ -26,48 +59,245 @@ class DogApiService:
 
             return data
 
-        except httpx.HTTPError as http_err:
+        except CircuitOpenError as err:
+            # Fail fast; not reported to Sentry, the failures that opened the circuit were.
+            raise UpstreamUnavailableError(str(err))
+        except httpx.HTTPStatusError as http_err:
+            if http_err.response.status_code == 404:
+                raise BreedNotFoundError(f"API error: {str(http_err)}")
             sentry_sdk.capture_exception(http_err)
+            if http_err.response.status_code >= 500:
+                raise UpstreamUnavailableError(f"API error: {str(http_err)}")
             raise RuntimeError(f"API error: {str(http_err)}")
+        except httpx.HTTPError as http_err:
+            # Timeouts and network errors (already retried by the client).
+            sentry_sdk.capture_exception(http_err)
+            raise UpstreamUnavailableError(f"API error: {str(http_err)}")
         except Exception as err:
             sentry_sdk.capture_exception(err)
             raise RuntimeError(f"Request failed: {err}")
 
-    async def get_random_image(self) -> DogImageResponse:
-        cache_key = "cache:external:dog_random"
-        cached = await cache_get(cache_key)
-        if cached:
-            return DogImageResponse.model_validate(cached)
+    async def get_random_image(self, breed: Optional[str] = None) -> Optional[DogImageResponse]:
+        """
+        A different random image (of ``breed``) on every call: taken from the prefetch pool, or
+        requested from the upstream when the pool is empty. Unknown breeds raise UnknownBreedError
+        (checked locally); None if the upstream does not know the breed either.
+        """
+        breed = self.breeds.resolve(breed) if breed else None
+        url = await self.random_pool.pop(breed)
+        if url is not None:
+            return DogImageResponse(message=url, status="success")
 
-        data = await self._make_request("breeds/image/random")
-        await cache_set(cache_key, data, settings.redis_TTL)
+        try:
+            data = await self._make_request(f"breed/{breed}/images/random" if breed else "breeds/image/random")
+        except BreedNotFoundError:
+            if breed is None:
+                raise
+            return None
+        # The breed exists: keep a pool for it from now on.
+        self.random_pool.track(breed)
         return DogImageResponse.model_validate(data)
 
+    async def _fetch_random_urls(self, count: int, breed: Optional[str]) -> list[str]:
+        return [str(url) for url in (await self.get_random_images(count, breed)).message]
+
     async def get_image_by_breed(self, breed: str) -> Optional[DogImageResponse]:
-        cache_key = f"cache:external:dog_breed:{breed.lower()}"
-        cached = await cache_get(cache_key)
-        if cached:
-            return DogImageResponse.model_validate(cached)
+        """Random image of ``breed`` (cached per breed); unknown breeds raise UnknownBreedError locally."""
+        return await self._image_by_breed(self.breeds.resolve(breed))
 
+    @cached(
+        key=lambda path: f"cache:external:dog_breed:{path}",
+        ttl=settings.redis_TTL,
+        model=DogImageResponse,
+        negative_ttl=settings.cache_negative_TTL,
+        swr=settings.cache_swr_enabled,
+        stale_ttl=settings.redis_stale_TTL,
+        beta=settings.cache_xfetch_beta,
+    )
+    async def _image_by_breed(self, path: str) -> Optional[DogImageResponse]:
         try:
-            breed_clean = breed.strip().lower().replace(" ", "/")
-            data = await self._make_request(f"breed/{breed_clean}/images/random")
-            await cache_set(cache_key, data, settings.redis_TTL)
+            data = await self._make_request(f"breed/{path}/images/random")
             return DogImageResponse.model_validate(data)
-        except RuntimeError:
+        except BreedNotFoundError:
+            # Only dog.ceo's 404 is cached as a negative entry. Other failures propagate, so a stale
+            # entry is served (SWR) or the endpoint answers 503, instead of "not found" for negative_ttl.
             return None
 
-    async def get_all_breeds(self) -> DogBreedListResponse:
-        cache_key = "cache:external:dog_breeds"
-        cached = await cache_get(cache_key)
-        if cached:
-            return DogBreedListResponse.model_validate(cached)
+    async def get_random_images(self, count: int, breed: Optional[str] = None) -> DogImageListResponse:
+        """
+        Up to ``count`` random images (capped at ``cfg.max_images_per_request``) in one upstream call.
+        Not cached: every call is expected to return new images.
+        """
+        count = min(count, cfg.max_images_per_request)
+        if breed:
+            data = await self._make_request(f"breed/{self.breeds.resolve(breed)}/images/random/{count}")
+        else:
+            data = await self._make_request(f"breeds/image/random/{count}")
+        return DogImageListResponse.model_validate(data)
+
+    async def get_images_by_breeds(
+        self, breeds: list[str], semaphore: Optional[asyncio.Semaphore] = None
+    ) -> dict[str, Optional[DogImageResponse]]:
+        """
+        Random image per breed: one MGET for cached breeds, concurrent upstream calls for the rest
+        (at most ``cfg.batch_concurrency`` at once, or as many as ``semaphore`` allows when the caller
+        shares its own limit). Breeds missing from the catalog map to None without an upstream call;
+        so do breeds whose upstream call failed, but only a 404 is cached.
+        """
+        paths = {}
+        for breed in breeds:
+            try:
+                paths[breed] = self.breeds.resolve(breed)
+            except UnknownBreedError:
+                continue
+        cache_keys = {breed: self._image_by_breed.key_for(path) for breed, path in paths.items()}
+        semaphore = semaphore or asyncio.Semaphore(cfg.batch_concurrency)
+
+        def loader(breed: str):
+            async def load() -> dict:
+                try:
+                    async with semaphore:
+                        return await self._make_request(f"breed/{paths[breed]}/images/random")
+                except BreedNotFoundError:
+                    return NEGATIVE_ENTRY
 
+            return load
+
+        if settings.cache_swr_enabled:
+            found = await swr_get_many(
+                {cache_keys[breed]: loader(breed) for breed in cache_keys},
+                ttl=settings.redis_TTL,
+                stale_ttl=settings.redis_stale_TTL,
+                beta=settings.cache_xfetch_beta,
+                negative_ttl=settings.cache_negative_TTL,
+            )
+        else:
+            found = await cache_get_many(list(cache_keys.values()))
+            missing = [breed for breed in cache_keys if cache_keys[breed] not in found]
+            fetched = await asyncio.gather(
+                *(singleflight.do(cache_keys[breed], loader(breed)) for breed in missing), return_exceptions=True
+            )
+            loaded = {
+                cache_keys[breed]: data for breed, data in zip(missing, fetched) if not isinstance(data, BaseException)
+            }
+            await cache_set_many({k: v for k, v in loaded.items() if not is_negative(v)}, settings.redis_TTL)
+            await cache_set_many({k: v for k, v in loaded.items() if is_negative(v)}, settings.cache_negative_TTL)
+            found.update(loaded)
+
+        return {
+            breed: (
+                None
+                if breed not in cache_keys or is_negative(found.get(cache_keys[breed], NEGATIVE_ENTRY))
+                else DogImageResponse.model_validate(found[cache_keys[breed]])
+            )
+            for breed in breeds
+        }
+
+    async def get_random_image_batch(self, count: int = 0, breeds: Optional[list[str]] = None) -> DogImageBatchResponse:
+        """
+        One image per entry of ``breeds`` plus ``count`` images of any breed, in one call.
+
+        Prefetched images are used first. The rest of a breed requested once comes from the
+        per-breed cache (``get_images_by_breeds``); several images of the same target come
+        from the /random/{n} endpoints, up to 50 per upstream call and at most
+        ``cfg.batch_concurrency`` calls at once. Failures are reported per item.
+        """
+        breeds = breeds or []
+        items: list[Optional[DogImageBatchItem]] = [None] * (len(breeds) + count)
+        groups: dict[Optional[str], list[int]] = {}
+        for index, breed in enumerate(breeds):
+            try:
+                groups.setdefault(self.breeds.resolve(breed), []).append(index)
+            except UnknownBreedError as e:
+                items[index] = DogImageBatchItem(status="failed", breed=breed, error=str(e))
+        if count:
+            groups[None] = list(range(len(breeds), len(breeds) + count))
+
+        def fill(indices: list[int], breed: Optional[str], urls: list[str]) -> None:
+            for index, url in zip(indices, urls):
+                items[index] = DogImageBatchItem(status="ok", breed=breed, image_url=url)
+            for index in indices[len(urls) :]:
+                items[index] = DogImageBatchItem(status="failed", breed=breed, error="Not enough images")
+
+        semaphore = asyncio.Semaphore(cfg.batch_concurrency)
+
+        async def fetch(breed: Optional[str], indices: list[int]) -> None:
+            async with semaphore:
+                try:
+                    urls = await self._fetch_random_urls(len(indices), breed)
+                except Exception as e:
+                    for index in indices:
+                        items[index] = DogImageBatchItem(status="failed", breed=breed, error=str(e))
+                    return
+            if breed is not None:
+                self.random_pool.track(breed)
+            fill(indices, breed, urls)
+
+        singles: dict[str, int] = {}
+        requests = []
+        pools = await asyncio.gather(
+            *(self.random_pool.pop_many(len(ix), breed) for breed, ix in groups.items()), return_exceptions=True
+        )
+        for (breed, indices), pooled in zip(groups.items(), pools):
+            if isinstance(pooled, BaseException):
+                # The pool is only a shortcut: the whole group is requested from the upstream instead.
+                logger.warning(f"[DOG_API][BATCH] pool of {breed or 'any'} failed: {pooled}")
+                pooled = []
+            fill(indices[: len(pooled)], breed, pooled)
+            rest = indices[len(pooled) :]
+            if breed is not None and len(rest) == 1:
+                singles[breed] = rest[0]
+                continue
+            step = cfg.max_images_per_request
+            requests.extend(fetch(breed, rest[start : start + step]) for start in range(0, len(rest), step))
+
+        async def fetch_singles() -> None:
+            if not singles:
+                return
+            try:
+                # The same semaphore: the whole batch stays within ``cfg.batch_concurrency`` calls.
+                found = await self.get_images_by_breeds(list(singles), semaphore=semaphore)
+            except Exception as e:
+                found, error = {}, str(e)
+            else:
+                error = "Image not available"
+            for breed, index in singles.items():
+                image = found.get(breed)
+                if image is None:
+                    items[index] = DogImageBatchItem(status="failed", breed=breed, error=error)
+                else:
+                    items[index] = DogImageBatchItem(status="ok", breed=breed, image_url=str(image.message))
+
+        await asyncio.gather(fetch_singles(), *requests)
+        returned = sum(1 for item in items if item.status == "ok")
+        return DogImageBatchResponse(requested=len(items), returned=returned, failed=len(items) - returned, items=items)
+
+    @cached(
+        key="cache:external:dog_breeds",
+        ttl=settings.redis_TTL,
+        model=DogBreedListResponse,
+        swr=settings.cache_swr_enabled,
+        stale_ttl=settings.redis_stale_TTL,
+        beta=settings.cache_xfetch_beta,
+    )
+    async def get_all_breeds(self) -> DogBreedListResponse:
         data = await self._make_request("breeds/list/all")
-        await cache_set(cache_key, data, settings.redis_TTL)
         return DogBreedListResponse.model_validate(data)
 
+    async def _load_breeds(self) -> dict[str, list[str]]:
+        return (await self.get_all_breeds()).message
+
+    def start(self) -> None:
+        """
+        Start background tasks: breed catalog refreshes and refills of the random image pools
+        (any breed + ``dog_random_pool_breeds``).
+        """
+        self.breeds.start()
+        self.random_pool.start((None, *(self.breeds.resolve(breed) for breed in settings.dog_random_pool_breeds)))
+
     async def close(self):
+        await self.breeds.stop()
+        await self.random_pool.stop()
         await self.client.aclose()
 
 
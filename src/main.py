@@ -7,16 +7,23 @@ from src.cache.router import router as cache_router
 
 # Імпорти налаштувань логування та Sentry
 # (перевір шляхи, якщо раптом файли лежать інакше, але судячи з історії - так)
+from src.core.cache import start_cache_invalidation, stop_cache_invalidation
 from src.core.logging.logging_config import setup_logging
 
 # Імпорти роутерів
 from src.core.logging.sentry import init_sentry
 from src.core.redis_client import close_redis
+from src.dashboard import router as dashboard_router
+from src.database.base import ReadYourWritesMiddleware, dispose_engine, warm_up_db_pool
+from src.database.instrumentation import QueryStatsMiddleware
 from src.dog_photos import router as dog_photos_router
+from src.dog_photos.views import view_counter
 from src.external_api import router as external_router
+from src.external_api.image_proxy import image_proxy
 
 # Імпорти сервісів для закриття з'єднань
 from src.external_api.service import service
+from src.settings import settings
 from src.storage import router as storage_router
 
 
@@ -25,12 +32,20 @@ async def lifespan(app: FastAPI):
     # --- STARTUP (Запуск) ---
     setup_logging()  # Налаштовуємо логування
     init_sentry()  # Підключаємо Sentry
+    await start_cache_invalidation()  # Слухаємо інвалідацію L1-кешу
+    await warm_up_db_pool()  # Відкриваємо з'єднання з БД заздалегідь
+    view_counter.start()  # Періодичний запис переглядів у БД
+    service.start()  # Фонове оновлення каталогу порід і пулу випадкових зображень
 
     yield
 
     # --- SHUTDOWN (Вимкнення) ---
-    await service.close()  # Закриваємо клієнт зовнішнього API
+    await view_counter.stop()  # Записуємо накопичені перегляди
+    await stop_cache_invalidation()
+    await service.close()  # Зупиняємо фонові задачі і закриваємо клієнт зовнішнього API
+    await image_proxy.close()  # Закриваємо клієнт проксі зображень
     await close_redis()  # Закриваємо Redis
+    await dispose_engine()  # Закриваємо пул з'єднань з БД
 
 
 app = FastAPI(
@@ -43,9 +58,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadYourWritesMiddleware)  # cookie read-your-writes після запису в основну БД
+
+if settings.db_query_instrumentation:
+    app.add_middleware(QueryStatsMiddleware)
 
 app.include_router(storage_router.router)
 app.include_router(external_router.router)
+app.include_router(dashboard_router.router)  # до dog_photos: /dog-photos/top перед /dog-photos/{photo_id}
 app.include_router(dog_photos_router.router)
 app.include_router(cache_router)
 
@@ -1,9 +1,16 @@
 import os
+from contextlib import asynccontextmanager, contextmanager
 
 import fakeredis.aioredis
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
+from src.database import base as database
+from src.database.base import Base
+from src.database.instrumentation import instrument_engine, track_queries
 from src.main import app
 
 os.environ["TESTING"] = "1"
@@ -18,5 +25,88 @@ def client():
 def fake_redis(monkeypatch):
     redis = fakeredis.aioredis.FakeRedis()
 
-    monkeypatch.setattr("src.cache.service.get_redis", lambda: redis)
+    async def _get_redis():
+        return redis
+
+    monkeypatch.setattr("src.core.cache.get_redis", _get_redis)
     return redis
+
+
+class SQLiteSession:
+    """Just enough of AsyncSession for the services and repositories, on a sync in-memory SQLite session."""
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+        self.info = session.info
+
+    def add(self, obj):
+        self.sync_session.add(obj)
+
+    async def execute(self, stmt, params=None, **kwargs):
+        return self.sync_session.execute(stmt, params, **kwargs)
+
+    async def scalars(self, stmt, params=None, **kwargs):
+        return self.sync_session.scalars(stmt, params, **kwargs)
+
+    async def flush(self):
+        self.sync_session.flush()
+
+    async def commit(self):
+        self.sync_session.commit()
+
+    async def rollback(self):
+        self.sync_session.rollback()
+
+    async def refresh(self, obj):
+        self.sync_session.refresh(obj)
+
+
+def create_sqlite_engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    instrument_engine(engine)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def sqlite_session_factory(engine):
+    @asynccontextmanager
+    async def session_factory():
+        with Session(engine, expire_on_commit=False) as sync_session:
+            yield SQLiteSession(sync_session)
+
+    return session_factory
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch):
+    """
+    Primary and read sessions on an in-memory SQLite database with all tables, instead of PostgreSQL.
+    Its statements are counted by the query instrumentation (``X-DB-Query-Count``).
+    """
+    engine = create_sqlite_engine()
+    monkeypatch.setattr(database, "db_session_factory", sqlite_session_factory(engine))
+    monkeypatch.setattr(database, "read_session_factories", [])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def lagging_replica(sqlite_db, monkeypatch):
+    """A read replica that has not received any of the primary's writes (an empty database)."""
+    engine = create_sqlite_engine()
+    monkeypatch.setattr(database, "read_session_factories", [sqlite_session_factory(engine)])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def query_budget():
+    """``with query_budget(3): ...`` fails the test if the block runs more than 3 SQL statements."""
+
+    @contextmanager
+    def budget(max_queries: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, f"Query budget {max_queries} exceeded: {stats.summary()}"
+
+    return budget
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database.base_repository import MAX_BIND_PARAMS
+from src.dog_photos.repository import DogPhotoRepository
+
+
+class RecordingSession:
+    """Records statements and commits; RETURNING yields one sequential id per row."""
+
+    def __init__(self, fail_on: int | None = None):
+        self.info = {}
+        self.calls = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_on = fail_on
+        self._next_id = 1
+
+    async def scalars(self, stmt, params=None):
+        self.calls.append((stmt, params))
+        if self.fail_on == len(self.calls):
+            raise RuntimeError("db error")
+        count = len(params) if params is not None else len(stmt._multi_values[0])
+        ids = list(range(self._next_id, self._next_id + count))
+        self._next_id += count
+        return SimpleNamespace(all=lambda: ids)
+
+    async def execute(self, stmt, params=None):
+        self.calls.append((stmt, params))
+        return SimpleNamespace(rowcount=len(params or []))
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def photo_rows(n):
+    return [{"image_url": f"https://images.dog.ceo/breeds/pug/{i}.jpg", "breed": "pug"} for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_create_many_chunks_and_commits_once():
+    session = RecordingSession()
+
+    ids = await DogPhotoRepository(session).create_many(photo_rows(5), chunk_size=2)
+
+    assert ids == [1, 2, 3, 4, 5]
+    assert [len(params) for _, params in session.calls] == [2, 2, 1]
+    assert session.commits == 1
+
+
+def test_chunks_respect_bind_parameter_limit():
+    repo = DogPhotoRepository(RecordingSession())
+    rows = [dict.fromkeys(("a", "b", "c", "d"), 1)] * 10_000
+
+    sizes = [len(chunk) for chunk in repo._chunks(rows, chunk_size=10_000)]
+
+    assert max(sizes) * 4 <= MAX_BIND_PARAMS
+    assert sum(sizes) == 10_000
+
+
+@pytest.mark.asyncio
+async def test_transaction_shares_one_commit_across_repositories():
+    session = RecordingSession()
+
+    ids = await DogPhotoRepository(session).create_many_with_stats(photo_rows(3))
+
+    assert ids == [1, 2, 3]
+    # photos, stats, breed rollup
+    assert len(session.calls) == 3
+    assert session.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_transaction_rolls_back_on_error():
+    session = RecordingSession(fail_on=2)
+
+    with pytest.raises(RuntimeError):
+        await DogPhotoRepository(session).create_many_with_stats(photo_rows(3))
+
+    assert (session.commits, session.rollbacks) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_builds_on_conflict_do_update():
+    session = RecordingSession()
+    rows = [{"id": 1, "image_url": "https://images.dog.ceo/breeds/pug/1.jpg", "breed": "pug"}]
+
+    await DogPhotoRepository(session).upsert_many(rows, update_columns=["breed"])
+
+    sql = str(session.calls[0][0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (id) DO UPDATE SET breed = excluded.breed" in sql
+    assert "RETURNING dog_photos.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_delete_many_uses_in_clause():
+    session = RecordingSession()
+
+    await DogPhotoRepository(session).delete_many([1, 2, 3])
+
+    sql = str(session.calls[0][0].compile(dialect=postgresql.dialect()))
+    assert "DELETE FROM dog_photos WHERE dog_photos.id IN" in sql
+    assert session.commits == 1
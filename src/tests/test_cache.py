@@ -48,3 +48,106 @@
 #     result = await cache_get(key)
 
 #     assert result is None
+
+
+import pytest
+
+from src.core import cache as core_cache
+from src.core.local_cache import LocalCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_entries=2, max_bytes=1024, ttl=60)
+
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+
+def test_local_cache_respects_byte_limit():
+    cache = LocalCache(max_entries=100, max_bytes=10, ttl=60)
+
+    cache.set("a", "x" * 6)
+    cache.set("b", "y" * 6)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+    assert cache.size_bytes == 6
+
+
+def test_local_cache_ttl_never_exceeds_redis_ttl(monkeypatch):
+    cache = LocalCache(max_entries=10, max_bytes=1024, ttl=60)
+    now = [1000.0]
+    monkeypatch.setattr("src.core.memory_cache.time.monotonic", lambda: now[0])
+
+    cache.set("a", "1", ttl=2)
+    now[0] += 3
+
+    assert cache.get("a") is None
+
+
+def test_local_cache_skips_set_after_invalidation():
+    cache = LocalCache(max_entries=10, max_bytes=1024, ttl=60)
+
+    version = cache.version
+    cache.invalidate(["a"])
+    cache.set("a", "stale", version=version)
+
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_two_tier_get_served_from_l1(fake_redis, monkeypatch):
+    monkeypatch.setattr(core_cache, "local_cache", LocalCache(max_entries=10, max_bytes=1024, ttl=60))
+    stats_before = core_cache.get_cache_stats()
+
+    await core_cache.cache_set("test:l1", {"x": 1}, ttl=30)
+    await fake_redis.delete("test:l1")
+
+    assert await core_cache.cache_get("test:l1") == {"x": 1}
+    assert core_cache.get_cache_stats()["l1"]["hits"] == stats_before["l1"]["hits"] + 1
+
+
+@pytest.mark.asyncio
+async def test_two_tier_get_fills_l1_from_redis(fake_redis, monkeypatch):
+    l1 = LocalCache(max_entries=10, max_bytes=1024, ttl=60)
+    monkeypatch.setattr(core_cache, "local_cache", l1)
+
+    await fake_redis.setex("test:l2", 30, '{"x": 2}')
+
+    assert await core_cache.cache_get("test:l2") == {"x": 2}
+    assert l1.get("test:l2") == b'{"x": 2}'
+
+    await core_cache.cache_delete("test:l2")
+    assert l1.get("test:l2") is None
+    assert await core_cache.cache_get("test:l2") is None
+
+
+@pytest.mark.asyncio
+async def test_core_cache_bulk_operations(fake_redis):
+    await core_cache.cache_set_many({"test:bulk:a": {"x": 1}, "test:bulk:b": [1, 2]}, ttl=30)
+
+    found = await core_cache.cache_get_many(["test:bulk:a", "test:bulk:b", "test:bulk:missing"])
+    assert found == {"test:bulk:a": {"x": 1}, "test:bulk:b": [1, 2]}
+    assert 0 < await fake_redis.ttl("test:bulk:a") <= 30
+
+    assert await core_cache.cache_delete_many(["test:bulk:a", "test:bulk:b"]) == 2
+    assert await core_cache.cache_get_many(["test:bulk:a", "test:bulk:b"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_bulk_operations():
+    from src.cache import service as memory_cache
+
+    await memory_cache.cache_set_many({"test:bulk:a": {"x": 1}, "test:bulk:b": [1, 2]}, ttl=30)
+
+    found = await memory_cache.cache_get_many(["test:bulk:a", "test:bulk:b", "test:bulk:missing"])
+    assert found == {"test:bulk:a": {"x": 1}, "test:bulk:b": [1, 2]}
+
+    assert await memory_cache.cache_delete_many(["test:bulk:a", "test:bulk:b"]) == 2
+    assert await memory_cache.cache_get_many(["test:bulk:a"]) == {}
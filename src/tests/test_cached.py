@@ -0,0 +1,107 @@
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from src.core.cached import cached
+
+
+class Item(BaseModel):
+    name: str
+
+
+class ItemRow:
+    """Stands in for an ORM object."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class ItemService:
+    def __init__(self):
+        self.calls = 0
+
+    @cached(key="test:cached:item:{name}", ttl=30, model=Item, negative_ttl=5)
+    async def get_item(self, name: str) -> Optional[Item]:
+        self.calls += 1
+        return None if name == "unicorn" else Item(name=name)
+
+    @cached(key=lambda db, limit: f"test:cached:rows:{limit}", ttl=30, model=list[Item], exclude=("self",))
+    async def list_rows(self, db, limit: int = 2) -> list[ItemRow]:
+        self.calls += 1
+        return [ItemRow("a"), ItemRow("b")][:limit]
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_and_rebuilt_as_models(fake_redis):
+    service = ItemService()
+
+    first = await service.get_item("pug")
+    second = await service.get_item("pug")
+
+    assert first == second == Item(name="pug")
+    assert service.calls == 1
+    assert 29 <= await fake_redis.ttl("test:cached:item:pug") <= 30
+
+
+@pytest.mark.asyncio
+async def test_none_results_are_cached_with_negative_ttl(fake_redis):
+    service = ItemService()
+
+    assert await service.get_item("unicorn") is None
+    assert await service.get_item("unicorn") is None
+
+    assert service.calls == 1
+    assert 0 < await fake_redis.ttl("test:cached:item:unicorn") <= 5
+
+
+@pytest.mark.asyncio
+async def test_orm_results_and_key_builders(fake_redis):
+    service = ItemService()
+
+    rows = await service.list_rows(db=object(), limit=1)
+    cached_rows = await service.list_rows(db=object(), limit=1)
+
+    assert rows == cached_rows == [Item(name="a")]
+    assert service.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_hook(fake_redis):
+    service = ItemService()
+
+    await service.get_item("pug")
+    assert service.get_item.key_for("pug") == "test:cached:item:pug"
+    assert await service.get_item.invalidate("pug")
+    await service.get_item("pug")
+
+    assert service.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_swr_mode_stores_envelope(fake_redis):
+    from src.core.serializers import codec
+
+    @cached(key="test:cached:swr", ttl=10, swr=True, stale_ttl=50)
+    async def load():
+        return {"x": 1}
+
+    assert await load() == {"x": 1}
+    assert await load() == {"x": 1}
+
+    entry = codec.decode(await fake_redis.get("test:cached:swr"))
+    assert entry["v"] == {"x": 1}
+    assert 50 < await fake_redis.ttl("test:cached:swr") <= 60
+
+
+@pytest.mark.asyncio
+async def test_invalidate_without_excluded_arguments(fake_redis):
+    class Repo:
+        @cached(key="test:cached:recent", ttl=30)
+        async def recent(self, db):
+            return [1]
+
+    await Repo().recent(db=object())
+
+    assert Repo().recent.key_for() == "test:cached:recent"
+    assert await Repo().recent.invalidate()
@@ -0,0 +1,66 @@
+import pytest
+
+from src.external_api.catalog import BreedCatalog, UnknownBreedError
+from src.external_api.service import service
+
+BREEDS = {"bulldog": ["boston", "english", "french"], "hound": ["afghan", "basset"], "pug": [], "terrier": ["english"]}
+
+
+async def _no_load():
+    return {}
+
+
+@pytest.fixture
+def catalog():
+    catalog = BreedCatalog(_no_load)
+    catalog.update(BREEDS)
+    return catalog
+
+
+@pytest.mark.parametrize(
+    "breed, path",
+    [
+        ("pug", "pug"),
+        (" Bulldog French ", "bulldog/french"),
+        ("french bulldog", "bulldog/french"),
+        ("hound-afghan", "hound/afghan"),
+        ("hound/afghan", "hound/afghan"),
+        ("basset", "hound/basset"),
+    ],
+)
+def test_resolve_normalizes_to_canonical_path(catalog, breed, path):
+    assert catalog.resolve(breed) == path
+
+
+def test_unknown_breed_has_suggestions(catalog):
+    with pytest.raises(UnknownBreedError) as error:
+        catalog.resolve("buldog frech")
+
+    assert error.value.suggestions[0] == "bulldog french"
+    assert "Did you mean: bulldog french" in str(error.value)
+
+
+def test_ambiguous_sub_breed_is_suggested_with_its_breeds(catalog):
+    with pytest.raises(UnknownBreedError) as error:
+        catalog.resolve("english")
+
+    assert error.value.suggestions[:2] == ["bulldog english", "terrier english"]
+
+
+def test_unloaded_catalog_only_normalizes():
+    catalog = BreedCatalog(_no_load)
+
+    assert catalog.resolve("Unicorn Pink") == "unicorn/pink"
+
+
+def test_unknown_breed_is_rejected_without_upstream_call(client, catalog, monkeypatch):
+    async def fail(endpoint):
+        raise AssertionError(f"unexpected upstream call: {endpoint}")
+
+    monkeypatch.setattr(service, "_make_request", fail)
+    monkeypatch.setattr(service, "breeds", catalog)
+
+    response = client.get("/external/dog/image-by-breed/pugg")
+
+    assert response.status_code == 404
+    assert "Did you mean: pug" in response.json()["detail"]
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.dashboard.models import BreedRollup
+from src.dashboard.repository import BreedRollupRepository
+
+
+class RecordingSession:
+    def __init__(self):
+        self.info = {}
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_add_photos_increments_counts():
+    session = RecordingSession()
+
+    await BreedRollupRepository(session).add_photos({("hound", "afghan"): 2, ("pug", None): 1, (None, None): 1})
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert (
+        "ON CONFLICT (breed, sub_breed) DO UPDATE SET photo_count = (breed_rollups.photo_count + excluded.photo_count)"
+        in sql
+    )
+    params = session.statements[0].compile().params
+    assert sorted(v for k, v in params.items() if k.startswith("sub_breed")) == ["", "afghan"]
+
+
+def rollup(breed, sub_breed, photos, views, viewed_at=None):
+    return BreedRollup(
+        breed=breed, sub_breed=sub_breed, photo_count=photos, total_views=views, last_viewed_at=viewed_at
+    )
+
+
+def test_top_endpoint_reads_rollup(client, monkeypatch):
+    async def top(self, limit, order_by):
+        assert (limit, order_by) == (2, "photos")
+        return [rollup("hound", "afghan", 5, 40), rollup("pug", "", 3, 90)]
+
+    monkeypatch.setattr(BreedRollupRepository, "top", top)
+
+    response = client.get("/dog-photos/top", params={"limit": 2, "order_by": "photos"})
+
+    assert response.status_code == 200
+    assert response.json()[1] == {
+        "breed": "pug",
+        "sub_breed": None,
+        "photo_count": 3,
+        "total_views": 90,
+        "last_viewed_at": None,
+    }
+
+
+def test_breed_stats_endpoint(client, monkeypatch):
+    viewed_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    async def by_breed(self, breed):
+        if breed != "hound":
+            return []
+        return [rollup("hound", "afghan", 5, 40, viewed_at), rollup("hound", "basset", 2, 10)]
+
+    monkeypatch.setattr(BreedRollupRepository, "by_breed", by_breed)
+
+    data = client.get("/dashboard/breeds/Hound").json()
+    assert (data["photo_count"], data["total_views"]) == (7, 50)
+    assert [s["sub_breed"] for s in data["sub_breeds"]] == ["afghan", "basset"]
+
+    assert client.get("/dashboard/breeds/unicorn").status_code == 404
@@ -0,0 +1,157 @@
+import sqlite3
+import time
+
+import pytest
+from fastapi import Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import NullPool
+from sqlalchemy.util import greenlet_spawn
+
+from src.database import base
+from src.database.base import InstrumentedAsyncPool, _engine_options, db_pool_checkout
+from src.database.instrumentation import instrument_engine, track_queries
+
+
+def test_engine_profiles():
+    assert _engine_options("test")["poolclass"] is NullPool
+
+    prod = _engine_options("prod")
+    assert prod["poolclass"] is InstrumentedAsyncPool
+    assert prod["pool_pre_ping"] is True
+    assert prod["echo"] is False
+
+    with pytest.raises(ValueError):
+        _engine_options("staging")
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkout_latency():
+    pool = InstrumentedAsyncPool(lambda: sqlite3.connect(":memory:", check_same_thread=False), pool_size=2)
+    before = db_pool_checkout.values.get((), [None, 0.0, 0])[2]
+
+    connection = await greenlet_spawn(pool.connect)
+    assert pool.get_stats()["checked_out"] == 1
+    await greenlet_spawn(connection.close)
+
+    assert db_pool_checkout.values[()][2] == before + 1
+    assert pool.get_stats()["checked_in"] == 1
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE photos (id INTEGER PRIMARY KEY, breed TEXT)"))
+        conn.execute(text("INSERT INTO photos (breed) VALUES ('pug'), ('husky'), ('beagle')"))
+    return engine
+
+
+def test_track_queries_flags_repeated_shapes(sqlite_engine):
+    with track_queries() as stats, sqlite_engine.connect() as conn:
+        ids = conn.execute(text("SELECT id FROM photos")).scalars().all()
+        for photo_id in ids:
+            conn.execute(text("SELECT breed FROM photos WHERE id = :id"), {"id": photo_id})
+
+    assert stats.count == 4
+    assert stats.repeated(3) == {"SELECT breed FROM photos WHERE id = ?": 3}
+    assert "3x SELECT breed" in stats.summary()
+
+
+def test_queries_outside_tracking_are_ignored(sqlite_engine):
+    with sqlite_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    with track_queries() as stats:
+        pass
+
+    assert stats.count == 0
+
+
+def test_failed_statements_leave_nothing_on_the_connection(sqlite_engine):
+    with track_queries() as stats, sqlite_engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT missing FROM photos"))
+        conn.execute(text("SELECT 1"))
+
+        assert "query_started" not in conn.info
+    assert stats.count == 1
+
+
+def test_query_budget_fixture(sqlite_engine, query_budget):
+    with query_budget(1), sqlite_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    with pytest.raises(AssertionError, match="Query budget 1 exceeded"):
+        with query_budget(1), sqlite_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+
+def test_query_stats_headers(client):
+    response = client.get("/common/healthcheck")
+
+    assert response.headers["x-db-query-count"] == "0"
+
+
+class StandInFactory:
+    """Stands in for an async_sessionmaker bound to one database."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self.name
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def two_replicas(monkeypatch):
+    monkeypatch.setattr(base, "db_session_factory", StandInFactory("primary"))
+    monkeypatch.setattr(base, "read_session_factories", [StandInFactory("replica0"), StandInFactory("replica1")])
+
+
+async def first(generator):
+    return await generator.__anext__()
+
+
+def make_request(cookies: str = ""):
+    headers = [(b"cookie", cookies.encode())] if cookies else []
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.mark.asyncio
+async def test_reads_round_robin_across_replicas(two_replicas):
+    names = [await first(base.get_read_session(make_request())) for _ in range(4)]
+
+    assert sorted(names) == ["replica0", "replica0", "replica1", "replica1"]
+    assert names[0] != names[1]
+
+
+@pytest.mark.asyncio
+async def test_reads_after_write_go_to_primary(two_replicas):
+    request = make_request()
+    assert await first(base.get_db_session(request)) == "primary"
+
+    cookie = f"{base.READ_PRIMARY_COOKIE}={request.state.read_primary_until:.0f}"
+    assert await first(base.get_read_session(make_request(cookie))) == "primary"
+
+    expired = f"{base.READ_PRIMARY_COOKIE}={time.time() - 1:.0f}"
+    assert (await first(base.get_read_session(make_request(expired)))).startswith("replica")
+
+
+@pytest.mark.asyncio
+async def test_without_replicas_reads_use_primary(monkeypatch):
+    monkeypatch.setattr(base, "db_session_factory", StandInFactory("primary"))
+    monkeypatch.setattr(base, "read_session_factories", [])
+    request = make_request()
+
+    assert await first(base.get_read_session(make_request())) == "primary"
+    await first(base.get_db_session(request))
+    assert not hasattr(request.state, "read_primary_until")
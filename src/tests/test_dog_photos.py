@@ -0,0 +1,393 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.dashboard.models import BreedRollup
+from src.database import base as database
+from src.dog_photos.models import DogPhotoStats
+from src.dog_photos.repository import DogPhotoRepository
+from src.dog_photos.schema import DogPhotoStatsRead, DogPhotoWithStats
+from src.dog_photos.service import DogPhotoService, _plan_requests, dog_photo_service
+from src.dog_photos.utils import decode_cursor, encode_cursor, parse_breed_from_url
+from src.dog_photos.views import view_counter
+from src.external_api.models import DogImageListResponse, DogImageResponse
+from src.external_api.service import service as dog_api_service
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(created_at, 42)
+
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["garbage", encode_cursor(datetime(2026, 1, 1), 1)[:-3], "WyJ4Il0"])
+def test_decode_cursor_rejects_bad_input(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+class RecordingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        self.params = params
+        rows = self.rows
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(unique=lambda: SimpleNamespace(all=lambda: rows)))
+
+
+@pytest.mark.asyncio
+async def test_list_page_uses_keyset_predicate():
+    session = RecordingSession([])
+
+    await DogPhotoRepository(session).list_page(10, after=(datetime(2026, 1, 1), 5), breed="pug")
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "(dog_photos.created_at, dog_photos.id) < (" in sql
+    assert "ORDER BY dog_photos.created_at DESC, dog_photos.id DESC" in sql
+    assert "dog_photos.breed = " in sql
+    assert session.params == {"page_size": 11, "breed": "pug", "after_created_at": datetime(2026, 1, 1), "after_id": 5}
+
+
+@pytest.mark.asyncio
+async def test_list_page_reuses_prebuilt_statement_per_filter_set():
+    session = RecordingSession([])
+    repo = DogPhotoRepository(session)
+
+    await repo.list_page(10, breed="pug")
+    await repo.list_page(20, breed="husky")
+    await repo.list_page(10)
+
+    first, second, unfiltered = session.statements
+    assert first is second
+    assert unfiltered is not first
+
+
+@pytest.mark.asyncio
+async def test_list_photos_returns_next_cursor_only_when_more_rows():
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        SimpleNamespace(id=i, image_url=f"https://images.dog.ceo/{i}.jpg", breed="pug", sub_breed=None,
+                        created_at=created_at, updated_at=None)
+        for i in (3, 2, 1)
+    ]  # fmt: skip
+
+    page = await dog_photo_service.list_photos(RecordingSession(rows), limit=2, breed="Pug")
+    assert [p.id for p in page.items] == [3, 2]
+    assert decode_cursor(page.next_cursor) == (created_at, 2)
+
+    last = await dog_photo_service.list_photos(RecordingSession(rows[2:]), limit=2, cursor=page.next_cursor)
+    assert last.next_cursor is None
+
+
+def test_list_dog_photos_invalid_cursor(client):
+    response = client.get("/dog-photos", params={"cursor": "garbage"})
+
+    assert response.status_code == 400
+
+
+def test_parse_breed_from_url():
+    assert parse_breed_from_url("https://images.dog.ceo/breeds/hound-afghan/n02088094_1003.jpg") == ("hound", "afghan")
+    assert parse_breed_from_url("https://images.dog.ceo/breeds/pug/1.jpg") == ("pug", None)
+    assert parse_breed_from_url("https://example.com/1.jpg") == (None, None)
+
+
+def test_plan_requests_splits_by_breed_and_upstream_limit():
+    assert _plan_requests(120, None) == [(None, 50), (None, 50), (None, 20)]
+    assert _plan_requests(5, ["Pug", "husky"]) == [("pug", 3), ("husky", 2)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_reports_per_item_results(fake_redis, monkeypatch):
+    async def get_random_images(count, breed=None):
+        if breed == "unicorn":
+            raise RuntimeError("API error: 404")
+        return DogImageListResponse(
+            message=[f"https://images.dog.ceo/breeds/{breed}/{i}.jpg" for i in range(count)], status="success"
+        )
+
+    inserted = []
+
+    async def create_many_with_stats(self, rows):
+        inserted.append(rows)
+        return list(range(len(inserted) * 100, len(inserted) * 100 + len(rows)))
+
+    monkeypatch.setattr(dog_api_service, "get_random_images", get_random_images)
+    monkeypatch.setattr(DogPhotoRepository, "create_many_with_stats", create_many_with_stats)
+
+    result = await dog_photo_service.bulk_save_photos(None, 4, ["pug", "unicorn"])
+
+    assert (result.requested, result.created, result.failed) == (4, 2, 2)
+    assert [row["breed"] for row in inserted[0]] == ["pug", "pug"]
+    created = [item for item in result.items if item.status == "created"]
+    assert [item.id for item in created] == [100, 101]
+    assert all(item.breed == "unicorn" and "404" in item.error for item in result.items if item.status == "failed")
+
+
+def test_export_streams_ndjson_and_csv(client, monkeypatch):
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    batches = [
+        [(1, "https://images.dog.ceo/breeds/pug/1.jpg", "pug", None, created_at, 3, None)],
+        [(2, "https://images.dog.ceo/breeds/pug/2.jpg", "pug", None, created_at, None, None)],
+    ]
+    filters = {}
+
+    async def stream_export(self, **kwargs):
+        filters.update(kwargs)
+        for batch in batches:
+            yield batch
+
+    monkeypatch.setattr(DogPhotoRepository, "stream_export", stream_export)
+
+    response = client.get("/dog-photos/export", params={"breed": "Pug"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [1, 2]
+    assert lines[0]["views"] == 3
+    assert filters["breed"] == "pug"
+
+    response = client.get("/dog-photos/export", params={"format": "csv"})
+    rows = response.text.splitlines()
+    assert rows[0] == "id,image_url,breed,sub_breed,created_at,views,last_viewed_at"
+    assert rows[1] == "1,https://images.dog.ceo/breeds/pug/1.jpg,pug,,2026-01-01T00:00:00+00:00,3,"
+    assert len(rows) == 3
+
+
+def test_list_dog_photos_serves_cached_bytes_until_a_write(client, fake_redis, monkeypatch):
+    calls = []
+
+    async def list_page(db, limit, cursor, breed):
+        calls.append((limit, breed))
+        return []
+
+    async def delete_with_stats(self, photo_id):
+        return True
+
+    monkeypatch.setattr(DogPhotoService, "_list_page", staticmethod(list_page))
+    monkeypatch.setattr(DogPhotoRepository, "delete_with_stats", delete_with_stats)
+
+    first = client.get("/dog-photos", params={"limit": 5, "breed": "Pug"})
+    assert first.json() == {"items": [], "next_cursor": None}
+    assert client.get("/dog-photos", params={"limit": 5, "breed": "pug"}).content == first.content
+    assert calls == [(5, "pug")]
+
+    revalidated = client.get(
+        "/dog-photos", params={"limit": 5, "breed": "pug"}, headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    assert client.delete("/dog-photos/1").status_code == 204
+    client.get("/dog-photos", params={"limit": 5, "breed": "pug"})
+    assert calls == [(5, "pug"), (5, "pug")]
+
+
+def test_get_dog_photo_revalidation_is_not_a_view(client, fake_redis, monkeypatch):
+    stored = DogPhotoWithStats(
+        id=1,
+        image_url="https://images.dog.ceo/breeds/pug/1.jpg",
+        breed="pug",
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        stats=DogPhotoStatsRead(photo_id=1, views=10),
+    )
+    loads = []
+
+    async def load_photo(self, db, photo_id):
+        loads.append(photo_id)
+        return stored if photo_id == 1 else None
+
+    monkeypatch.setattr(DogPhotoService, "_load_photo", load_photo)
+    monkeypatch.setattr(view_counter, "backend", "memory")
+    monkeypatch.setattr(view_counter, "_buffer", {})
+
+    first = client.get("/dog-photos/1")
+    assert first.json()["stats"]["views"] == 11
+
+    revalidated = client.get("/dog-photos/1", headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert view_counter._pending_local(1)[0] == 1
+
+    assert client.get("/dog-photos/1").json()["stats"]["views"] == 12
+    assert client.get("/dog-photos/2").status_code == 404
+    assert loads == [1, 2]
+
+
+def test_save_dog_photo(client, fake_redis, sqlite_db, monkeypatch):
+    async def get_image(*args):
+        return DogImageResponse(message="https://images.dog.ceo/breeds/pug/1.jpg", status="success")
+
+    monkeypatch.setattr(dog_api_service, "get_random_image", get_image)
+    monkeypatch.setattr(dog_api_service, "get_image_by_breed", get_image)
+
+    response = client.post("/dog-photos/save", params={"breed": "Pug"})
+
+    assert response.status_code == 200
+    photo = response.json()
+    assert (photo["image_url"], photo["breed"]) == ("https://images.dog.ceo/breeds/pug/1.jpg", "pug")
+    assert photo["stats"]["views"] == 0
+    with sqlite_db.connect() as conn:
+        assert conn.execute(select(DogPhotoStats.photo_id)).scalars().all() == [photo["id"]]
+
+
+def test_save_dog_photo_stores_canonical_breed(client, fake_redis, sqlite_db, monkeypatch):
+    async def get_image(*args):
+        return DogImageResponse(message="https://images.dog.ceo/breeds/hound-afghan/1.jpg", status="success")
+
+    monkeypatch.setattr(dog_api_service, "get_random_image", get_image)
+
+    for breed in ("afghan", "Hound Afghan"):
+        photo = client.post("/dog-photos/save", params={"breed": breed}).json()
+        assert (photo["breed"], photo["sub_breed"]) == ("hound", "afghan")
+    with sqlite_db.connect() as conn:
+        assert conn.execute(select(BreedRollup.breed, BreedRollup.sub_breed, BreedRollup.photo_count)).all() == [
+            ("hound", "afghan", 2)
+        ]
+
+
+def test_get_dog_photo_without_redis(client, monkeypatch):
+    stored = DogPhotoWithStats(
+        id=1,
+        image_url="https://images.dog.ceo/breeds/pug/1.jpg",
+        breed="pug",
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        stats=DogPhotoStatsRead(photo_id=1, views=10),
+    )
+
+    async def load_photo(self, db, photo_id):
+        return stored
+
+    async def broken_redis():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(DogPhotoService, "_load_photo", load_photo)
+    monkeypatch.setattr("src.core.cache.get_redis", broken_redis)
+    monkeypatch.setattr("src.dog_photos.views.get_redis", broken_redis)
+    monkeypatch.setattr(view_counter, "backend", "redis")
+    monkeypatch.setattr(view_counter, "_buffer", {})
+
+    response = client.get("/dog-photos/1")
+
+    assert response.status_code == 200
+    assert response.json()["stats"]["views"] == 11
+
+
+def test_delete_sends_following_reads_to_primary(client, fake_redis, sqlite_db, monkeypatch):
+    async def get_image(*args):
+        return DogImageResponse(message="https://images.dog.ceo/breeds/pug/1.jpg", status="success")
+
+    def replica():
+        raise AssertionError("read went to the replica inside the read-your-writes window")
+
+    monkeypatch.setattr(dog_api_service, "get_random_image", get_image)
+    monkeypatch.setattr(database, "read_session_factories", [replica])
+    photo_id = client.post("/dog-photos/save").json()["id"]
+    client.cookies.clear()
+
+    response = client.delete(f"/dog-photos/{photo_id}")
+
+    assert response.status_code == 204
+    assert response.headers["set-cookie"].startswith(f"{database.READ_PRIMARY_COOKIE}=")
+    assert client.get(f"/dog-photos/{photo_id}").status_code == 404
+
+
+def test_cached_responses_are_filled_from_primary(client, fake_redis, lagging_replica, monkeypatch):
+    async def get_image(*args):
+        return DogImageResponse(message="https://images.dog.ceo/breeds/pug/1.jpg", status="success")
+
+    monkeypatch.setattr(dog_api_service, "get_random_image", get_image)
+    monkeypatch.setattr(view_counter, "backend", "memory")
+    monkeypatch.setattr(view_counter, "_buffer", {})
+    photo_id = client.post("/dog-photos/save").json()["id"]
+    # Без cookie read-your-writes читання йдуть на репліку, яка ще не має фото.
+    client.cookies.clear()
+
+    assert [item["id"] for item in client.get("/dog-photos").json()["items"]] == [photo_id]
+    assert client.get(f"/dog-photos/{photo_id}").status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_page_cached_after_a_write_is_not_filled_with_older_rows(fake_redis, sqlite_db, monkeypatch):
+    async def get_image(*args):
+        return DogImageResponse(message="https://images.dog.ceo/breeds/pug/1.jpg", status="success")
+
+    list_page = DogPhotoRepository.list_page
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_list_page(self, *args, **kwargs):
+        rows = await list_page(self, *args, **kwargs)
+        if not release.is_set():
+            started.set()
+            await release.wait()
+        return rows
+
+    monkeypatch.setattr(dog_api_service, "get_random_image", get_image)
+    monkeypatch.setattr(DogPhotoRepository, "list_page", slow_list_page)
+
+    async with database.db_session_factory() as db:
+        first = await dog_photo_service.save_random_photo(db)
+        # Читання почалося до запису, а закінчилося після нього.
+        reader = asyncio.create_task(dog_photo_service.list_photos_json(db))
+        await started.wait()
+        second = await dog_photo_service.save_random_photo(db)
+        release.set()
+        await reader
+
+        page = json.loads(await dog_photo_service.list_photos_json(db))
+
+    assert [item["id"] for item in page["items"]] == [second.id, first.id]
+
+
+# Максимальна кількість SQL-запитів на ендпоінт (холодний кеш).
+QUERY_BUDGETS = {"save": 3, "list": 1, "detail": 2}
+
+
+def test_endpoint_query_budgets(client, fake_redis, sqlite_db, monkeypatch):
+    async def get_image(*args):
+        return DogImageResponse(message="https://images.dog.ceo/breeds/hound-afghan/1.jpg", status="success")
+
+    monkeypatch.setattr(dog_api_service, "get_random_image", get_image)
+    monkeypatch.setattr(view_counter, "backend", "memory")
+    monkeypatch.setattr(view_counter, "_buffer", {})
+
+    def queries(response) -> int:
+        assert response.status_code == 200, response.text
+        return int(response.headers["x-db-query-count"])
+
+    saved = client.post("/dog-photos/save")
+    assert queries(saved) <= QUERY_BUDGETS["save"]
+    assert queries(client.get("/dog-photos")) <= QUERY_BUDGETS["list"]
+    assert queries(client.get("/dog-photos")) == 0
+    assert queries(client.get(f"/dog-photos/{saved.json()['id']}")) <= QUERY_BUDGETS["detail"]
+    assert queries(client.get(f"/dog-photos/{saved.json()['id']}")) == 0
+
+
+@pytest.mark.asyncio
+async def test_load_photo_reads_orm_stats(monkeypatch):
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    row = SimpleNamespace(
+        id=1,
+        image_url="https://images.dog.ceo/breeds/pug/1.jpg",
+        breed="pug",
+        sub_breed=None,
+        created_at=created_at,
+        updated_at=None,
+        stats=SimpleNamespace(photo_id=1, views=4, last_viewed_at=None),
+    )
+
+    async def get_by_id(self, photo_id):
+        return row
+
+    monkeypatch.setattr(DogPhotoRepository, "get_by_id", get_by_id)
+
+    photo = await dog_photo_service._load_photo(None, 1)
+
+    assert photo.stats == DogPhotoStatsRead(photo_id=1, views=4)
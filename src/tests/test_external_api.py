@@ -96,3 +96,135 @@ async def test_external_service_failure(client):
 
         assert response.status_code == 500
         assert "Critical connection error" in response.json()["detail"]
+
+
+# Тест 7: Пакетне отримання фото за породами (один MGET + паралельні запити для промахів)
+@pytest.mark.asyncio
+async def test_get_images_by_breeds_uses_cache_for_hits(fake_redis):
+    import json
+    import time
+
+    from src.external_api.service import BreedNotFoundError, service
+
+    cached = {"message": "https://images.dog.ceo/breeds/pug/1.jpg", "status": "success"}
+    await fake_redis.set(
+        "cache:external:dog_breed:pug",
+        json.dumps({"v": cached, "soft": time.time() + 60, "delta": 0}),
+    )
+
+    async def fake_request(endpoint):
+        if "unicorn" in endpoint:
+            raise BreedNotFoundError("API error: 404")
+        return {"message": "https://images.dog.ceo/breeds/beagle/1.jpg", "status": "success"}
+
+    with patch.object(service, "_make_request", side_effect=fake_request) as mock_request:
+        result = await service.get_images_by_breeds(["pug", "beagle", "unicorn"])
+
+    assert str(result["pug"].message).endswith("pug/1.jpg")
+    assert str(result["beagle"].message).endswith("beagle/1.jpg")
+    assert result["unicorn"] is None
+    assert mock_request.call_count == 2
+    assert await fake_redis.get("cache:external:dog_breed:beagle") is not None
+
+
+# Тест 8: Пакет випадкових зображень (пул, /random/{n}, кеш по породі, помилки по кожному елементу)
+@pytest.mark.asyncio
+async def test_random_image_batch_combines_pool_upstream_and_cache(monkeypatch):
+    from src.external_api.catalog import BreedCatalog
+    from src.external_api.service import service
+
+    catalog = BreedCatalog(AsyncMock())
+    catalog.update({"pug": [], "hound": ["afghan"], "husky": []})
+    monkeypatch.setattr(service, "breeds", catalog)
+
+    async def pop_many(count, breed=None):
+        return ["https://images.dog.ceo/breeds/husky/pooled.jpg"] if breed == "husky" else []
+
+    fetched = []
+
+    async def fetch_random_urls(count, breed):
+        fetched.append((count, breed))
+        if breed == "hound/afghan":
+            raise RuntimeError("API error: 503")
+        return [f"https://images.dog.ceo/breeds/{breed or 'any'}/{i}.jpg" for i in range(count)]
+
+    async def get_images_by_breeds(breeds, semaphore=None):
+        return {
+            b: DogImageResponse(message=f"https://images.dog.ceo/breeds/{b}/cached.jpg", status="success")
+            for b in breeds
+        }
+
+    monkeypatch.setattr(service.random_pool, "pop_many", pop_many)
+    monkeypatch.setattr(service.random_pool, "track", lambda breed: None)
+    monkeypatch.setattr(service, "_fetch_random_urls", fetch_random_urls)
+    monkeypatch.setattr(service, "get_images_by_breeds", get_images_by_breeds)
+
+    result = await service.get_random_image_batch(3, ["pug", "Afghan Hound", "afghan", "husky", "unicorn"])
+
+    assert (result.requested, result.returned, result.failed) == (8, 5, 3)
+    pug, afghan_1, afghan_2, husky, unicorn, *random = result.items
+    assert pug.image_url.endswith("/pug/cached.jpg")
+    assert afghan_1.status == afghan_2.status == "failed" and "503" in afghan_1.error
+    assert husky.image_url.endswith("/husky/pooled.jpg")
+    assert unicorn.status == "failed" and "not found" in unicorn.error
+    assert [item.image_url.rsplit("/", 1)[1] for item in random] == ["0.jpg", "1.jpg", "2.jpg"]
+    assert sorted(fetched, key=str) == [(2, "hound/afghan"), (3, None)]
+
+
+@pytest.mark.asyncio
+async def test_random_image_batch_falls_back_to_upstream_when_pool_fails(monkeypatch):
+    from src.external_api.service import service
+
+    async def pop_many(count, breed=None):
+        raise ConnectionError("redis down")
+
+    async def fetch_random_urls(count, breed):
+        return [f"https://images.dog.ceo/breeds/pug/{i}.jpg" for i in range(count)]
+
+    monkeypatch.setattr(service.random_pool, "pop_many", pop_many)
+    monkeypatch.setattr(service, "_fetch_random_urls", fetch_random_urls)
+
+    result = await service.get_random_image_batch(2)
+
+    assert (result.requested, result.returned, result.failed) == (2, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_random_image_batch_limits_concurrent_upstream_calls(fake_redis, monkeypatch):
+    import asyncio
+
+    import httpx
+
+    from src.core import http_client
+    from src.external_api.config import dog_config
+    from src.external_api.service import DogApiService
+
+    calls, active, peak = [], 0, 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        calls.append(request.url.path)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        url, count = "https://images.dog.ceo/breeds/pug/1.jpg", request.url.path.rsplit("/", 1)[1]
+        message = [url] * int(count) if count.isdigit() else url
+        return httpx.Response(200, json={"message": message, "status": "success"})
+
+    monkeypatch.setattr(http_client, "_breakers", {})
+    monkeypatch.setattr(dog_config, "batch_concurrency", 2)
+    service = DogApiService(transport=httpx.MockTransport(handler))
+    service.random_pool.backend = "none"
+    service.breeds.update({"pug": [], "husky": [], "beagle": [], "boxer": []})
+
+    result = await service.get_random_image_batch(100, ["pug", "husky", "beagle", "boxer", "boxer"])
+
+    assert result.returned == 105
+    assert len(calls) == 6  # 2x /random/50, /boxer/.../random/2, 3 single breeds
+    assert peak == 2
+
+
+def test_random_image_batch_endpoint_validates_size(client):
+    assert client.get("/external/dog/random-images").status_code == 422
+    assert client.get("/external/dog/random-images", params={"count": 101}).status_code == 422
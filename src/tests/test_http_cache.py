@@ -0,0 +1,50 @@
+import pytest
+from starlette.requests import Request
+
+from src.core.cache import bump_cache_version, cache_version
+from src.core.http_cache import conditional_response, etag_matches, make_etag
+
+
+def make_request(headers: dict) -> Request:
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]})
+
+
+def test_etag_is_strong_and_depends_on_bytes():
+    etag = make_etag(b'{"a":1}')
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(b'{"a":1}')
+    assert etag != make_etag(b'{"a":2}')
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [(None, False), ('"x"', False), ('"x", "tag"', True), ('W/"tag"', True), ("*", True)],
+)
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"tag"') is expected
+
+
+def test_conditional_response_returns_304_for_current_etag():
+    body = b'{"items":[]}'
+    response = conditional_response(make_request({}), body)
+
+    assert response.status_code == 200
+    assert response.body == body
+    assert response.headers["cache-control"] == "no-cache"
+
+    not_modified = conditional_response(make_request({"If-None-Match": response.headers["etag"]}), body)
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert not_modified.headers["etag"] == response.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_cache_version_changes_only_for_bumped_collection(fake_redis):
+    assert await cache_version("photos", "stats") == "0.0"
+
+    await bump_cache_version("stats")
+    await bump_cache_version("stats")
+
+    assert await cache_version("photos", "stats") == "0.2"
+    assert await cache_version("photos") == "0"
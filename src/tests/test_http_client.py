@@ -0,0 +1,139 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.core import http_client
+from src.core.http_client import CircuitBreaker, CircuitOpenError, ResilientTransport, create_http_client
+from src.core.metrics import registry
+from src.external_api.service import DogApiService, UpstreamUnavailableError
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(ResilientTransport, "_backoff", lambda self, attempt: 0)
+    monkeypatch.setattr(http_client, "_breakers", {})
+
+
+def stub(responses: list):
+    """Stub upstream: answers with ``responses`` in order (status code or exception), then 200."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        result = responses.pop(0) if responses else 200
+        if isinstance(result, Exception):
+            raise result
+        return httpx.Response(result, json={"status": "success", "message": "https://images.dog.ceo/breeds/pug/1.jpg"})
+
+    return httpx.MockTransport(handler), calls
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_on_timeouts_and_503():
+    transport, calls = stub([httpx.ConnectTimeout("slow"), 503])
+    client = create_http_client("test", transport=transport)
+
+    response = await client.get("https://stub/ok")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert http_client._breakers["test"].state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried():
+    transport, calls = stub([503])
+    client = create_http_client("test", transport=transport)
+
+    response = await client.post("https://stub/save")
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+
+
+def test_breaker_half_opens_after_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    breaker.opened_at -= 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # one trial call at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_call_frees_the_half_open_circuit():
+    started = asyncio.Event()
+
+    class Hanging(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            started.set()
+            await asyncio.Event().wait()
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    breaker.opened_at -= 30
+    client = httpx.AsyncClient(transport=ResilientTransport(Hanging(), "test", breaker))
+
+    trial = asyncio.create_task(client.get("https://stub/a"))
+    await started.wait()
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_and_is_exposed_as_metric(monkeypatch):
+    monkeypatch.setattr(http_client.settings, "http_client_breaker_failure_threshold", 2)
+    monkeypatch.setattr(http_client.settings, "http_client_retries", 0)
+    transport, calls = stub([500, 500])
+    client = create_http_client("test", transport=transport)
+
+    await client.get("https://stub/a")
+    await client.get("https://stub/a")
+    with pytest.raises(CircuitOpenError):
+        await client.get("https://stub/a")
+
+    assert len(calls) == 2
+    assert 'http_client_circuit_state{client="test"} 2' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_dog_api_open_circuit_is_not_cached_as_missing_breed(fake_redis, monkeypatch):
+    monkeypatch.setattr(http_client.settings, "http_client_breaker_failure_threshold", 1)
+    transport, calls = stub([httpx.ConnectError("refused")] * 3)
+    service = DogApiService(transport=transport)
+
+    with pytest.raises(RuntimeError):
+        await service.get_random_images(1)
+    with pytest.raises(UpstreamUnavailableError):
+        await service.get_image_by_breed("pug")
+
+    assert len(calls) == 3  # first call and its two retries; the second was never sent
+    assert await fake_redis.get(service._image_by_breed.key_for("pug")) is None
+
+
+@pytest.mark.asyncio
+async def test_dog_api_caches_only_404_as_missing_breed(fake_redis, monkeypatch):
+    monkeypatch.setattr(http_client.settings, "http_client_retries", 0)
+    transport, calls = stub([503, httpx.ReadTimeout("slow"), 404])
+    service = DogApiService(transport=transport)
+    key = service._image_by_breed.key_for("pug")
+
+    for _ in range(2):
+        with pytest.raises(UpstreamUnavailableError):
+            await service.get_image_by_breed("pug")
+        assert await fake_redis.get(key) is None
+
+    assert await service.get_image_by_breed("pug") is None
+    assert await service.get_image_by_breed("pug") is None
+    assert len(calls) == 3
@@ -0,0 +1,162 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.core import disk_cache, http_client
+from src.core.disk_cache import PIN_SUFFIX, DiskLRUCache, ObjectTooLargeError
+from src.external_api import router as external_router
+from src.external_api.image_proxy import ImageNotAllowedError, ImageProxy
+
+IMAGE = bytes(range(256)) * 4
+URL = "https://images.dog.ceo/breeds/pug/1.jpg"
+
+
+async def chunks(data: bytes, size: int = 100):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.fixture(autouse=True)
+def isolated_breakers(monkeypatch):
+    monkeypatch.setattr(http_client, "_breakers", {})
+
+
+@pytest.fixture
+def proxy(tmp_path):
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        if request.url.path.endswith("/missing.jpg"):
+            return httpx.Response(404)
+        return httpx.Response(200, content=IMAGE, headers={"content-type": "image/jpeg"})
+
+    cache = DiskLRUCache("test_images", tmp_path, max_bytes=10_000, max_object_bytes=5_000)
+    proxy = ImageProxy(cache, ["images.dog.ceo"], transport=httpx.MockTransport(handler))
+    proxy.requests = requests
+    return proxy
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache("test_lru", tmp_path, max_bytes=2500, max_object_bytes=2000)
+    a = await cache.put("a", chunks(b"a" * 1000))
+    await cache.put("b", chunks(b"b" * 1000))
+    assert await cache.get("a") == a  # "b" is now the least recently used
+
+    await cache.put("c", chunks(b"c" * 1000))
+
+    assert await cache.get("b") is None
+    assert a.path.read_bytes() == b"a" * 1000
+    assert cache.size_bytes == 2000
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_is_reloaded_from_disk_and_rejects_large_objects(tmp_path):
+    cache = DiskLRUCache("test_reload", tmp_path, max_bytes=10_000, max_object_bytes=2000)
+    stored = await cache.put("a", chunks(b"x" * 1500))
+    with pytest.raises(ObjectTooLargeError):
+        await cache.put("big", chunks(b"y" * 2500))
+
+    reloaded = DiskLRUCache("test_reload", tmp_path, max_bytes=10_000, max_object_bytes=2000)
+
+    assert await reloaded.get("a") == stored
+    assert reloaded.size_bytes == 1500
+    assert list(tmp_path.glob("*/*.tmp")) == []
+
+
+@pytest.mark.asyncio
+async def test_pinned_file_outlives_eviction(tmp_path):
+    cache = DiskLRUCache("test_pin", tmp_path, max_bytes=1500, max_object_bytes=2000)
+    a = await cache.put("a", chunks(b"a" * 1000))
+    pinned = await cache.pin(a)
+
+    await cache.put("b", chunks(b"b" * 1000))
+
+    assert not a.path.exists()
+    assert pinned.path.read_bytes() == b"a" * 1000
+    await cache.unpin(pinned)
+    assert not pinned.path.exists()
+    with pytest.raises(FileNotFoundError):
+        await cache.pin(a)
+
+
+@pytest.mark.asyncio
+async def test_scan_removes_leftover_temporary_and_pin_files(tmp_path, monkeypatch):
+    cache = DiskLRUCache("test_leftovers", tmp_path, max_bytes=10_000, max_object_bytes=2000)
+    stored = await cache.put("a", chunks(b"a" * 100))
+    await cache.pin(stored)
+    stored.path.with_name(f"{stored.path.name.split('.')[0]}.{'0' * 32}.tmp").write_bytes(b"partial")
+
+    assert len(list(tmp_path.glob("*/*"))) == 3
+    DiskLRUCache("test_leftovers", tmp_path, max_bytes=10_000, max_object_bytes=2000)._scan()
+    assert len(list(tmp_path.glob("*/*"))) == 3  # may still be in use by another worker
+
+    monkeypatch.setattr(disk_cache, "STALE_FILE_SECONDS", 0)
+    reloaded = DiskLRUCache("test_leftovers", tmp_path, max_bytes=10_000, max_object_bytes=2000)
+    assert await reloaded.get("a") == stored
+    assert list(tmp_path.glob("*/*")) == [stored.path]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_download(proxy):
+    results = await asyncio.gather(*(proxy.get(URL) for _ in range(5)))
+
+    assert len(proxy.requests) == 1
+    assert {result.path for result in results} == {results[0].path}
+    assert results[0].path.read_bytes() == IMAGE
+
+    await proxy.get(URL)
+    assert len(proxy.requests) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url", ["https://example.com/1.jpg", "file:///etc/passwd", "http://localhost/1.jpg"])
+async def test_only_allowed_hosts_are_proxied(proxy, url):
+    with pytest.raises(ImageNotAllowedError):
+        await proxy.get(url)
+    assert proxy.requests == []
+
+
+def test_image_endpoint_supports_etag_and_range(client, proxy, monkeypatch):
+    monkeypatch.setattr(external_router, "image_proxy", proxy)
+
+    response = client.get("/external/dog/image", params={"url": URL})
+    assert response.status_code == 200
+    assert response.content == IMAGE
+    assert response.headers["content-type"] == "image/jpeg"
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    etag = response.headers["etag"]
+
+    assert client.get("/external/dog/image", params={"url": URL}, headers={"If-None-Match": etag}).status_code == 304
+
+    partial = client.get("/external/dog/image", params={"url": URL}, headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == IMAGE[10:20]
+    assert len(proxy.requests) == 1
+
+    assert client.get("/external/dog/image", params={"url": URL.replace("1.jpg", "missing.jpg")}).status_code == 404
+    assert client.get("/external/dog/image", params={"url": "https://example.com/1.jpg"}).status_code == 400
+    assert not list(proxy.cache.root.glob(f"*/*{PIN_SUFFIX}"))
+
+
+def test_image_evicted_before_serving_is_downloaded_again(client, proxy, monkeypatch):
+    monkeypatch.setattr(external_router, "image_proxy", proxy)
+    get = proxy.get
+
+    async def get_then_evict(url):
+        cached = await get(url)
+        if len(proxy.requests) == 1:
+            # Another worker's eviction between the lookup and the response.
+            cached.path.unlink()
+        return cached
+
+    monkeypatch.setattr(proxy, "get", get_then_evict)
+
+    response = client.get("/external/dog/image", params={"url": URL})
+
+    assert response.status_code == 200
+    assert response.content == IMAGE
+    assert len(proxy.requests) == 2
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from src.core.memory_cache import MemoryCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2, policy="lru")
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_lfu_evicts_least_frequently_used():
+    cache = MemoryCache(max_entries=2, policy="lfu")
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_byte_limit_and_oversized_values():
+    cache = MemoryCache(max_bytes=10)
+
+    cache.set("a", b"x" * 6)
+    cache.set("b", b"y" * 6)
+    cache.set("huge", b"z" * 11)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == b"y" * 6
+    assert cache.get("huge") is None
+    assert cache.size_bytes == 6
+
+
+def test_sweep_removes_expired_keys_that_are_never_read(monkeypatch):
+    cache = MemoryCache()
+    now = [100.0]
+    monkeypatch.setattr("src.core.memory_cache.time.monotonic", lambda: now[0])
+
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=10)
+    cache.set("forever", 3)
+    cache.set("short", 4, ttl=5)  # overwrite leaves a stale heap record behind
+    now[0] += 6
+
+    assert cache.sweep() == 1
+    assert len(cache) == 2
+    assert cache.get("long") == 2
+    assert cache.get("forever") == 3
+
+
+@pytest.mark.asyncio
+async def test_background_sweeper_runs():
+    cache = MemoryCache(sweep_interval=0.01)
+
+    cache.set("a", 1, ttl=0.01)
+    await asyncio.sleep(0.05)
+
+    assert len(cache) == 0
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_service_api():
+    from src.cache import service
+
+    await service.cache_set("test:svc", {"x": 1}, ttl=5)
+
+    assert await service.cache_exists("test:svc")
+    assert await service.cache_get("test:svc") == {"x": 1}
+    assert await service.cache_delete("test:svc")
+    assert await service.cache_get("test:svc") is None
+    await service.close_memory_cache()
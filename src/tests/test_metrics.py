@@ -0,0 +1,98 @@
+import pytest
+
+from src.core import cache as core_cache
+from src.core.metrics import Counter, Histogram, cache_latency, cache_requests, cache_value_size, key_prefix
+
+
+def test_key_prefix_groups_keys():
+    assert key_prefix("cache:external:dog_breed:pug") == "cache:external:dog_breed"
+    assert key_prefix("cache:external:dog_breeds") == "cache:external:dog_breeds"
+    assert key_prefix("plain") == "plain"
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("op_seconds", "test", ("op",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "get")
+    histogram.observe(0.5, "get")
+    histogram.observe(5, "get")
+
+    text = "\n".join(histogram.render())
+
+    assert 'op_seconds_bucket{op="get",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{op="get",le="1.0"} 2' in text
+    assert 'op_seconds_bucket{op="get",le="+Inf"} 3' in text
+    assert 'op_seconds_count{op="get"} 3' in text
+
+
+def test_counter_renders_labels():
+    counter = Counter("hits_total", "test", ("prefix",))
+    counter.inc("a")
+    counter.inc("a", amount=2)
+
+    assert 'hits_total{prefix="a"} 3' in list(counter.render())
+
+
+@pytest.mark.asyncio
+async def test_cache_get_counts_hits_and_misses_per_prefix(fake_redis):
+    await core_cache.cache_set("cache:metrics:test:1", {"x": 1}, ttl=5)
+
+    before = dict(cache_requests.values)
+    await core_cache.cache_get("cache:metrics:test:1")
+    await core_cache.cache_get("cache:metrics:test:2")
+
+    prefix = "cache:metrics:test"
+    hits = ("redis", "l2", prefix, "hit")
+    misses = ("redis", "l2", prefix, "miss")
+    assert cache_requests.values[hits] == before.get(hits, 0) + 1
+    assert cache_requests.values[misses] == before.get(misses, 0) + 1
+
+
+@pytest.mark.asyncio
+async def test_cache_get_error_is_not_a_miss(monkeypatch):
+    class BrokenRedis:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+    async def _get_redis():
+        return BrokenRedis()
+
+    monkeypatch.setattr("src.core.cache.get_redis", _get_redis)
+    stats_before = core_cache.get_cache_stats()["l2"]
+
+    assert await core_cache.cache_get("cache:metrics:broken") is None
+
+    stats = core_cache.get_cache_stats()["l2"]
+    assert stats["errors"] == stats_before["errors"] + 1
+    assert stats["misses"] == stats_before["misses"]
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_records_latency_and_value_sizes():
+    from src.cache import service as memory_cache
+
+    prefix = "cache:metrics:memory"
+    ops = ("set", "get", "delete", "get_many", "set_many", "delete_many")
+    before = {op: cache_latency.values.get(("memory", op, prefix), [0, 0, 0])[2] for op in ops}
+    sizes_before = cache_value_size.values.get(("memory", prefix), [0, 0, 0])
+
+    await memory_cache.cache_set(f"{prefix}:1", "x" * 100)
+    await memory_cache.cache_get(f"{prefix}:1")
+    await memory_cache.cache_set_many({f"{prefix}:2": "y" * 10})
+    await memory_cache.cache_get_many([f"{prefix}:2", f"{prefix}:3"])
+    await memory_cache.cache_delete(f"{prefix}:1")
+    await memory_cache.cache_delete_many([f"{prefix}:2"])
+
+    assert {op: cache_latency.values[("memory", op, prefix)][2] - before[op] for op in ops} == dict.fromkeys(ops, 1)
+    sizes = cache_value_size.values[("memory", prefix)]
+    # Two writes and two hits, sized with the same estimate as size_bytes.
+    assert sizes[2] - sizes_before[2] == 4
+    assert sizes[1] - sizes_before[1] == 2 * (100 + 10)
+
+
+def test_metrics_endpoint(client):
+    response = client.get("/common/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE cache_requests_total counter" in response.text
+    assert "# TYPE cache_operation_seconds histogram" in response.text
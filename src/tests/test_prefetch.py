@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from src.core import http_client
+from src.external_api import prefetch
+from src.external_api.prefetch import POOL_KEY, RandomImagePool
+from src.external_api.service import DogApiService
+
+
+@pytest.fixture
+def pool_redis(fake_redis, monkeypatch):
+    async def _get_redis():
+        return fake_redis
+
+    monkeypatch.setattr(prefetch, "get_redis", _get_redis)
+    return fake_redis
+
+
+def recording_fetch():
+    calls = []
+
+    async def fetch(count, breed):
+        calls.append((count, breed))
+        return [f"https://images.dog.ceo/breeds/{breed or 'pug'}/{len(calls)}-{i}.jpg" for i in range(count)]
+
+    return fetch, calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["redis", "memory"])
+async def test_pop_takes_prefetched_images_and_refills_below_low_water(pool_redis, backend):
+    fetch, calls = recording_fetch()
+    pool = RandomImagePool(fetch, backend=backend, size=4, low_water=2)
+    pool.track("pug")
+    await asyncio.sleep(0)
+    await asyncio.gather(*pool._refills.values())
+    assert calls == [(4, "pug")]
+
+    first = await pool.pop("pug")
+    second = await pool.pop("pug")
+    assert first != second
+    assert not pool._refills  # 2 left, not below the low-water mark
+
+    await pool.pop("pug")
+    await asyncio.gather(*pool._refills.values())
+    assert calls == [(4, "pug"), (3, "pug")]
+    assert await pool._length("pug") == 4
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_redis_pool_is_trimmed_to_size(pool_redis):
+    fetch, _ = recording_fetch()
+    pool = RandomImagePool(fetch, backend="redis", size=3)
+
+    await pool._push("any", ["a", "b"])
+    await pool._push("any", ["c", "d"])
+
+    assert await pool_redis.lrange(POOL_KEY.format("any"), 0, -1) == [b"a", b"b", b"c"]
+
+
+@pytest.mark.asyncio
+async def test_untracked_breed_is_not_refilled(pool_redis):
+    fetch, calls = recording_fetch()
+    pool = RandomImagePool(fetch, backend="redis", size=4, low_water=2)
+
+    assert await pool.pop("unicorn") is None
+    assert not pool._refills
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_count_as_an_empty_pool(monkeypatch):
+    monkeypatch.setattr(http_client, "_breakers", {})
+
+    async def broken_redis():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(prefetch, "get_redis", broken_redis)
+    service = DogApiService()
+    service.random_pool.backend = "redis"
+
+    async def make_request(endpoint):
+        return {"message": "https://images.dog.ceo/breeds/pug/1.jpg", "status": "success"}
+
+    monkeypatch.setattr(service, "_make_request", make_request)
+
+    assert await service.random_pool.pop_many(3, "pug") == []
+    assert str((await service.get_random_image("pug")).message).endswith("/pug/1.jpg")
+    await service.random_pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_random_image_comes_from_pool_and_falls_back_to_upstream(pool_redis, monkeypatch):
+    monkeypatch.setattr(http_client, "_breakers", {})
+    service = DogApiService()
+    service.random_pool.backend = "memory"
+    requested = []
+
+    async def make_request(endpoint):
+        requested.append(endpoint)
+        return {"message": "https://images.dog.ceo/breeds/hound-afghan/1.jpg", "status": "success"}
+
+    async def fetch(count, breed):
+        return ["https://images.dog.ceo/breeds/hound-afghan/pooled.jpg"] * count
+
+    monkeypatch.setattr(service, "_make_request", make_request)
+    monkeypatch.setattr(service.random_pool, "fetch", fetch)
+
+    image = await service.get_random_image("Hound Afghan")
+    assert str(image.message).endswith("/1.jpg")
+    assert requested == ["breed/hound/afghan/images/random"]
+
+    await asyncio.gather(*service.random_pool._refills.values())
+    image = await service.get_random_image("hound afghan")
+    assert str(image.message).endswith("/pooled.jpg")
+    assert len(requested) == 1
+    await service.random_pool.stop()
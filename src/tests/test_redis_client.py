@@ -0,0 +1,73 @@
+import asyncio
+import os
+
+import fakeredis
+import pytest
+from redis.asyncio import Redis
+
+from src.core import redis_client
+from src.core.redis_client import InstrumentedConnectionPool
+
+
+def test_pool_is_configured_from_settings(monkeypatch):
+    monkeypatch.setattr(redis_client, "_redis_pool", None)
+    monkeypatch.setattr(redis_client.settings, "redis_max_connections", 7)
+    monkeypatch.setattr(redis_client.settings, "redis_socket_timeout", 1.5)
+
+    pool = redis_client.get_redis_pool()
+
+    assert isinstance(pool, InstrumentedConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.connection_kwargs["socket_timeout"] == 1.5
+    assert pool.connection_kwargs["decode_responses"] is False
+
+
+@pytest.mark.asyncio
+async def test_pool_gauges_with_fakeredis():
+    pool = InstrumentedConnectionPool(
+        connection_class=fakeredis.aioredis.FakeConnection,
+        server=fakeredis.FakeServer(),
+        max_connections=2,
+        timeout=1,
+    )
+    client = Redis(connection_pool=pool)
+
+    await asyncio.gather(*(client.set(f"k{i}", i) for i in range(5)))
+    stats = pool.get_stats()
+
+    assert stats["in_use"] == 0
+    assert 1 <= stats["idle"] <= 2
+    assert stats["wait_count"] == 5
+    assert stats["wait_seconds_max"] >= 0
+    await pool.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.getenv("REDIS_TEST_URL"), reason="needs a local redis-server (REDIS_TEST_URL)")
+async def test_client_tracking_invalidates_local_copies(monkeypatch):
+    monkeypatch.setattr(redis_client.settings, "redis_url", os.environ["REDIS_TEST_URL"])
+    monkeypatch.setattr(redis_client.settings, "redis_tracking_prefixes", ["test:tracking:"])
+    monkeypatch.setattr(redis_client, "_redis_pool", None)
+    monkeypatch.setattr(redis_client, "_redis_client", None)
+
+    invalidated = []
+    await redis_client.start_client_tracking(invalidated.append)
+    try:
+        client = await redis_client.get_redis()
+        for _ in range(50):
+            if invalidated:
+                break
+            await asyncio.sleep(0.05)
+
+        other = Redis.from_url(os.environ["REDIS_TEST_URL"])
+        await other.set("test:tracking:key", "1")
+        for _ in range(50):
+            if any(keys and "test:tracking:key" in keys for keys in invalidated):
+                break
+            await asyncio.sleep(0.05)
+
+        assert any(keys and "test:tracking:key" in keys for keys in invalidated)
+        await other.aclose()
+        await client.ping()
+    finally:
+        await redis_client.close_redis()
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from src.core.serializers import COMPRESSORS, SERIALIZERS, CacheCodec
+
+BREEDS = {"message": {f"breed{i}": [f"sub{j}" for j in range(i % 5)] for i in range(200)}, "status": "success"}
+
+
+@pytest.mark.parametrize("serializer", sorted(SERIALIZERS))
+@pytest.mark.parametrize("compression", sorted(COMPRESSORS))
+def test_codec_roundtrip(serializer, compression):
+    codec = CacheCodec(serializer=serializer, compression=compression, compression_threshold=64)
+
+    encoded = codec.encode(BREEDS)
+
+    assert isinstance(encoded, bytes)
+    assert codec.decode(encoded) == BREEDS
+
+
+def test_small_values_are_not_compressed():
+    codec = CacheCodec(serializer="json", compression="zlib", compression_threshold=1024)
+
+    encoded = codec.encode({"x": 1})
+
+    assert encoded[3] == 0
+    assert encoded[4:] == b'{"x":1}'
+
+
+def test_entries_from_other_formats_and_legacy_json_are_readable():
+    writer = CacheCodec(serializer="json", compression="zlib", compression_threshold=0)
+    reader = CacheCodec(serializer=sorted(SERIALIZERS)[-1], compression="none")
+
+    assert reader.decode(writer.encode(BREEDS)) == BREEDS
+    assert reader.decode(json.dumps(BREEDS).encode()) == BREEDS
+    assert reader.decode(json.dumps(BREEDS)) == BREEDS
+
+
+def test_unknown_backend_falls_back_to_json():
+    codec = CacheCodec(serializer="pickle", compression="lz4")
+
+    assert codec.serializer.name == "json"
+    assert codec.compressor.name == "none"
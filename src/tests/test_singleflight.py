@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from src.core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_load():
+    flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"status": "success"}
+
+    results = await asyncio.gather(*(flight.do("cache:external:dog_breeds", load) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result == {"status": "success"} for result in results)
+    stats = flight.get_stats()
+    assert stats["leaders"] == 1
+    assert stats["coalesced"] == 9
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("API error")
+
+    results = await asyncio.gather(*(flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def ok():
+        return 1
+
+    assert await flight.do("key", ok) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_lock_waits_for_other_worker(monkeypatch):
+    import fakeredis.aioredis
+
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def _get_redis():
+        return redis
+
+    monkeypatch.setattr("src.core.singleflight.get_redis", _get_redis)
+    flight = SingleFlight(redis_lock=True, lock_ttl_ms=1000, poll_interval_ms=5)
+
+    # Another worker holds the lock and publishes the value shortly after.
+    await redis.set("singleflight:lock:key", "other-worker", px=1000)
+
+    async def publish_later():
+        await asyncio.sleep(0.02)
+        await redis.set("key", "from-other-worker")
+
+    async def load():
+        raise AssertionError("upstream must not be called")
+
+    async def check():
+        return await redis.get("key")
+
+    _, result = await asyncio.gather(publish_later(), flight.do("key", load, check=check))
+
+    assert result == "from-other-worker"
+    assert flight.get_stats()["coalesced_remote"] == 1
+    assert await redis.get("singleflight:lock:key") == "other-worker"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_load():
+    flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "image"
+
+    first = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    others = [asyncio.create_task(flight.do("key", load)) for _ in range(2)]
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await asyncio.gather(*others) == ["image", "image"]
+    assert first.cancelled()
+    assert calls == 1
+    assert flight.get_stats()["in_flight"] == 0
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.core.serializers import codec
+from src.core.swr import swr_get
+
+
+def make_loader(value):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return value
+
+    return loader, calls
+
+
+@pytest.mark.asyncio
+async def test_hard_miss_loads_and_stores_envelope(fake_redis):
+    loader, calls = make_loader({"status": "success"})
+
+    assert await swr_get("test:swr:miss", loader, ttl=60, stale_ttl=300) == {"status": "success"}
+
+    entry = codec.decode(await fake_redis.get("test:swr:miss"))
+    assert entry["v"] == {"status": "success"}
+    assert entry["soft"] > time.time()
+    assert 300 < await fake_redis.ttl("test:swr:miss") <= 360
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_fresh_value_is_served_without_refresh(fake_redis):
+    await fake_redis.set("test:swr:fresh", json.dumps({"v": "cached", "soft": time.time() + 60, "delta": 0}))
+    loader, calls = make_loader("new")
+
+    assert await swr_get("test:swr:fresh", loader, ttl=60, stale_ttl=300) == "cached"
+    await asyncio.sleep(0)
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_and_refreshed_in_background(fake_redis):
+    await fake_redis.set("test:swr:stale", json.dumps({"v": "old", "soft": time.time() - 1, "delta": 0}))
+    loader, calls = make_loader("new")
+
+    assert await swr_get("test:swr:stale", loader, ttl=60, stale_ttl=300) == "old"
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert len(calls) == 1
+    assert codec.decode(await fake_redis.get("test:swr:stale"))["v"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_xfetch_refreshes_early_when_recompute_is_slow(fake_redis):
+    # A recompute delta far larger than the remaining lifetime makes an early refresh certain.
+    await fake_redis.set("test:swr:early", json.dumps({"v": "old", "soft": time.time() + 1, "delta": 1e6}))
+    loader, calls = make_loader("new")
+
+    assert await swr_get("test:swr:early", loader, ttl=60, stale_ttl=300) == "old"
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert len(calls) == 1
@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.dog_photos import views
+from src.dog_photos.repository import DogPhotoRepository
+from src.dog_photos.views import FLUSHING_KEY, PENDING_KEY, ViewCounter
+
+
+@pytest.fixture
+def views_redis(fake_redis, monkeypatch):
+    async def _get_redis():
+        return fake_redis
+
+    monkeypatch.setattr(views, "get_redis", _get_redis)
+    return fake_redis
+
+
+def recording_apply(monkeypatch, fail=False):
+    applied = []
+
+    async def _apply(self, deltas):
+        if fail:
+            raise RuntimeError("db down")
+        applied.append(deltas)
+
+    monkeypatch.setattr(ViewCounter, "_apply", _apply)
+    return applied
+
+
+@pytest.mark.asyncio
+async def test_redis_views_are_merged_and_flushed_once(views_redis, monkeypatch):
+    applied = recording_apply(monkeypatch)
+    counter = ViewCounter(backend="redis")
+
+    await counter.record_view(1)
+    delta, _ = await counter.record_view(1)
+    await counter.record_view(2)
+
+    assert delta == 2
+    assert (await counter.pending(1))[0] == 2
+    assert await counter.flush() == 2
+    assert {photo_id: count for photo_id, (count, _) in applied[0].items()} == {1: 2, 2: 1}
+    assert (await counter.pending(1))[0] == 0
+    assert await counter.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_redis_flush_keeps_deltas(views_redis, monkeypatch):
+    recording_apply(monkeypatch, fail=True)
+    counter = ViewCounter(backend="redis")
+    await counter.record_view(7)
+
+    with pytest.raises(RuntimeError):
+        await counter.flush()
+
+    assert await views_redis.exists(FLUSHING_KEY)
+    await counter.record_view(7)
+    assert (await counter.pending(7))[0] == 2
+
+    applied = recording_apply(monkeypatch)
+    await counter.flush()
+    await counter.flush()
+    assert sum(deltas[7][0] for deltas in applied) == 2
+    assert not await views_redis.exists(FLUSHING_KEY, PENDING_KEY)
+
+
+@pytest.mark.asyncio
+async def test_memory_buffer_restores_deltas_on_failure(monkeypatch):
+    recording_apply(monkeypatch, fail=True)
+    counter = ViewCounter(backend="memory")
+    await counter.record_view(3)
+
+    with pytest.raises(RuntimeError):
+        await counter.flush()
+
+    assert (await counter.pending(3))[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_views_fall_back_to_local_buffer_without_redis(monkeypatch):
+    async def broken_redis():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(views, "get_redis", broken_redis)
+    applied = recording_apply(monkeypatch)
+    counter = ViewCounter(backend="redis")
+
+    assert (await counter.record_view(5))[0] == 1
+    assert (await counter.pending(5))[0] == 1
+
+    # The local buffer is written even though the Redis part of the flush fails.
+    with pytest.raises(ConnectionError):
+        await counter.flush()
+    assert applied[0][5][0] == 1
+    assert (await counter.pending(5))[0] == 0
+
+
+class RecordingSession:
+    def __init__(self):
+        self.info = {}
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_apply_view_deltas_is_one_batched_update():
+    session = RecordingSession()
+    now = datetime.now(timezone.utc)
+
+    await DogPhotoRepository(session).apply_view_deltas({1: (3, now), 2: (1, now)})
+
+    update_sql, rollup_sql = (str(stmt.compile(dialect=postgresql.dialect())) for stmt in session.statements)
+    assert update_sql.startswith("UPDATE dog_photo_stats SET views=")
+    assert "FROM (VALUES" in update_sql
+    assert "greatest(dog_photo_stats.last_viewed_at, v.viewed_at)" in update_sql
+    assert rollup_sql.startswith("INSERT INTO breed_rollups")
+    assert "GROUP BY dog_photos.breed" in rollup_sql
+    assert "total_views = (breed_rollups.total_views + excluded.total_views)" in rollup_sql